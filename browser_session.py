@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenClaw Browser 会话
+
+发布流程里对同一个页面的所有操作都通过一个 BrowserSession 完成:
+
+- openclaw browser 只有一次一条的命令行接口，每条命令都是一个子进程，所以
+  这里的目标是尽量少发命令：启动命令只解析一次（skill_runner.resolve_openclaw_command），
+  不再每步经过 shell / npx 查找
+- wait_for() 在页面里轮询：一条 evaluate 执行一个异步脚本，在页面内反复检查
+  条件直到满足或到达截止时间，不再从 Python 每隔几百毫秒起一个子进程；
+  页面跳转打断脚本时才重新发一条
+- 正文等长文本按 UTF-8 → base64 随使用它的脚本一起写入页面（window.__xhs），
+  在页面里解码使用；base64 字符集不需要转义，反斜杠、引号、换行、emoji 都
+  原样保留。填写一篇文章只需一条 evaluate，超过命令行长度上限时才分块预先写入
+- CLI 支持 --target-id 时，navigate 返回的标签页 id 会被固定下来，后续命令
+  都指向同一个标签页（启动时用 openclaw browser --help 检测一次）
+
+Usage:
+    with BrowserSession() as browser:
+        browser.navigate(url)
+        if browser.wait_for("document.querySelector('textarea')", timeout=30):
+            browser.evaluate(f"(() => {{ {PAYLOAD_JS} return payload('body').length; }})()",
+                             payload={'body': text})
+"""
+
+import base64
+import os
+import re
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+import skill_runner
+
+# 页面里读取 payload（evaluate(payload=...) / set_payload() 写入）的辅助函数，拼接在脚本开头
+PAYLOAD_JS = (
+    "const payload = (name) => new TextDecoder().decode("
+    "Uint8Array.from(atob((window.__xhs || {})[name] || ''), c => c.charCodeAt(0)));"
+)
+
+_TARGET_RE = re.compile(r'target[_ -]?id["\']?\s*[:=]\s*["\']?([A-Za-z0-9_.-]+)', re.IGNORECASE)
+
+# 单条命令中脚本的最大长度（Windows 命令行上限 32767 字符，留出余量）
+MAX_SCRIPT_CHARS = 24000
+
+# 命令 -> CLI 是否支持 --target-id（每个进程检测一次）
+_target_id_support: Dict[str, bool] = {}
+
+
+class BrowserError(RuntimeError):
+    """openclaw browser 命令执行失败"""
+
+
+class BrowserSession:
+    """
+    固定在一个标签页上的 openclaw browser 会话
+
+    Args:
+        timeout: 单条命令超时（秒）
+        chunk_size: payload 过长需要分块时，每条命令写入的 base64 字符数
+    """
+
+    def __init__(self, timeout: float = 30, chunk_size: int = 20000):
+        self.command = skill_runner.resolve_openclaw_command() + ['browser']
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.target_id: Optional[str] = None
+        self.calls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self, args: List[str], timeout: Optional[float] = None) -> str:
+        cmd = self.command + args
+        if self.target_id:
+            cmd += ['--target-id', self.target_id]
+        self.calls += 1
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                shell=(os.name == 'nt'),
+                timeout=timeout or self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise BrowserError(f"openclaw browser {args[0]} 超时")
+        except OSError as e:
+            raise BrowserError(f"无法运行 openclaw browser: {e}")
+        output = result.stdout + result.stderr
+        if result.returncode != 0:
+            raise BrowserError(f"openclaw browser {args[0]} 失败: {output.strip()[-300:]}")
+        return output
+
+    def _supports_target_id(self) -> bool:
+        key = ' '.join(self.command)
+        if key not in _target_id_support:
+            try:
+                _target_id_support[key] = '--target-id' in self._run(['--help'])
+            except BrowserError:
+                _target_id_support[key] = False
+        return _target_id_support[key]
+
+    def navigate(self, url: str) -> str:
+        """打开页面；CLI 支持 --target-id 时把后续命令固定到该标签页"""
+        output = self._run(['navigate', url])
+        match = _TARGET_RE.search(output)
+        if match and not self.target_id and self._supports_target_id():
+            self.target_id = match.group(1)
+        return output
+
+    def evaluate(self, js: str, timeout: Optional[float] = None, payload: Dict[str, str] = None) -> str:
+        """
+        在页面中执行 JavaScript，返回命令输出
+
+        Args:
+            payload: 名称 -> 文本，执行前写入 window.__xhs（脚本里用 PAYLOAD_JS 的 payload(name) 读取）
+        """
+        if payload:
+            prelude = self._payload_prelude(payload)
+            if prelude is not None:
+                js = f"(() => {{ {prelude} return ({js}); }})()"
+        return self._run(['evaluate', '--fn', js], timeout)
+
+    def _payload_prelude(self, payload: Dict[str, str]) -> Optional[str]:
+        """
+        生成写入 payload 的语句（js 须为表达式），和脚本放在同一条命令里；
+        太长时先用 set_payload 分块写入，返回 None
+        """
+        encoded = {}
+        for name, text in payload.items():
+            if not re.fullmatch(r'\w+', name):
+                raise ValueError(f"非法的 payload 名称: {name}")
+            encoded[name] = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        assignments = ' '.join(f"window.__xhs.{name} = '{data}';" for name, data in encoded.items())
+        prelude = f"window.__xhs = window.__xhs || {{}}; {assignments}"
+        if len(prelude) <= MAX_SCRIPT_CHARS:
+            return prelude
+        for name, text in payload.items():
+            self.set_payload(name, text)
+        return None
+
+    def screenshot(self) -> str:
+        return self._run(['screenshot'])
+
+    def wait_for(self, condition: str, timeout: float = 30, poll_interval: float = 0.25,
+                 max_interval: float = 1.0) -> bool:
+        """
+        在页面内轮询直到 JavaScript 表达式为真
+
+        一条 evaluate 执行一个异步脚本，在页面里按间隔检查条件；页面跳转等
+        打断脚本时（命令失败），在剩余时间内重新发一条。
+
+        Args:
+            condition: JavaScript 表达式（抛异常视为未满足）
+            timeout: 截止时间（秒）
+            poll_interval: 首次轮询间隔，之后逐步加大到 max_interval
+
+        Returns:
+            bool: 截止前是否满足
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            js = (
+                "(async () => {"
+                f" const check = () => {{ try {{ return !!({condition}); }} catch (e) {{ return false; }} }};"
+                f" const deadline = Date.now() + {int(remaining * 1000)};"
+                f" let interval = {int(poll_interval * 1000)};"
+                " while (!check()) {"
+                "  if (Date.now() >= deadline) return 'XHS_WAIT';"
+                "  await new Promise(r => setTimeout(r, Math.min(interval, Math.max(0, deadline - Date.now()))));"
+                f"  interval = Math.min(interval * 2, {int(max_interval * 1000)});"
+                " }"
+                " return 'XHS_READY';"
+                "})()"
+            )
+            try:
+                output = self.evaluate(js, timeout=remaining + self.timeout)
+            except BrowserError:
+                # 页面跳转打断了脚本，稍等后在剩余时间内重试
+                time.sleep(min(poll_interval, max(0.0, deadline - time.monotonic())))
+                continue
+            return 'XHS_READY' in output
+
+    def set_payload(self, name: str, text: str) -> int:
+        """
+        把文本分块写入页面的 window.__xhs[name]（UTF-8 + base64），用于单条命令放不下的长文本
+
+        Returns:
+            int: 使用的命令条数
+        """
+        if not re.fullmatch(r'\w+', name):
+            raise ValueError(f"非法的 payload 名称: {name}")
+        encoded = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        chunks = [encoded[i:i + self.chunk_size] for i in range(0, len(encoded), self.chunk_size)] or ['']
+        first = f"(() => {{ window.__xhs = window.__xhs || {{}}; window.__xhs.{name} = '{chunks[0]}'; return 'ok'; }})()"
+        self.evaluate(first)
+        for chunk in chunks[1:]:
+            self.evaluate(f"(() => {{ window.__xhs.{name} += '{chunk}'; return 'ok'; }})()")
+        return len(chunks)
+
+    def close(self):
+        """清理页面里的临时数据（浏览器和标签页保持打开，供人工检查后发布）"""
+        if self.calls:
+            try:
+                self.evaluate("(() => { delete window.__xhs; return 'ok'; })()")
+            except BrowserError:
+                pass
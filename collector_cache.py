@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻收集结果的磁盘缓存
+
+缓存键 = 来源名 + 关键词集合 + 时间桶（now // ttl），每个来源的 TTL
+在 config.json 的 news_sources.<source>.cache_ttl 中配置（秒，0 表示不缓存）。
+缓存内容是 collect_from_* 的原始返回值，使用原子写入。
+
+模式:
+    normal  - 命中当前时间桶则直接返回，否则重新收集并写入
+    refresh - 忽略已有缓存，重新收集并写入
+    offline - 只读缓存（忽略 TTL，取最新的一份），从不发起收集
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from fsutil import atomic_write_json
+
+CACHE_MODES = ('normal', 'refresh', 'offline')
+
+
+class CollectorCache:
+    """按来源、关键词和时间桶缓存收集结果"""
+
+    def __init__(self, cache_dir: Path, keep: int = 3):
+        self.cache_dir = Path(cache_dir)
+        self.keep = keep
+
+    @staticmethod
+    def keyword_hash(keywords: Iterable[str]) -> str:
+        """关键词集合的稳定哈希（与顺序、大小写无关）"""
+        normalized = sorted({k.strip().lower() for k in keywords if k and k.strip()})
+        return hashlib.sha1('\n'.join(normalized).encode('utf-8')).hexdigest()[:12]
+
+    def _path(self, source: str, kw_hash: str, bucket: int) -> Path:
+        return self.cache_dir / f"{source}-{kw_hash}-{bucket}.json"
+
+    def _entries(self, source: str, kw_hash: str) -> List[Path]:
+        """该来源 + 关键词的所有缓存文件，按写入时间从新到旧"""
+        prefix = f"{source}-{kw_hash}-"
+        entries = []
+        for path in self.cache_dir.glob(f"{prefix}*.json"):
+            if not path.stem[len(prefix):].isdigit():
+                continue
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(entries, reverse=True)]
+
+    @staticmethod
+    def _read(path: Path) -> Optional[List[Dict]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)['items']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def get(self, source: str, keywords: Iterable[str], ttl: int,
+            offline: bool = False) -> Optional[List[Dict]]:
+        """读取缓存，未命中返回 None"""
+        kw_hash = self.keyword_hash(keywords)
+        if offline:
+            for path in self._entries(source, kw_hash):
+                items = self._read(path)
+                if items is not None:
+                    return items
+            return None
+        if ttl <= 0:
+            return None
+        path = self._path(source, kw_hash, int(time.time() // ttl))
+        return self._read(path) if path.exists() else None
+
+    def put(self, source: str, keywords: Iterable[str], ttl: int, items: List[Dict]):
+        """写入当前时间桶，并清理该来源过旧的缓存文件"""
+        if ttl <= 0:
+            return
+        kw_hash = self.keyword_hash(keywords)
+        now = time.time()
+        atomic_write_json(self._path(source, kw_hash, int(now // ttl)), {
+            'source': source,
+            'keywords': sorted(set(keywords)),
+            'stored_at': now,
+            'ttl': ttl,
+            'items': items
+        })
+        for stale in self._entries(source, kw_hash)[self.keep:]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
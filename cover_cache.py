@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+封面图内容寻址缓存
+
+同一个提示词 + 生成服务 + 参数生成的封面可以直接复用，不必每次都调用
+Gemini / nano-banana 重新生成。
+
+- 缓存键 = sha256(规范化提示词 + provider + 参数)，规范化会合并空白、
+  统一全半角，缩进或换行不同的同一提示词得到同一个键
+- 图片存放在 images/<key><后缀>，命中时复制到调用方要求的输出路径
+- 总大小超过 max_bytes 时按最近使用时间（LRU）淘汰
+- manifest.json 记录每个条目（提示词、命中次数、最近使用时间）以及最近的
+  命中 / 未命中事件
+
+Usage:
+    cache = CoverCache(Path('posts/.cache/covers'))
+    path = cache.get_or_create(prompt, 'nano-banana-pro', {'style': 'professional'},
+                               output_path, generate=lambda dest: run_generator(dest))
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from fsutil import atomic_write_json
+
+MAX_EVENTS = 500
+
+
+def normalize_prompt(prompt: str) -> str:
+    """规范化提示词：NFKC、去掉每行缩进、合并空白"""
+    return ' '.join(unicodedata.normalize('NFKC', prompt).split())
+
+
+def cover_key(prompt: str, provider: str, params: Optional[Dict] = None) -> str:
+    """封面缓存键"""
+    payload = json.dumps({
+        'prompt': normalize_prompt(prompt),
+        'provider': provider,
+        'params': params or {},
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class CoverCache:
+    """
+    按提示词缓存封面图
+
+    Args:
+        cache_dir: 缓存目录（images/ + manifest.json）
+        max_bytes: 图片总大小上限
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.image_dir = self.cache_dir / 'images'
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / 'manifest.json'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('entries', {})
+        manifest.setdefault('stats', {'hits': 0, 'misses': 0})
+        manifest.setdefault('events', [])
+        return manifest
+
+    def _save_manifest(self, manifest: Dict):
+        manifest['events'] = manifest['events'][-MAX_EVENTS:]
+        atomic_write_json(self.manifest_path, manifest)
+
+    @staticmethod
+    def _record(manifest: Dict, key: str, result: str, target: Optional[Path]):
+        manifest['stats']['hits' if result == 'hit' else 'misses'] += 1
+        manifest['events'].append({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'key': key,
+            'result': result,
+            'target': str(target) if target else None,
+        })
+
+    def lookup(self, prompt: str, provider: str, params: Optional[Dict] = None,
+               dest: Optional[Path] = None) -> Optional[Path]:
+        """
+        查找缓存；命中时复制到 dest（如果给出）
+
+        Returns:
+            Path: dest 或缓存中的文件；未命中返回 None
+        """
+        key = cover_key(prompt, provider, params)
+        with self._lock:
+            manifest = self._load_manifest()
+            entry = manifest['entries'].get(key)
+            cached = self.image_dir / entry['file'] if entry else None
+            if cached is None or not cached.exists():
+                manifest['entries'].pop(key, None)
+                self._record(manifest, key, 'miss', dest)
+                self._save_manifest(manifest)
+                return None
+            entry['hits'] = entry.get('hits', 0) + 1
+            entry['last_used'] = time.time()
+            self._record(manifest, key, 'hit', dest)
+            self._save_manifest(manifest)
+        if dest is None:
+            return cached
+        dest = Path(dest)
+        if dest.resolve() != cached.resolve():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, dest)
+        return dest
+
+    def store(self, prompt: str, provider: str, params: Optional[Dict], image_path: Path) -> Path:
+        """把生成好的图片放入缓存，返回缓存中的文件"""
+        key = cover_key(prompt, provider, params)
+        image_path = Path(image_path)
+        cached = self.image_dir / f"{key}{image_path.suffix or '.png'}"
+        tmp = cached.with_name(f".{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(image_path, tmp)
+        tmp.replace(cached)
+        with self._lock:
+            manifest = self._load_manifest()
+            manifest['entries'][key] = {
+                'file': cached.name,
+                'prompt': normalize_prompt(prompt),
+                'provider': provider,
+                'params': params or {},
+                'size': cached.stat().st_size,
+                'created_at': time.time(),
+                'last_used': time.time(),
+                'hits': 0,
+            }
+            self._evict(manifest)
+            self._save_manifest(manifest)
+        return cached
+
+    def _evict(self, manifest: Dict):
+        """总大小超限时按最近使用时间从旧到新删除"""
+        entries = manifest['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            entry = entries.pop(key)
+            total -= entry['size']
+            try:
+                (self.image_dir / entry['file']).unlink()
+            except OSError:
+                pass
+
+    def get_or_create(self, prompt: str, provider: str, params: Optional[Dict], dest: Path,
+                      generate: Callable[[Path], Optional[Path]]) -> Optional[Path]:
+        """
+        命中缓存则直接复制到 dest，否则调用 generate(dest) 生成并写入缓存
+
+        Args:
+            generate: 生成函数，成功时返回生成的图片路径，失败返回 None
+
+        Returns:
+            Path: 封面路径；生成失败返回 None
+        """
+        hit = self.lookup(prompt, provider, params, dest)
+        if hit is not None:
+            return hit
+        result = generate(Path(dest))
+        if result is not None and Path(result).exists():
+            self.store(prompt, provider, params, Path(result))
+        return result
+
+    def stats(self) -> Dict:
+        """命中 / 未命中次数和当前缓存大小"""
+        with self._lock:
+            manifest = self._load_manifest()
+        return {
+            **manifest['stats'],
+            'entries': len(manifest['entries']),
+            'bytes': sum(entry['size'] for entry in manifest['entries'].values()),
+        }
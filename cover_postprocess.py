@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+封面图后处理
+
+生成服务返回的通常是全分辨率 PNG，上传慢、占空间。这里把封面统一处理成
+小红书推荐的 3:4 竖图（默认 1080x1440），再编码为有大小上限的 JPEG / WebP:
+
+- 居中裁剪到 3:4：先用 reduce(factor, box=...) 在裁剪区域内整数倍降采样，
+  再精缩放到目标尺寸；除了解码后的原图，不再产生整图大小的副本
+- JPEG 源图用 draft() 让解码器直接按 1/2、1/4... 缩小解码，解码内存也随之
+  减小；PNG 等格式仍要完整解码一次
+- 透明图在缩放到目标尺寸后再铺白底（避免 JPEG 里变成黑色），不在原图尺寸上合成；
+  调色板（P 模式）图片需先转成 RGBA，这一步仍是原图尺寸
+- 从 quality 起步二分查找，找到不超过 max_bytes 的最高质量
+- optimize_covers() 用进程池并行处理一批封面
+
+依赖 Pillow（可选）：未安装时原样返回输入图片并提示一次。
+
+Usage:
+    python cover_postprocess.py posts/*.png --format webp --max-kb 400
+"""
+
+import argparse
+import io
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fsutil import atomic_write_bytes
+
+TARGET_SIZE = (1080, 1440)
+FORMATS = {'jpeg': '.jpg', 'webp': '.webp'}
+
+_warned = False
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def crop_box(width: int, height: int, ratio: float) -> Tuple[int, int, int, int]:
+    """原图中宽高比为 ratio（宽/高）的最大居中区域"""
+    if width / height > ratio:
+        new_width = round(height * ratio)
+        left = (width - new_width) // 2
+        return left, 0, left + new_width, height
+    new_height = round(width / ratio)
+    top = (height - new_height) // 2
+    return 0, top, width, top + new_height
+
+
+def _encode(image, fmt: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    else:
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _fit(image, fmt: str, max_bytes: int, quality: int, min_quality: int) -> Tuple[bytes, int]:
+    """不超过 max_bytes 的最高质量编码；最低质量仍超限时返回最低质量的结果"""
+    data = _encode(image, fmt, quality)
+    if len(data) <= max_bytes:
+        return data, quality
+    best = None
+    low, high = min_quality, quality - 1
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = _encode(image, fmt, mid)
+        if len(candidate) <= max_bytes:
+            best = (candidate, mid)
+            low = mid + 1
+        else:
+            high = mid - 1
+    return best or (_encode(image, fmt, min_quality), min_quality)
+
+
+def optimize_cover(src: Path, dest: Optional[Path] = None, size: Tuple[int, int] = TARGET_SIZE,
+                   fmt: str = 'jpeg', max_bytes: int = 500 * 1024, quality: int = 88,
+                   min_quality: int = 55, keep_original: bool = True) -> Dict:
+    """
+    把一张封面处理为 3:4 目标尺寸、有大小上限的 JPEG / WebP
+
+    Args:
+        src: 原图路径
+        dest: 输出路径，默认与原图同名、后缀换成目标格式
+        size: 目标尺寸 (宽, 高)
+        fmt: jpeg / webp
+        max_bytes: 输出文件大小上限
+        quality: 起始质量
+        min_quality: 最低质量
+        keep_original: 是否保留原图（输出路径与原图不同时才会删除）
+
+    Returns:
+        Dict: src / dest / width / height / bytes / original_bytes / quality
+    """
+    from PIL import Image
+
+    src = Path(src)
+    dest = Path(dest) if dest else src.with_suffix(FORMATS[fmt])
+    original_bytes = src.stat().st_size
+    width, height = size
+
+    with Image.open(src) as image:
+        if image.format == 'JPEG':
+            image.draft('RGB', (width, height))
+        if image.mode not in ('RGB', 'L', 'RGBA', 'LA'):
+            # reduce 不支持调色板等模式；有透明通道的统一转 RGBA
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        box = crop_box(image.width, image.height, width / height)
+        # 整数倍降采样到目标尺寸的 2 倍以上（等同 reducing_gap=2.0），只处理裁剪区域
+        factor = min((box[2] - box[0]) // width, (box[3] - box[1]) // height) // 2
+        if factor > 1:
+            reduced = image.reduce(factor, box=box)
+        else:
+            reduced = image.crop(box)
+    resized = reduced.resize(size, Image.LANCZOS)
+    if 'A' in resized.getbands():
+        # 在目标尺寸上铺白底
+        flattened = Image.new('RGB', size, (255, 255, 255))
+        flattened.paste(resized.convert('RGBA'), mask=resized.getchannel('A'))
+        resized = flattened
+    elif resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+
+    data, used_quality = _fit(resized, fmt, max_bytes, quality, min_quality)
+    atomic_write_bytes(dest, data)
+    if not keep_original and dest.resolve() != src.resolve():
+        src.unlink()
+    return {
+        'src': str(src),
+        'dest': str(dest),
+        'width': width,
+        'height': height,
+        'bytes': len(data),
+        'original_bytes': original_bytes,
+        'quality': used_quality,
+    }
+
+
+def postprocess_cover(path: Path, options: Dict) -> Path:
+    """
+    按配置处理一张封面，返回处理后的路径
+
+    Pillow 未安装或处理失败时返回原路径（只提示，不中断流程）。
+
+    Args:
+        path: 原图路径
+        options: 配置中的 cover 段（width / height / format / max_kb / quality / keep_original）
+    """
+    global _warned
+    if not options.get('postprocess', True):
+        return Path(path)
+    if not pillow_available():
+        if not _warned:
+            print("⚠️ 未安装 Pillow，跳过封面后处理（pip install Pillow）")
+            _warned = True
+        return Path(path)
+    try:
+        result = optimize_cover(path, **_kwargs(options))
+    except Exception as e:
+        print(f"⚠️ 封面后处理失败 {path}: {e}")
+        return Path(path)
+    print(f"🖼️ 封面已处理: {result['dest']} ({result['original_bytes'] // 1024} KB → "
+          f"{result['bytes'] // 1024} KB, q={result['quality']})")
+    return Path(result['dest'])
+
+
+def _kwargs(options: Dict) -> Dict:
+    return {
+        'size': (options.get('width', TARGET_SIZE[0]), options.get('height', TARGET_SIZE[1])),
+        'fmt': options.get('format', 'jpeg'),
+        'max_bytes': int(options.get('max_kb', 500) * 1024),
+        'quality': options.get('quality', 88),
+        'keep_original': options.get('keep_original', False),
+    }
+
+
+def _optimize_one(args) -> Dict:
+    path, kwargs = args
+    try:
+        return optimize_cover(path, **kwargs)
+    except Exception as e:
+        return {'src': str(path), 'error': str(e)}
+
+
+def optimize_covers(paths: Iterable[Path], options: Dict, workers: int = None) -> List[Dict]:
+    """用进程池并行处理一批封面，结果顺序与输入一致（失败项带 error）"""
+    paths = [Path(p) for p in paths]
+    if not paths:
+        return []
+    kwargs = _kwargs(options)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers == 1:
+        return [_optimize_one((path, kwargs)) for path in paths]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_optimize_one, [(path, kwargs) for path in paths]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='封面图后处理（3:4 裁剪 + 限制大小重新编码）')
+    parser.add_argument('images', nargs='+', help='图片路径')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='jpeg')
+    parser.add_argument('--width', type=int, default=TARGET_SIZE[0])
+    parser.add_argument('--height', type=int, default=TARGET_SIZE[1])
+    parser.add_argument('--max-kb', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--keep-original', action='store_true')
+    args = parser.parse_args()
+
+    if not pillow_available():
+        print("[Error] 需要 Pillow: pip install Pillow")
+        return
+    options = {'format': args.format, 'width': args.width, 'height': args.height,
+               'max_kb': args.max_kb, 'keep_original': args.keep_original}
+    for result in optimize_covers(args.images, options, args.workers):
+        if 'error' in result:
+            print(f"[Error] {result['src']}: {result['error']}")
+        else:
+            print(f"[OK] {result['dest']}: {result['original_bytes'] // 1024} KB → "
+                  f"{result['bytes'] // 1024} KB (q={result['quality']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,21 +8,58 @@ Usage:
     python daily_ai_news.py              # 生成日报
     python daily_ai_news.py --publish    # 生成并准备发布
     python daily_ai_news.py --dry-run    # 测试模式，不保存
+    python daily_ai_news.py --refresh    # 忽略缓存，重新收集
+    python daily_ai_news.py --offline    # 只使用缓存，不访问任何来源
+
+在其他脚本中调用:
+    from daily_ai_news import run_daily
+    result = run_daily()
+    if result.ok:
+        print(result.filepath, len(result.items), result.timings)
+    elif result.skipped:
+        print(result.error)  # 没有新内容，正常跳过（不算失败）
 """
 
 import subprocess
 import json
 import argparse
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+import skill_runner
+from collector_cache import CollectorCache
+from source_cursor import CursorStore
+from near_dup import NearDupIndex
+from seen_index import SeenStoryIndex
+from post_catalog import PostCatalog
+from ranking import NewsRanker
+
+@dataclass
+class RunResult:
+    """一次日报生成的结果"""
+    ok: bool
+    filepath: Optional[Path] = None
+    content: Optional[str] = None
+    items: List[Dict] = field(default_factory=list)   # 最终入选的新闻
+    collected: int = 0                                 # 去重前的原始条数
+    timings: Dict[str, float] = field(default_factory=dict)         # 各阶段耗时（秒）
+    source_timings: Dict[str, float] = field(default_factory=dict)  # 各来源耗时（秒）
+    error: Optional[str] = None
+    skipped: bool = False  # 新闻都已在之前的日报中发布，没有新内容可生成（正常情况，不算失败）
+
 
 class XHSAIDailyPublisher:
     """小红书AI日报发布器"""
     
-    def __init__(self, config_path: str = None):
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = None, cache_mode: str = 'normal', config: Dict = None):
+        self.config = config if config is not None else self._load_config(config_path)
         self.news_data = []
+        self.source_timings = {}
+        self.cache_mode = cache_mode
         
         # 处理路径配置
         paths_config = self.config.get('paths', {})
@@ -42,6 +79,22 @@ class XHSAIDailyPublisher:
             self.output_dir = self.skill_root / output_path
         
         self.output_dir.mkdir(exist_ok=True)
+        self.cache = CollectorCache(self.output_dir / '.cache' / 'collectors')
+        collection_config = self.config.get('collection', {})
+        self.incremental = collection_config.get('incremental', True)
+        self.run_date = date.today()  # 日报日期，游标和跨天去重以此为界
+        self.cursors = CursorStore(
+            self.output_dir / '.state' / 'cursors.json',
+            max_seen=collection_config.get('cursor_size', 500),
+            run_date=self.run_date
+        )
+        dedup_config = self.config.get('dedup', {})
+        self.seen_index = None
+        if dedup_config.get('cross_day', True):
+            self.seen_index = SeenStoryIndex(
+                self.output_dir / '.state' / 'seen_stories.sqlite3',
+                window_days=dedup_config.get('seen_window_days', 7)
+            )
         
         print(f"[Config] Skill root: {self.skill_root}")
         print(f"[Config] Output dir: {self.output_dir}")
@@ -66,26 +119,13 @@ class XHSAIDailyPublisher:
                 'news_aggregator': {'enabled': True},
                 'techmeme': {'enabled': True}
             },
+            'collection': {'concurrent': True, 'incremental': True},
+            'dedup': {'threshold': 0.5, 'cross_day': True, 'seen_window_days': 7},
+            'ranking': {'top_k': 10},
             'xiaohongshu': {'enabled': True},
             'output': {'save_directory': 'output'}
         }
     
-    def _run_openclaw_skill(self, skill_name: str, timeout: int = 120) -> str:
-        """运行OpenClaw skill"""
-        try:
-            result = subprocess.run(
-                ['npx', 'openclaw', 'skills', 'run', skill_name],
-                capture_output=True,
-                text=True,
-                shell=True,
-                timeout=timeout
-            )
-            return result.stdout + result.stderr
-        except subprocess.TimeoutExpired:
-            return f"[Timeout] Skill {skill_name} 运行超时"
-        except Exception as e:
-            return f"[Error] {e}"
-    
     def collect_from_ai_news_collectors(self) -> List[Dict]:
         """从ai-news-collectors收集新闻"""
         print("[1/3] 正在运行 ai-news-collectors...")
@@ -94,10 +134,16 @@ class XHSAIDailyPublisher:
             print("      [Skip] 未启用")
             return []
         
-        output = self._run_openclaw_skill('ai-news-collectors', timeout=180)
+        # 边运行边解析：超时时保留已经输出的条目
+        lines = skill_runner.stream_skill('ai-news-collectors', timeout=180)
+        news_list = []
+        try:
+            for news in self._iter_ai_news_items(lines):
+                news_list.append(news)
+        except TimeoutError:
+            print(f"      [Timeout] 运行超时，保留已输出的 {len(news_list)} 条")
         
-        # 解析输出
-        news_list = self._parse_ai_news_output(output)
+        news_list = self._take_new('ai_news_collectors', news_list)
         print(f"      [OK] 收集到 {len(news_list)} 条")
         return news_list
     
@@ -114,6 +160,7 @@ class XHSAIDailyPublisher:
             'keywords', ['AI', 'LLM', 'GPT', 'OpenAI']
         )
         keyword_str = ','.join(keywords)
+        limit = self.config.get('news_sources', {}).get('news_aggregator', {}).get('limit', 10)
         
         try:
             # 运行fetch_news脚本
@@ -121,7 +168,7 @@ class XHSAIDailyPublisher:
             result = subprocess.run(
                 ['python', 'scripts/fetch_news.py', 
                  '--source', 'all',
-                 '--limit', '10',
+                 '--limit', str(limit),
                  '--keyword', keyword_str],
                 capture_output=True,
                 text=True,
@@ -207,6 +254,7 @@ class XHSAIDailyPublisher:
                         'date': datetime.now().strftime('%Y-%m-%d'),
                         'source_type': 'techmeme'
                     })
+                news_list = self._take_new('techmeme', news_list)
                 print(f"      [OK] 收集到 {len(news_list)} 条")
                 return news_list
             except:
@@ -217,29 +265,40 @@ class XHSAIDailyPublisher:
             print(f"      [Error] {e}")
             return []
     
-    def _parse_ai_news_output(self, output: str) -> List[Dict]:
-        """解析ai-news-collectors输出"""
-        news_list = []
-        lines = output.split('\n')
-        current_news = {}
+    def _iter_ai_news_items(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """
+        逐行解析ai-news-collectors输出，每遇到下一个 **标题** 就产出上一条
         
-        for line in lines:
-            if line.strip().startswith('**') and line.strip().endswith('**'):
-                if current_news:
-                    news_list.append(current_news)
-                current_news = {
-                    'title': line.strip().strip('*'),
-                    'source': 'AI News Collectors',
-                    'date': datetime.now().strftime('%Y-%m-%d'),
-                    'source_type': 'ai_news_collectors'
-                }
-            elif 'http' in line and current_news:
-                current_news['url'] = line.strip()
+        输入可以是任意行迭代器（包括正在运行的 skill 输出流），内存占用恒定。
+        上游超时或出错时先产出手头的最后一条，再把异常抛给调用方。
+        """
+        current_news = {}
+        try:
+            for line in lines:
+                stripped = line.strip()
+                if stripped.startswith('**') and stripped.endswith('**'):
+                    if current_news:
+                        yield current_news
+                    current_news = {
+                        'title': stripped.strip('*'),
+                        'source': 'AI News Collectors',
+                        'date': datetime.now().strftime('%Y-%m-%d'),
+                        'source_type': 'ai_news_collectors'
+                    }
+                elif 'http' in line and current_news:
+                    current_news['url'] = stripped
+        except TimeoutError:
+            if current_news:
+                yield current_news
+            raise
         
         if current_news:
-            news_list.append(current_news)
-        
-        return news_list
+            yield current_news
+    
+    def _parse_ai_news_output(self, output: str) -> List[Dict]:
+        """解析ai-news-collectors输出"""
+        news_list = list(self._iter_ai_news_items(output.split('\n')))
+        return self._take_new('ai_news_collectors', news_list)
     
     def _parse_news_aggregator_output(self, data: dict) -> List[Dict]:
         """解析news-aggregator输出"""
@@ -247,32 +306,146 @@ class XHSAIDailyPublisher:
         
         if isinstance(data, list):
             for item in data:
-                news_list.append({
+                news = {
                     'title': item.get('title', ''),
                     'source': item.get('source', 'News Aggregator'),
                     'url': item.get('url', ''),
                     'date': datetime.now().strftime('%Y-%m-%d'),
                     'source_type': 'news_aggregator'
-                })
+                }
+                # 上游给出发布时间时带上（ISO 字符串或 Unix 时间戳），用于新鲜度打分
+                published = item.get('published_at') or item.get('time')
+                if published:
+                    news['published_at'] = published
+                news_list.append(news)
         
-        return news_list
+        return self._take_new('news_aggregator', news_list)
+    
+    def _take_new(self, source: str, news_list: List[Dict]) -> List[Dict]:
+        """增量模式下只保留该来源游标之后的新条目"""
+        if not self.incremental:
+            return news_list
+        fresh = self.cursors.filter_new(source, news_list)
+        skipped = len(news_list) - len(fresh)
+        if skipped:
+            print(f"      [Cursor] {source}: 跳过 {skipped} 条已处理条目")
+        return fresh
+    
+    def _collectors(self) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """按固定顺序返回 (来源名, 收集函数)，合并结果时以此顺序为准"""
+        return [
+            ('ai_news_collectors', self.collect_from_ai_news_collectors),
+            ('news_aggregator', self.collect_from_news_aggregator),
+            ('techmeme', self.collect_from_techmeme),
+        ]
+    
+    def _cached_collect(self, name: str, collector: Callable[[], List[Dict]]) -> List[Dict]:
+        """带磁盘缓存的收集：TTL 和关键词取自 news_sources.<name>"""
+        source_config = self.config.get('news_sources', {}).get(name, {})
+        ttl = source_config.get('cache_ttl', 0)
+        keywords = source_config.get('keywords', [])
+        
+        if not source_config.get('enabled'):
+            return collector()
+        
+        if self.cache_mode != 'refresh':
+            cached = self.cache.get(name, keywords, ttl, offline=self.cache_mode == 'offline')
+            if cached is not None:
+                print(f"      [Cache] {name}: 命中缓存 {len(cached)} 条")
+                return cached
+        
+        if self.cache_mode == 'offline':
+            print(f"      [Cache] {name}: 离线模式且无缓存，跳过")
+            return []
+        
+        items = collector()
+        if items:
+            self.cache.put(name, keywords, ttl, items)
+        return items
+    
+    def _timed_collect(self, name: str, collector: Callable[[], List[Dict]]) -> List[Dict]:
+        """运行单个收集器并记录耗时"""
+        start = time.perf_counter()
+        try:
+            return self._cached_collect(name, collector)
+        except Exception as e:
+            print(f"      [Error] {name}: {e}")
+            return []
+        finally:
+            self.source_timings[name] = time.perf_counter() - start
+    
+    def collect_all(self, concurrent: bool = None) -> List[Dict]:
+        """
+        收集所有来源的新闻
+        
+        并发模式下所有启用的来源同时启动，总耗时取决于最慢的来源；
+        无论完成先后，结果都按 _collectors() 的顺序合并，保证输出稳定。
+        """
+        if concurrent is None:
+            concurrent = self.config.get('collection', {}).get('concurrent', True)
+        
+        collectors = self._collectors()
+        self.source_timings = {}
+        results = {}
+        start = time.perf_counter()
+        
+        if concurrent and len(collectors) > 1:
+            print(f"[并发] 同时启动 {len(collectors)} 个来源...")
+            with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+                futures = {
+                    executor.submit(self._timed_collect, name, collector): name
+                    for name, collector in collectors
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    results[name] = future.result()
+                    print(f"      [Done] {name}: {len(results[name])} 条, "
+                          f"{self.source_timings[name]:.1f}s")
+        else:
+            for name, collector in collectors:
+                results[name] = self._timed_collect(name, collector)
+        
+        elapsed = time.perf_counter() - start
+        print()
+        print("[耗时] 各来源:")
+        for name, _ in collectors:
+            print(f"      {name}: {self.source_timings.get(name, 0.0):.1f}s")
+        print(f"      总计: {elapsed:.1f}s ({'并发' if concurrent else '顺序'})")
+        
+        all_news = []
+        for name, _ in collectors:
+            all_news.extend(results.get(name, []))
+        return all_news
     
     def deduplicate_and_rank(self, news_list: List[Dict]) -> List[Dict]:
         """去重并排序"""
         print("[汇总] 正在去重和排序...")
         
-        # 去重
-        seen = set()
-        unique_news = []
-        
-        for news in news_list:
-            key = news.get('title', '')[:20].lower()
-            if key and key not in seen:
-                seen.add(key)
-                unique_news.append(news)
+        # 近似重复聚类：同一新闻的不同写法归为一簇，保留簇内第一条并记录所有来源
+        news_list = [news for news in news_list if news.get('title')]
+        threshold = self.config.get('dedup', {}).get('threshold', 0.5)
+        clusters = NearDupIndex(threshold=threshold).cluster([news['title'] for news in news_list])
         
-        # 限制数量
-        final_news = unique_news[:10]
+        unique_news = []
+        repeated = 0
+        for members in clusters:
+            # 簇内任意一种写法在之前几天发布过，整簇跳过（当天重跑时不排除当天已记录的新闻）
+            if self.seen_index and any(self.seen_index.contains(news_list[i], before=self.run_date)
+                                       for i in members):
+                repeated += 1
+                continue
+            news = news_list[members[0]]
+            news['sources'] = list(dict.fromkeys(news_list[i]['source'] for i in members))
+            news['cluster_size'] = len(members)
+            news['aliases'] = [news_list[i] for i in members[1:]]
+            unique_news.append(news)
+        
+        if repeated:
+            print(f"       跳过近期已发布: {repeated} 条")
+        
+        # 打分并选出 Top-K
+        top_k = self.config.get('ranking', {}).get('top_k', 10)
+        final_news = NewsRanker.from_config(self.config).top_k(unique_news, top_k)
         
         # 添加emoji
         emojis = ['🎯', '📈', '🏦', '💰', '🎬', '⚖️', '⚡', '📹', '🔒', '🏗️']
@@ -282,6 +455,16 @@ class XHSAIDailyPublisher:
         print(f"       去重后: {len(final_news)} 条")
         return final_news
     
+    def record_published(self, news_list: List[Dict]):
+        """把已发布的新闻（含簇内其他写法）写入跨天索引"""
+        if not self.seen_index:
+            return
+        stories = []
+        for news in news_list:
+            stories.append(news)
+            stories.extend(news.get('aliases', []))
+        self.seen_index.add_many(stories, day=self.run_date)
+    
     def generate_xhs_content(self, news_list: List[Dict]) -> str:
         """生成小红书格式内容"""
         today = datetime.now()
@@ -334,37 +517,65 @@ class XHSAIDailyPublisher:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
         
+        # 登记到文章索引，发布时查找最新日报不必扫描整个输出目录
+        with PostCatalog(self.output_dir) as catalog:
+            catalog.add(filepath, 'daily')
+        
         return filepath
     
-    def run(self, dry_run: bool = False) -> tuple:
-        """运行完整流程"""
+    def run(self, dry_run: bool = False, concurrent: bool = None) -> tuple:
+        """运行完整流程，返回 (内容, 文件路径)"""
+        result = self.run_pipeline(dry_run=dry_run, concurrent=concurrent)
+        return result.content, result.filepath
+    
+    def run_pipeline(self, dry_run: bool = False, concurrent: bool = None) -> RunResult:
+        """运行完整流程，返回 RunResult"""
         print("=" * 70)
         print("XHS AI日报生成器 v2.0")
         print("=" * 70)
         print()
         
+        timings = {}
+        
         # 收集新闻
-        all_news = []
-        all_news.extend(self.collect_from_ai_news_collectors())
-        all_news.extend(self.collect_from_news_aggregator())
-        all_news.extend(self.collect_from_techmeme())
+        start = time.perf_counter()
+        all_news = self.collect_all(concurrent=concurrent)
+        timings['collect'] = time.perf_counter() - start
         
         print()
         print(f"[汇总] 共收集 {len(all_news)} 条原始新闻")
         
         if not all_news:
             print("[Error] 未收集到任何新闻，请检查网络连接和skill配置")
-            return None, None
+            return RunResult(ok=False, timings=timings, source_timings=dict(self.source_timings),
+                             error="未收集到任何新闻，请检查网络连接和skill配置")
         
         # 去重排序
+        start = time.perf_counter()
         final_news = self.deduplicate_and_rank(all_news)
+        timings['rank'] = time.perf_counter() - start
+        
+        if not final_news:
+            # 不生成空日报，也不覆盖当天已有的文件；游标不推进，下次重新处理
+            print("[Skip] 去重后没有新的新闻，未生成日报")
+            self.cursors.discard()
+            return RunResult(ok=False, skipped=True, collected=len(all_news), timings=timings,
+                             source_timings=dict(self.source_timings),
+                             error="去重后没有可发布的新闻（均已在之前的日报中发布）")
         
         # 生成内容
+        start = time.perf_counter()
         content = self.generate_xhs_content(final_news)
+        timings['generate'] = time.perf_counter() - start
         
         # 保存
         if not dry_run:
+            start = time.perf_counter()
             filepath = self.save_content(content)
+            # 日报落盘后才推进游标，中途失败时下次会重新处理这些条目
+            self.cursors.commit()
+            self.record_published(final_news)
+            timings['save'] = time.perf_counter() - start
             print()
             print("=" * 70)
             print(f"生成完成！")
@@ -374,25 +585,64 @@ class XHSAIDailyPublisher:
         else:
             print()
             print("[Dry Run] 测试模式，未保存文件")
+            self.cursors.discard()
             filepath = None
         
-        return content, filepath
+        return RunResult(ok=True, filepath=filepath, content=content, items=final_news,
+                         collected=len(all_news), timings=timings,
+                         source_timings=dict(self.source_timings))
+
+
+def run_daily(config: Union[Dict, str, Path, None] = None, dry_run: bool = False,
+              concurrent: bool = None, cache_mode: str = 'normal') -> RunResult:
+    """
+    在当前进程中生成日报（入口脚本不必再启动一个 Python 解释器）
+    
+    Args:
+        config: 配置字典或配置文件路径，默认读取 config.json
+        dry_run: 测试模式，不保存文件
+        concurrent: 是否并发收集，默认取配置
+        cache_mode: normal / refresh / offline
+        
+    Returns:
+        RunResult: 失败时 ok 为 False，error 为错误信息（不抛异常）；没有新内容时
+            ok 为 False、skipped 为 True，入口脚本按正常结束处理
+    """
+    start = time.perf_counter()
+    try:
+        if isinstance(config, dict):
+            publisher = XHSAIDailyPublisher(cache_mode=cache_mode, config=config)
+        else:
+            publisher = XHSAIDailyPublisher(config_path=config, cache_mode=cache_mode)
+        result = publisher.run_pipeline(dry_run=dry_run, concurrent=concurrent)
+    except Exception as e:
+        result = RunResult(ok=False, error=f"{type(e).__name__}: {e}")
+    result.timings['total'] = time.perf_counter() - start
+    return result
 
 def main():
     parser = argparse.ArgumentParser(description='XHS AI日报生成器')
     parser.add_argument('--publish', action='store_true', help='生成后准备发布到小红书')
     parser.add_argument('--dry-run', action='store_true', help='测试模式，不保存文件')
     parser.add_argument('--config', type=str, help='配置文件路径')
+    parser.add_argument('--sequential', action='store_true', help='按顺序逐个收集（默认并发收集）')
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--refresh', action='store_true', help='忽略缓存，重新收集所有来源')
+    cache_group.add_argument('--offline', action='store_true', help='只使用已缓存的结果，不访问任何来源')
     
     args = parser.parse_args()
     
     # 创建发布器
-    publisher = XHSAIDailyPublisher(config_path=args.config)
+    cache_mode = 'refresh' if args.refresh else 'offline' if args.offline else 'normal'
+    publisher = XHSAIDailyPublisher(config_path=args.config, cache_mode=cache_mode)
     
     # 运行
-    content, filepath = publisher.run(dry_run=args.dry_run)
+    result = publisher.run_pipeline(
+        dry_run=args.dry_run,
+        concurrent=False if args.sequential else None
+    )
     
-    if content and args.publish:
+    if result.ok and args.publish:
         print()
         print("准备发布到小红书...")
         print("运行: python xhs_auto_publish.py --latest")
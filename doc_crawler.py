@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+官方文档爬虫
+
+从每个技术的文档首页出发，沿同站点下的子页面（features / benchmarks /
+quickstart 等）抓取，提取标题、代码块和性能表格，用来填充
+key_features / code_examples / benchmarks。
+
+- asyncio 调度：全局并发上限 + 每个 host 的并发上限，多个技术在同一个
+  事件循环里同时抓取（crawl_many 一次传入一批技术，限额对整批生效）
+- 请求走 HttpCache（共享连接池、条件请求重验证）。requests 是阻塞库，
+  每个进行中的请求占用一个线程（线程池大小等于全局并发上限），asyncio
+  只负责调度和限流
+- 响应体用 iter_content 边下载边增量解码、喂给 HTMLParser，解析与下载
+  重叠进行，不构建 DOM
+- 深度 / 页数预算：超出后不再入队
+
+Usage:
+    crawler = DocCrawler(HttpCache(cache_dir), max_pages=8)
+    docs = crawler.crawl_many({'Kimi': 'https://kimi.dev/docs'})
+    docs['Kimi']['key_features']
+"""
+
+import asyncio
+import codecs
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from http_cache import HttpCache, charset
+
+# 值得跟进的子页面（匹配 URL 路径或链接文字）
+SUBPAGE_KEYWORDS = ('feature', 'benchmark', 'performance', 'quickstart', 'quick-start',
+                    'getting-started', 'overview', 'example', '特性', '功能', '性能', '快速开始')
+
+_WS_RE = re.compile(r'\s+')
+
+
+def _clean(text: str) -> str:
+    return _WS_RE.sub(' ', text).strip()
+
+
+class DocExtractor(HTMLParser):
+    """
+    流式提取文档页面的结构化内容
+
+    Attributes:
+        title: <title> 或第一个 h1
+        description: meta description 或第一段正文
+        sections: [(标题, 标题后的第一段)]，来自 h2/h3
+        code_blocks: <pre> 中的代码
+        tables: 每个表格的行（单元格文本列表）
+        links: [(绝对 URL, 链接文字)]
+    """
+
+    _SKIP = {'script', 'style', 'noscript', 'svg'}
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ''
+        self.description = ''
+        self.sections: List[Tuple[str, str]] = []
+        self.code_blocks: List[str] = []
+        self.tables: List[List[List[str]]] = []
+        self.links: List[Tuple[str, str]] = []
+        self._buf: Optional[List[str]] = None  # 当前正在收集文本的元素
+        self._buf_tag = ''
+        self._skip = 0
+        self._pre = 0
+        self._row: Optional[List[str]] = None
+        self._href: Optional[str] = None
+        self._link_text: List[str] = []
+        self._pending_section: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip += 1
+            return
+        attrs = dict(attrs)
+        if tag == 'meta' and (attrs.get('name') or '').lower() == 'description':
+            self.description = self.description or _clean(attrs.get('content') or '')
+        elif tag == 'a' and attrs.get('href'):
+            self._href = urldefrag(urljoin(self.base_url, attrs['href']))[0]
+            self._link_text = []
+        elif tag == 'pre':
+            self._pre += 1
+            if self._pre == 1:
+                self._start('pre')
+        elif self._pre:
+            return
+        elif tag == 'table':
+            self.tables.append([])
+        elif tag == 'tr' and self.tables:
+            self._row = []
+        elif tag in ('td', 'th') and self._row is not None:
+            self._start(tag)
+        elif tag in ('title', 'h1', 'h2', 'h3', 'p') and self._buf is None:
+            self._start(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP:
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag == 'a' and self._href is not None:
+            self.links.append((self._href, _clean(''.join(self._link_text))))
+            self._href = None
+        elif tag == 'pre' and self._pre:
+            self._pre -= 1
+            if not self._pre:
+                code = ''.join(self._finish()).strip('\n')
+                if code.strip():
+                    self.code_blocks.append(code)
+        elif tag == 'tr' and self._row is not None:
+            if self._row:
+                self.tables[-1].append(self._row)
+            self._row = None
+        elif tag == self._buf_tag and not self._pre:
+            text = _clean(''.join(self._finish()))
+            if tag in ('td', 'th'):
+                self._row.append(text)
+            elif tag == 'title' or (tag == 'h1' and not self.title):
+                self.title = self.title or text
+            elif tag in ('h2', 'h3') and text:
+                self._pending_section = text
+                self.sections.append((text, ''))
+            elif tag == 'p' and text:
+                if self._pending_section is not None:
+                    self.sections[-1] = (self._pending_section, text)
+                    self._pending_section = None
+                self.description = self.description or text
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._buf is not None:
+            self._buf.append(data)
+        if self._href is not None:
+            self._link_text.append(data)
+
+    def _start(self, tag: str):
+        self._buf = []
+        self._buf_tag = tag
+
+    def _finish(self) -> List[str]:
+        buf = self._buf or []
+        self._buf = None
+        self._buf_tag = ''
+        return buf
+
+
+def extract(url: str, html: str) -> DocExtractor:
+    """提取一个已下载的页面"""
+    parser = DocExtractor(url)
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+class _StreamingExtractor:
+    """HttpCache.get 的 on_chunk 回调：按响应头的字符集增量解码后喂给 DocExtractor"""
+
+    def __init__(self, url: str):
+        self.parser = DocExtractor(url)
+        self._decoder = None
+
+    def __call__(self, chunk: bytes, headers: Dict[str, str]):
+        if self._decoder is None:
+            try:
+                self._decoder = codecs.getincrementaldecoder(charset(headers))(errors='replace')
+            except LookupError:
+                self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.parser.feed(self._decoder.decode(chunk))
+
+    def close(self) -> DocExtractor:
+        if self._decoder is not None:
+            self.parser.feed(self._decoder.decode(b'', final=True))
+        self.parser.close()
+        return self.parser
+
+
+def summarize(pages: List[DocExtractor], max_features: int = 6,
+              max_code: int = 3) -> Dict:
+    """把同一技术的多个页面合并为 tech_data 字段"""
+    features, seen_titles = [], set()
+    code_examples: List[str] = []
+    benchmarks: Dict[str, str] = {}
+    summary = ''
+    for page in pages:
+        summary = summary or page.description
+        for title, description in page.sections:
+            if len(features) < max_features and title.lower() not in seen_titles:
+                seen_titles.add(title.lower())
+                features.append({'title': title, 'description': description})
+        for code in page.code_blocks:
+            if len(code_examples) < max_code and code not in code_examples:
+                code_examples.append(code)
+        for table in page.tables:
+            # 第一行当表头，其余行取「第一列: 第二列」
+            for row in table[1:]:
+                if len(row) >= 2 and row[0] and row[0] not in benchmarks:
+                    benchmarks[row[0]] = row[1]
+    return {
+        'summary': summary,
+        'key_features': features,
+        'code_examples': code_examples,
+        'benchmarks': benchmarks,
+    }
+
+
+class DocCrawler:
+    """
+    有界并发的文档爬虫
+
+    Args:
+        cache: HttpCache 实例（共享连接池和磁盘缓存）
+        max_concurrency: 全局同时进行的请求数
+        per_host: 同一 host 同时进行的请求数
+        max_depth: 从首页起最多跟进几层链接
+        max_pages: 每个技术最多抓取的页面数
+        max_age: 缓存新鲜期（秒），传给 HttpCache.get
+    """
+
+    def __init__(self, cache: HttpCache, max_concurrency: int = 8, per_host: int = 2,
+                 max_depth: int = 1, max_pages: int = 8, max_age: float = 3600):
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.fetched = 0
+
+    async def _fetch(self, url: str) -> Optional[DocExtractor]:
+        host = urlparse(url).netloc
+        host_sem = self._host_sems.get(host)
+        if host_sem is None:
+            host_sem = self._host_sems[host] = asyncio.Semaphore(self.per_host)
+        async with self._global_sem, host_sem:
+            try:
+                page = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._fetch_page, url)
+            except Exception as e:
+                print(f"⚠️ 文档抓取失败 {url}: {e}")
+                return None
+        self.fetched += 1
+        return page
+
+    def _fetch_page(self, url: str) -> Optional[DocExtractor]:
+        """下载并解析一个页面（在线程池中执行，边下载边解析）"""
+        stream = _StreamingExtractor(url)
+        response = self.cache.get(url, self.max_age, on_chunk=stream)
+        if not 200 <= response.status < 300:
+            return None
+        return stream.close()
+
+    @staticmethod
+    def _wanted(root: str, url: str, text: str) -> bool:
+        """同站点、位于文档首页路径之下，且链接看起来是特性/性能/入门页"""
+        root_parts, parts = urlparse(root), urlparse(url)
+        if parts.scheme not in ('http', 'https') or parts.netloc != root_parts.netloc:
+            return False
+        # 按路径段比较：/docs 之下包括 /docs 和 /docs/...，不包括 /docsfoo
+        prefix = root_parts.path.rstrip('/')
+        if prefix and parts.path != prefix and not parts.path.startswith(prefix + '/'):
+            return False
+        haystack = f"{parts.path} {text}".lower()
+        return any(keyword in haystack for keyword in SUBPAGE_KEYWORDS)
+
+    async def crawl(self, root: str) -> List[DocExtractor]:
+        """抓取一个技术的文档，返回按抓取顺序排列的页面（首页在前）"""
+        seen = {root}
+        pages: List[DocExtractor] = []
+        level = [root]
+        for depth in range(self.max_depth + 1):
+            budget = self.max_pages - len(pages)
+            if not level or budget <= 0:
+                break
+            results = await asyncio.gather(*(self._fetch(url) for url in level[:budget]))
+            next_level = []
+            for page in results:
+                if page is None:
+                    continue
+                pages.append(page)
+                if depth == self.max_depth:
+                    continue
+                for url, text in page.links:
+                    if url not in seen and self._wanted(root, url, text):
+                        seen.add(url)
+                        next_level.append(url)
+            level = next_level
+        return pages
+
+    async def _crawl_many(self, roots: Dict[str, str]) -> Dict[str, List[DocExtractor]]:
+        self._global_sem = asyncio.Semaphore(self.max_concurrency)
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        names = list(roots)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix='doc-fetch') as self._executor:
+            results = await asyncio.gather(*(self.crawl(roots[name]) for name in names))
+        return dict(zip(names, results))
+
+    def crawl_many(self, roots: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        在一个事件循环中并发抓取一批技术的文档（并发上限对整批生效）
+
+        Args:
+            roots: 技术名称 -> 文档首页 URL
+
+        Returns:
+            Dict: 技术名称 -> summarize() 的结果
+        """
+        pages = asyncio.run(self._crawl_many(roots))
+        return {name: summarize(tech_pages) for name, tech_pages in pages.items()}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件写入工具
+
+所有落盘的缓存、索引和状态文件都通过这里写入：先写同目录临时文件，
+fsync 后再用 os.replace 原子替换，进程崩溃时不会留下写了一半的文件。
+多个进程要对同一个文件做「读-判断-写」时，用 file_lock 加进程间互斥锁。
+"""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8') -> Path:
+    """原子写入文本文件"""
+    return atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> Path:
+    """原子写入二进制文件"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, indent: int = 2) -> Path:
+    """原子写入 JSON 文件"""
+    return atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """
+    进程间互斥锁（阻塞等待），锁在 path 这个单独的锁文件上
+
+    POSIX 用 fcntl.flock，Windows 用 msvcrt.locking；进程退出时系统自动释放。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)  # LK_LOCK 重试约 10 秒后抛出 OSError
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+带条件重验证的 HTTP 磁盘缓存
+
+抓取官方文档等页面时使用。每个 URL 缓存一份响应体和元数据（ETag /
+Last-Modified / Content-Type / 抓取时间）:
+
+- max_age 秒内直接返回缓存，不发请求
+- 过期后带 If-None-Match / If-Modified-Since 发条件请求，304 时只刷新
+  抓取时间，不重新下载页面
+- 网络出错时有缓存就返回旧内容
+- 缓存总大小超过 max_bytes 时按最近访问时间（LRU）淘汰
+
+所有请求共用一个带连接池的 requests.Session（首次使用时才导入 requests）。
+传入 on_chunk 时响应体用 iter_content 边下载边回调（例如交给增量 HTML 解析器），
+解析和下载重叠进行；命中缓存时把缓存内容分块回调。
+
+Usage:
+    cache = HttpCache(Path('posts/.cache/http'), max_bytes=64 * 1024 * 1024)
+    response = cache.get('https://example.dev/docs', max_age=3600)
+    print(response.status, response.from_cache, len(response.body))
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from fsutil import atomic_write_bytes, atomic_write_json
+
+USER_AGENT = 'xhs-openclaw/1.0 (+doc fetcher)'
+CHUNK_SIZE = 16 * 1024
+
+# 按块接收响应体: (数据块, 响应头)
+ChunkFn = Callable[[bytes, Dict[str, str]], None]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 16):
+    """进程内共享的 requests.Session（连接池复用 TCP/TLS 连接）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+
+@dataclass
+class CachedResponse:
+    """缓存层返回的响应"""
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False  # 响应体来自本地缓存（新鲜命中、304 或网络出错时的旧内容）
+    revalidated: bool = False  # 经过条件请求确认（304）
+    stale: bool = False  # 网络出错时返回的旧内容
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(charset(self.headers), errors='replace')
+
+
+def charset(headers: Dict[str, str]) -> str:
+    """Content-Type 中的字符集，默认 utf-8"""
+    for part in headers.get('Content-Type', '').split(';'):
+        key, _, value = part.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return 'utf-8'
+
+
+def _replay(body: bytes, headers: Dict[str, str], on_chunk: Optional[ChunkFn]):
+    """把缓存中的响应体分块交给 on_chunk"""
+    if on_chunk is None:
+        return
+    for start in range(0, len(body), CHUNK_SIZE):
+        on_chunk(body[start:start + CHUNK_SIZE], headers)
+
+
+class HttpCache:
+    """
+    按 URL 缓存 GET 响应
+
+    Args:
+        cache_dir: 缓存目录（<key>.body + <key>.json）
+        max_bytes: 响应体总大小上限，超出时淘汰最久未访问的条目
+        session: 自定义 Session，默认使用 get_session()
+        timeout: 请求超时（秒）
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024,
+                 session=None, timeout: float = 15):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._session = session
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        for body in self.cache_dir.glob('*.body'):
+            try:
+                self._sizes[body.stem] = body.stat().st_size
+            except OSError:
+                continue
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = get_session()
+        return self._session
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:24]
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str):
+        """读取缓存条目，返回 (元数据, 响应体)，不存在或损坏时返回 (None, None)"""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def _touch(self, key: str):
+        """更新访问时间，作为 LRU 顺序"""
+        _, meta_path = self._paths(key)
+        try:
+            os.utime(meta_path, None)
+        except OSError:
+            pass
+
+    def _store(self, key: str, meta: Dict, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        body_path, meta_path = self._paths(key)
+        atomic_write_bytes(body_path, body)
+        atomic_write_json(meta_path, meta)
+        with self._lock:
+            self._sizes[key] = len(body)
+        self._evict()
+
+    def _evict(self):
+        """总大小超限时按访问时间从旧到新删除"""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            entries = []
+            for key in self._sizes:
+                try:
+                    entries.append((self._paths(key)[1].stat().st_mtime, key))
+                except OSError:
+                    entries.append((0.0, key))
+            for _, key in sorted(entries):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                for path in self._paths(key):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                del self._sizes[key]
+
+    def get(self, url: str, max_age: float = 0, timeout: Optional[float] = None,
+            on_chunk: Optional[ChunkFn] = None) -> CachedResponse:
+        """
+        GET 一个 URL，优先使用缓存
+
+        Args:
+            url: 地址
+            max_age: 缓存在多少秒内视为新鲜（不发请求）；0 表示每次都重验证
+            timeout: 请求超时，默认使用构造时的设置
+            on_chunk: 可选，按块接收 2xx 响应体（网络响应边下载边回调，缓存命中时分块回放）
+
+        Returns:
+            CachedResponse: 响应；非 2xx/304 的响应不缓存，原样返回
+        """
+        key = self.key(url)
+        meta, body = self._load(key)
+
+        if meta is not None and max_age > 0 and time.time() - meta['fetched_at'] < max_age:
+            self._touch(key)
+            _replay(body, meta['headers'], on_chunk)
+            return CachedResponse(url, meta['status'], body, meta['headers'], from_cache=True)
+
+        headers = {}
+        if meta is not None:
+            if meta['headers'].get('ETag'):
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if meta['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout,
+                                        stream=on_chunk is not None)
+        except Exception as e:
+            if meta is None:
+                raise
+            print(f"⚠️ 请求 {url} 失败，使用缓存: {e}")
+            self._touch(key)
+            _replay(body, meta['headers'], on_chunk)
+            return CachedResponse(url, meta['status'], body, meta['headers'], from_cache=True, stale=True)
+
+        if response.status_code == 304 and meta is not None:
+            meta['fetched_at'] = time.time()
+            for name in ('ETag', 'Last-Modified'):
+                if response.headers.get(name):
+                    meta['headers'][name] = response.headers[name]
+            atomic_write_json(self._paths(key)[1], meta)
+            response.close()
+            _replay(body, meta['headers'], on_chunk)
+            return CachedResponse(url, meta['status'], body, meta['headers'],
+                                  from_cache=True, revalidated=True)
+
+        kept = {name: response.headers[name]
+                for name in ('ETag', 'Last-Modified', 'Content-Type') if response.headers.get(name)}
+        ok = 200 <= response.status_code < 300
+        if on_chunk is not None and ok:
+            parts = []
+            with response:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    parts.append(chunk)
+                    on_chunk(chunk, kept)
+            content = b''.join(parts)
+        else:
+            content = response.content
+        result = CachedResponse(url, response.status_code, content, kept)
+        if ok:
+            self._store(key, {
+                'url': url,
+                'status': response.status_code,
+                'headers': kept,
+                'fetched_at': time.time(),
+            }, content)
+        return result
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+后台配图任务队列
+
+配图是流水线里最慢、限流最严的一步。generate_image 只把任务写进队列，
+文章文本照常生成和保存；后台 worker 从队列取任务生成图片，完成后把
+图片路径写回对应文章的 meta.json。
+
+- 持久化：SQLite（jobs 表），进程退出时未完成的任务下次启动继续处理
+- 租约：取出的任务记录 owner（主机名:pid）和 lease_until，worker 池运行期间
+  由心跳线程定期续约；只有租约过期的 running 任务（持有者已退出或卡死）
+  才会被放回队列，不会抢走其他存活进程正在生成的任务
+- 并发：workers 个线程；所有 worker 共享一个 QPS 限速器
+- 批量：同一 provider + 参数的任务一次最多取 batch_size 个交给生成函数
+  （provider 不支持批量时设为 1）
+- 失败重试：最多 max_attempts 次，之后标记为 failed 并写进 meta.json
+- 生成前先查封面缓存（CoverCache），命中时不占用 QPS
+
+Usage:
+    queue = ImageJobQueue(Path('posts/.state/image_jobs.sqlite3'))
+    job_id = queue.enqueue(prompt, 'nano-banana-pro', {'style': 'professional'}, output_path)
+    queue.attach_post(job_id, post_dir)
+
+    pool = ImageWorkerPool(queue, generate, workers=2, qps=0.5)
+    pool.start()
+    pool.drain(timeout=600)
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import post_store
+from cover_cache import CoverCache
+
+# 生成函数: (provider, params, [(prompt, output_path)]) -> 每个任务的图片路径（失败为 None 或异常）
+GenerateFn = Callable[[str, Dict, List[tuple]], List[Optional[Path]]]
+
+
+class RateLimiter:
+    """所有 worker 共享的请求间隔限速（qps <= 0 表示不限速）"""
+
+    def __init__(self, qps: float):
+        self.interval = 1.0 / qps if qps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """等到下一个可用时间点；stop 被设置时提前返回 False"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if wait and stop is not None:
+            return not stop.wait(wait)
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+class ImageJobQueue:
+    """
+    SQLite 持久化的配图任务队列
+
+    Args:
+        db_path: SQLite 文件路径
+        max_attempts: 单个任务最多尝试次数
+        lease_seconds: 取出任务的租约时长，持有者需在到期前续约
+    """
+
+    def __init__(self, db_path: Path, max_attempts: int = 3, lease_seconds: float = 120):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " prompt TEXT NOT NULL,"
+            " provider TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " output_path TEXT NOT NULL,"
+            " result_path TEXT,"
+            " post_dir TEXT,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " owner TEXT,"
+            " lease_until REAL)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for column, sql_type in (('result_path', 'TEXT'), ('owner', 'TEXT'), ('lease_until', 'REAL')):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+        self.conn.commit()
+
+    def enqueue(self, prompt: str, provider: str, params: Dict, output_path: Path) -> int:
+        """加入任务；同一输出路径已有未完成的任务时直接返回该任务"""
+        output_path = str(output_path)
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE output_path = ? AND status IN ('pending', 'running')",
+                (output_path,)
+            ).fetchone()
+            if row:
+                return row[0]
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (prompt, provider, params, output_path, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, 'pending', ?, ?)",
+                (prompt, provider, json.dumps(params or {}, sort_keys=True), output_path, now, now)
+            )
+            return cursor.lastrowid
+
+    def job_for_output(self, output_path: Path) -> Optional[int]:
+        """输出路径对应的最近一个任务"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE output_path = ? ORDER BY id DESC LIMIT 1", (str(output_path),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def recover(self) -> int:
+        """把租约已过期的 running 任务（持有进程已退出或卡死）放回队列，返回条数"""
+        now = time.time()
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET status = 'pending', owner = NULL, lease_until = NULL, updated_at = ?"
+                " WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (now, now)
+            ).rowcount
+
+    def renew_leases(self) -> int:
+        """续约本进程持有的 running 任务，返回条数"""
+        now = time.time()
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE status = 'running' AND owner = ?",
+                (now + self.lease_seconds, self.owner)
+            ).rowcount
+
+    def claim_batch(self, limit: int) -> List[Dict]:
+        """取出最早的一批同 provider + 参数的任务并标记为 running"""
+        with self._lock, self.conn:
+            first = self.conn.execute(
+                "SELECT provider, params FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if not first:
+                return []
+            rows = self.conn.execute(
+                "SELECT id, prompt, provider, params, output_path, attempts FROM jobs"
+                " WHERE status = 'pending' AND provider = ? AND params = ? ORDER BY id LIMIT ?",
+                (first[0], first[1], max(1, limit))
+            ).fetchall()
+            now = time.time()
+            # 只保留确实由本进程从 pending 改为 running 的任务（其他进程可能同时在取）
+            rows = [row for row in rows if self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, owner = ?, lease_until = ?,"
+                " updated_at = ? WHERE id = ? AND status = 'pending'",
+                (self.owner, now + self.lease_seconds, now, row[0])
+            ).rowcount]
+        return [{
+            'id': row[0], 'prompt': row[1], 'provider': row[2], 'params': json.loads(row[3]),
+            'output_path': row[4], 'attempts': row[5] + 1,
+        } for row in rows]
+
+    def complete(self, job_id: int, image_path: Path):
+        self._finish(job_id, 'done', None, str(image_path))
+
+    def fail(self, job_id: int, error: str, attempts: int):
+        """记录失败；未到最大次数时放回队列重试"""
+        status = 'failed' if attempts >= self.max_attempts else 'pending'
+        self._finish(job_id, status, error, None)
+
+    def release(self, job_id: int):
+        """未开始生成就停止时，把任务原样放回队列（不计入尝试次数）"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = attempts - 1, owner = NULL, lease_until = NULL,"
+                " updated_at = ? WHERE id = ?",
+                (time.time(), job_id)
+            )
+
+    def _finish(self, job_id: int, status: str, error: Optional[str], image_path: Optional[str]):
+        with self._lock:
+            with self.conn:
+                if image_path:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, error = NULL, result_path = ?, lease_until = NULL,"
+                        " updated_at = ? WHERE id = ?",
+                        (status, image_path, time.time(), job_id)
+                    )
+                else:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                        (status, error, time.time(), job_id)
+                    )
+            self._sync_meta(job_id)
+
+    def attach_post(self, job_id: int, post_dir: Path):
+        """关联文章目录；任务已完成时立即写回 meta.json，否则标记为 pending"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("UPDATE jobs SET post_dir = ? WHERE id = ?", (str(post_dir), job_id))
+            self._sync_meta(job_id)
+
+    def _sync_meta(self, job_id: int):
+        """把任务状态写进关联文章的 meta.json（调用方持有 self._lock）"""
+        row = self.conn.execute(
+            "SELECT post_dir, status, result_path, error FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not row or not row[0]:
+            return
+        post_dir, status, result_path, error = row
+
+        def update(meta: Dict):
+            meta['image_job'] = job_id
+            meta['image_status'] = status
+            if status == 'done':
+                meta['image_file'] = result_path
+                meta.pop('image_error', None)
+            elif status == 'failed':
+                meta['image_error'] = error
+
+        post_store.update_meta(Path(post_dir), update)
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的任务数"""
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+class ImageWorkerPool:
+    """
+    消费 ImageJobQueue 的后台 worker
+
+    Args:
+        queue: 任务队列
+        generate: 生成函数，见 GenerateFn
+        workers: 线程数
+        qps: 每秒最多调用生成函数的次数（一批算一次）
+        batch_size: 每次最多交给生成函数的任务数
+        cover_cache: 可选的封面缓存，命中时不调用生成函数
+        postprocess: 可选的后处理函数（原图路径 -> 最终路径），缓存中保存的是原图
+        poll_interval: 队列为空时的轮询间隔（秒）
+    """
+
+    def __init__(self, queue: ImageJobQueue, generate: GenerateFn, workers: int = 1,
+                 qps: float = 0.5, batch_size: int = 1, cover_cache: Optional[CoverCache] = None,
+                 postprocess: Optional[Callable[[Path], Path]] = None, poll_interval: float = 0.5):
+        self.queue = queue
+        self.generate = generate
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.limiter = RateLimiter(qps)
+        self.cover_cache = cover_cache
+        self.postprocess = postprocess
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._recover()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"image-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="image-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def _recover(self):
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"🖼️ 恢复 {recovered} 个租约过期的配图任务")
+
+    def _heartbeat(self):
+        """续约本进程正在生成的任务，顺便回收其他进程遗留的过期任务"""
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            self.queue.renew_leases()
+            self._recover()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            jobs = self.queue.claim_batch(self.batch_size)
+            if not jobs:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._run_batch(jobs)
+
+    def _run_batch(self, jobs: List[Dict]):
+        pending = []
+        for job in jobs:
+            hit = self.cover_cache and self.cover_cache.lookup(
+                job['prompt'], job['provider'], job['params'], Path(job['output_path']))
+            if hit:
+                self.queue.complete(job['id'], self._finalize(hit))
+            else:
+                pending.append(job)
+        if not pending:
+            return
+        if not self.limiter.acquire(self._stop):
+            for job in pending:
+                self.queue.release(job['id'])
+            return
+
+        provider, params = pending[0]['provider'], pending[0]['params']
+        try:
+            results = self.generate(provider, params, [(job['prompt'], Path(job['output_path']))
+                                                       for job in pending])
+        except Exception as e:
+            results = [e] * len(pending)
+
+        for job, result in zip(pending, results):
+            if isinstance(result, Exception) or result is None or not Path(result).exists():
+                error = str(result) if isinstance(result, Exception) else '未生成图片文件'
+                print(f"⚠️ 配图任务 #{job['id']} 失败（第 {job['attempts']} 次）: {error}")
+                self.queue.fail(job['id'], error, job['attempts'])
+                continue
+            if self.cover_cache:
+                self.cover_cache.store(job['prompt'], provider, params, Path(result))
+            final = self._finalize(Path(result))
+            self.queue.complete(job['id'], final)
+            print(f"🖼️ 配图完成 #{job['id']}: {final}")
+
+    def _finalize(self, path: Path) -> Path:
+        if self.postprocess is None:
+            return path
+        try:
+            return self.postprocess(path)
+        except Exception as e:
+            print(f"⚠️ 配图后处理失败 {path}: {e}")
+            return path
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的任务全部完成（或失败），返回是否在超时前清空"""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            counts = self.queue.counts()
+            if not counts.get('pending') and not counts.get('running'):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(min(self.poll_interval, 0.2))
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻标题近似重复检测（MinHash + LSH）
+
+- 分词同时支持中英文：英文/数字按单词切分，中文按相邻两字（bigram）切分
+- 每个标题生成 bands × rows 个 MinHash 值，按 bands 分桶；同一桶内的标题才会
+  进一步用精确 Jaccard 相似度确认，整体复杂度接近线性
+- 两个标题成为候选的概率为 1 - (1 - J^rows)^bands，这条 S 曲线的中点约为
+  (1/bands)^(1/rows)；默认按阈值推出 bands，让中点落在阈值上（threshold=0.5 时
+  rows=3、bands=8：J=0.5 的候选概率约 0.66，J=0.6 约 0.86，J=0.7 约 0.97，
+  J=0.3 只有 0.2，低相似度的标题很少进入精确比较）
+- 结果是聚类（每簇保留原始顺序），而不是直接丢弃重复条目
+
+Usage:
+    index = NearDupIndex(threshold=0.5)
+    clusters = index.cluster(titles)    # [[0, 3], [1], [2, 4], ...]
+"""
+
+import hashlib
+import math
+import random
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+# 英文单词/数字（允许 GPT-4o、3.5 这类写法）或单个中日韩字符
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:[.\-][a-z0-9]+)*|[\u3400-\u9fff\uf900-\ufaff]')
+
+# 出现频率高但不区分新闻的英文词
+STOPWORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'by',
+    'at', 'as', 'is', 'are', 'its', 'it', 'from', 'that', 'this', 'new', 'says',
+})
+
+# MinHash 置换 h -> (a*h + b) mod p 使用的梅森素数
+_MERSENNE = (1 << 61) - 1
+
+
+def shingles(title: str) -> FrozenSet[str]:
+    """把标题切成特征集合：英文单词 + 中文二元组"""
+    text = unicodedata.normalize('NFKC', title).lower()
+    features = set()
+    cjk_run = []
+    for token in _TOKEN_RE.findall(text):
+        if len(token) == 1 and not token.isascii():
+            cjk_run.append(token)
+            continue
+        _flush_cjk(cjk_run, features)
+        cjk_run = []
+        if token not in STOPWORDS:
+            features.add(token)
+    _flush_cjk(cjk_run, features)
+    return frozenset(features)
+
+
+def _flush_cjk(run: List[str], features: set):
+    if len(run) == 1:
+        features.add(run[0])
+    for i in range(len(run) - 1):
+        features.add(run[i] + run[i + 1])
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDupIndex:
+    """
+    MinHash + LSH 近似重复聚类
+
+    Args:
+        threshold: 判定为同一新闻的 Jaccard 相似度下限
+        rows: 每个桶的 MinHash 值个数，越大 S 曲线越陡
+        bands: LSH 分桶数；默认取使 (1/bands)^(1/rows) <= threshold 的最小值
+            （threshold=0.5, rows=3 时为 8 个桶、24 个 MinHash 值）
+        max_bucket: 单个桶的最大比较数，超过后视为高频特征不再比较，防止退化为平方复杂度
+    """
+
+    def __init__(self, threshold: float = 0.5, rows: int = 3, bands: int = None,
+                 max_bucket: int = 64, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold 必须在 (0, 1] 之间")
+        if bands is None:
+            bands = max(1, math.ceil((1 / threshold) ** rows - 1e-9))
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket = max_bucket
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(_MERSENNE))
+                       for _ in range(bands * rows)]
+        self._hash_cache: Dict[str, Tuple[int, ...]] = {}
+
+    def _feature_hashes(self, feature: str) -> Tuple[int, ...]:
+        """特征在每个置换下的哈希值（按特征缓存，标题之间的公共词只算一次）"""
+        hashes = self._hash_cache.get(feature)
+        if hashes is None:
+            h = _hash64(feature)
+            hashes = self._hash_cache[feature] = tuple((a * h + b) % _MERSENNE for a, b in self._perms)
+        return hashes
+
+    def signature(self, features: Iterable[str]) -> Tuple[int, ...]:
+        """MinHash 签名：每个置换下特征哈希的最小值"""
+        vectors = [self._feature_hashes(feature) for feature in features]
+        if not vectors:
+            return ()
+        return tuple(map(min, zip(*vectors)))
+
+    def candidate_probability(self, similarity: float) -> float:
+        """Jaccard 相似度为 similarity 的两个标题落入同一个桶的概率"""
+        return 1 - (1 - similarity ** self.rows) ** self.bands
+
+    def cluster(self, titles: List[str]) -> List[List[int]]:
+        """
+        对标题聚类
+
+        Args:
+            titles: 标题列表
+
+        Returns:
+            List[List[int]]: 每个簇内的下标（升序），簇按首个成员的下标排序
+        """
+        parent = list(range(len(titles)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        features = [shingles(t or '') for t in titles]
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        rows = self.rows
+
+        for i, feats in enumerate(features):
+            sig = self.signature(feats)
+            if not sig:
+                continue
+            compared = set()
+            for band in range(self.bands):
+                key = (band, sig[band * rows:(band + 1) * rows])
+                members = buckets.setdefault(key, [])
+                if len(members) >= self.max_bucket:
+                    continue
+                for j in members:
+                    if j in compared:
+                        continue
+                    compared.add(j)
+                    if find(i) != find(j) and jaccard(feats, features[j]) >= self.threshold:
+                        ri, rj = find(i), find(j)
+                        parent[max(ri, rj)] = min(ri, rj)
+                members.append(i)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(titles)):
+            groups.setdefault(find(i), []).append(i)
+        return sorted(groups.values(), key=lambda members: members[0])
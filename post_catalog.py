@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章目录索引
+
+输出目录里积累了几年的日报和技术文章后，每次找「最新一篇」都要 glob +
+stat 整个目录。这里在写入文章时顺手登记到 SQLite 索引，查询只走索引:
+
+- latest / by_date / by_tech / unpublished 都有对应的索引，O(log n)
+- save_content / save_post 写文件后登记，发布台账更新状态时同步 status
+- 索引记录的文件被手动删除时，查询会跳过并删掉这条记录
+- 索引丢失或损坏时用 rebuild 从目录（和打包存储）重新扫描（首次打开时自动执行一次）
+
+Usage:
+    python post_catalog.py rebuild output/
+    python post_catalog.py latest output/ --kind daily
+    python post_catalog.py unpublished posts/
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import post_store
+
+CATALOG_NAME = 'catalog.sqlite3'
+DAILY_GLOB = 'xhs_ai_news_*.txt'
+POST_FILE = 'xiaohongshu.txt'
+
+_DAILY_RE = re.compile(r'xhs_ai_news_(\d{4})(\d{2})(\d{2})\.txt$')
+_INSERT_SQL = (
+    "INSERT OR REPLACE INTO posts (path, kind, tech, day, created_at, status) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def catalog_path(output_dir: Path) -> Path:
+    return Path(output_dir) / '.state' / CATALOG_NAME
+
+
+def _normalize_day(day: str) -> str:
+    """20261018 / 2026-10-18 -> 2026-10-18"""
+    digits = day.replace('-', '')
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
+
+
+class PostCatalog:
+    """
+    输出目录的文章索引
+
+    Args:
+        output_dir: 日报输出目录或技术文章 posts 目录
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.db_path = catalog_path(self.output_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        created = not self.db_path.exists()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " path TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " tech TEXT,"
+            " day TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " status TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_kind ON posts(kind, day, created_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_day ON posts(day, created_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_tech ON posts(tech, created_at)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_unpublished ON posts(kind, created_at)"
+            " WHERE status != 'published'"
+        )
+        self.conn.commit()
+        if created:
+            self.rebuild()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _key(self, content_file: Path) -> str:
+        path = Path(content_file)
+        try:
+            return path.resolve().relative_to(self.output_dir.resolve()).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def add(self, content_file: Path, kind: str, tech: str = None, created_at: float = None,
+            status: str = 'ready_to_publish'):
+        """
+        登记一篇文章（同一路径重复登记时覆盖）
+
+        Args:
+            content_file: 内容文件（日报 txt 或文章目录下的 xiaohongshu.txt）
+            kind: daily / tech
+            tech: 技术名称
+            created_at: 时间戳，默认当前时间
+            status: 发布状态
+        """
+        with self.conn:
+            self.conn.execute(_INSERT_SQL, self._row(content_file, kind, tech, created_at, status))
+
+    def _row(self, content_file: Path, kind: str, tech: Optional[str], created_at: Optional[float],
+             status: str) -> tuple:
+        created_at = created_at or time.time()
+        match = _DAILY_RE.search(Path(content_file).name)
+        if match:
+            day = '-'.join(match.groups())
+        else:
+            day = datetime.fromtimestamp(created_at).strftime('%Y-%m-%d')
+        return self._key(content_file), kind, tech, day, created_at, status
+
+    def set_status(self, content_file: Path, status: str) -> bool:
+        """更新发布状态，文章不在索引中时返回 False"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE posts SET status = ? WHERE path = ?", (status, self._key(content_file))
+            )
+        return cursor.rowcount > 0
+
+    def _existing(self, sql: str, params: tuple, limit: Optional[int] = None) -> List[Path]:
+        """执行查询，跳过并删除文件已不存在的记录"""
+        paths, stale = [], []
+        for (key,) in self.conn.execute(sql, params):
+            path = self.output_dir / key
+            if not post_store.exists(path):
+                stale.append((key,))
+                continue
+            paths.append(path)
+            if limit and len(paths) >= limit:
+                break
+        if stale:
+            with self.conn:
+                self.conn.executemany("DELETE FROM posts WHERE path = ?", stale)
+        return paths
+
+    def latest(self, kind: str = None) -> Optional[Path]:
+        """最新一篇（kind 为空时不区分类型）"""
+        if kind:
+            sql = "SELECT path FROM posts WHERE kind = ? ORDER BY day DESC, created_at DESC"
+            params = (kind,)
+        else:
+            sql = "SELECT path FROM posts ORDER BY day DESC, created_at DESC"
+            params = ()
+        found = self._existing(sql, params, limit=1)
+        return found[0] if found else None
+
+    def by_date(self, day: str, kind: str = None) -> List[Path]:
+        """某一天的文章，按时间先后"""
+        if kind:
+            return self._existing(
+                "SELECT path FROM posts WHERE kind = ? AND day = ? ORDER BY created_at",
+                (kind, _normalize_day(day))
+            )
+        return self._existing(
+            "SELECT path FROM posts WHERE day = ? ORDER BY created_at", (_normalize_day(day),)
+        )
+
+    def by_tech(self, tech: str) -> List[Path]:
+        """某个技术的文章，最新的在前"""
+        return self._existing(
+            "SELECT path FROM posts WHERE tech = ? ORDER BY created_at DESC", (tech,)
+        )
+
+    def unpublished(self, kind: str = None, limit: int = None) -> List[Path]:
+        """还没发布的文章，按时间先后"""
+        if kind:
+            return self._existing(
+                "SELECT path FROM posts WHERE kind = ? AND status != 'published' ORDER BY created_at",
+                (kind,), limit
+            )
+        return self._existing(
+            "SELECT path FROM posts WHERE status != 'published' ORDER BY created_at", (), limit
+        )
+
+    def count(self) -> int:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()
+        return count
+
+    def rebuild(self, statuses: Dict[str, str] = None) -> int:
+        """
+        扫描输出目录重建索引
+
+        Args:
+            statuses: 内容文件绝对路径 -> 发布状态，默认读取输出目录下的发布台账；
+                      技术文章以 meta.json 中的状态为准
+
+        Returns:
+            int: 登记的文章数
+        """
+        if statuses is None:
+            statuses = _ledger_statuses(self.output_dir)
+        rows = []
+        for path in self.output_dir.glob(DAILY_GLOB):
+            if _DAILY_RE.search(path.name):
+                status = statuses.get(str(path.resolve()), 'ready_to_publish')
+                rows.append((path, 'daily', None, path.stat().st_mtime, status))
+        for meta_path in self.output_dir.glob('*/meta.json'):
+            content_file = meta_path.parent / POST_FILE
+            if not content_file.exists():
+                continue
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                created_at = datetime.fromisoformat(meta['created_at']).timestamp()
+            except (OSError, ValueError, KeyError):
+                meta, created_at = {}, content_file.stat().st_mtime
+            status = meta.get('status') or statuses.get(str(content_file.resolve()), 'ready_to_publish')
+            rows.append((content_file, 'tech', meta.get('tech_name'), created_at, status))
+        if post_store.store_path(self.output_dir).exists():
+            store = post_store.open_store(post_store.store_path(self.output_dir))
+            for post_id in store.post_ids():
+                meta = store.read_meta(post_id)
+                try:
+                    created_at = datetime.fromisoformat(meta['created_at']).timestamp()
+                except (ValueError, KeyError):
+                    created_at = time.time()
+                rows.append((self.output_dir / post_id / POST_FILE, 'tech', meta.get('tech_name'),
+                             created_at, meta.get('status', 'ready_to_publish')))
+
+        with self.conn:
+            self.conn.execute("DELETE FROM posts")
+            self.conn.executemany(_INSERT_SQL, [self._row(*row) for row in rows])
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def _ledger_statuses(output_dir: Path) -> Dict[str, str]:
+    """输出目录下发布台账中每个内容文件的最新状态（没有台账时为空）"""
+    from publish_ledger import LEDGER_NAME, PublishLedger
+
+    path = Path(output_dir) / '.state' / LEDGER_NAME
+    if not path.exists():
+        return {}
+    ledger = PublishLedger(path)
+    statuses = {}
+    for record in sorted(ledger.entries.values(), key=lambda r: r['ts']):
+        statuses[str(Path(record['file']).resolve())] = record['status']
+    return statuses
+
+
+def update_status(content_file: Path, status: str) -> bool:
+    """
+    同步发布状态到内容文件所在输出目录的索引（没有索引时不创建）
+
+    日报位于输出目录下，技术文章位于输出目录的子目录下。
+    """
+    content_file = Path(content_file)
+    for output_dir in (content_file.parent, content_file.parent.parent):
+        if catalog_path(output_dir).exists():
+            with PostCatalog(output_dir) as catalog:
+                return catalog.set_status(content_file, status)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章目录索引')
+    parser.add_argument('command', choices=['rebuild', 'latest', 'by-date', 'by-tech', 'unpublished'])
+    parser.add_argument('output_dir', help='日报输出目录或技术文章 posts 目录')
+    parser.add_argument('value', nargs='?', help='by-date 的日期 (YYYYMMDD) / by-tech 的技术名称')
+    parser.add_argument('--kind', choices=['daily', 'tech'], default=None)
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    if not output_dir.is_dir():
+        print(f"[Error] 目录不存在: {output_dir}")
+        return
+    with PostCatalog(output_dir) as catalog:
+        if args.command == 'rebuild':
+            started = time.perf_counter()
+            count = catalog.rebuild()
+            print(f"[OK] 已重建索引: {count} 篇 ({time.perf_counter() - started:.2f}s)")
+            return
+        if args.command in ('by-date', 'by-tech') and not args.value:
+            parser.error(f"{args.command} 需要指定日期或技术名称")
+        if args.command == 'latest':
+            latest = catalog.latest(args.kind)
+            paths = [latest] if latest else []
+        elif args.command == 'by-date':
+            paths = catalog.by_date(args.value, args.kind)
+        elif args.command == 'by-tech':
+            paths = catalog.by_tech(args.value)
+        else:
+            paths = catalog.unpublished(args.kind, args.limit)
+    for path in paths:
+        print(path)
+    if not paths:
+        print("[Info] 没有匹配的文章")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+打包的文章存储
+
+默认每篇文章一个目录、三个小文件（article.md / xiaohongshu.txt /
+meta.json）。批量生成时小文件和 inode 数量很多，写到一半崩溃还会留下
+不完整的文章。config.json 中 storage.backend 设为 "packed" 后，文章改为
+写进输出目录下的 .state/posts.sqlite3:
+
+- 一篇文章的所有文件和 meta 在同一个事务里写入，不会出现半篇文章
+- 批量提交：新文章先缓冲在内存，每 commit_every 篇（以及 flush / 进程
+  退出时）在一个事务中写入；崩溃最多丢掉未提交的整篇文章
+- 文章仍以「输出目录 / 文章 id」的路径标识，read_meta / update_meta /
+  read_text / exists 对目录和打包两种存储通用，调用方不必区分
+- export 把打包的文章导出为原来的目录结构
+
+Usage:
+    python post_store.py list posts/.state/posts.sqlite3
+    python post_store.py export posts/.state/posts.sqlite3 posts/
+"""
+
+import argparse
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from fsutil import atomic_write_json, atomic_write_text
+
+STORE_NAME = 'posts.sqlite3'
+META_FILE = 'meta.json'
+# meta 中记录文件路径的字段，导出时改为导出后的路径
+FILE_META_KEYS = {'article.md': 'markdown_file', 'xiaohongshu.txt': 'xiaohongshu_file'}
+
+_stores: Dict[str, 'PostStore'] = {}
+_stores_lock = threading.Lock()
+
+
+def store_path(output_dir: Path) -> Path:
+    return Path(output_dir) / '.state' / STORE_NAME
+
+
+class PostStore:
+    """
+    SQLite 打包文章存储
+
+    Args:
+        db_path: SQLite 文件路径
+        commit_every: 缓冲多少篇新文章后提交一次
+    """
+
+    def __init__(self, db_path: Path, commit_every: int = 20):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_every = max(1, commit_every)
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Dict] = {}  # post_id -> {'files': {...}, 'meta': {...}, 'created_at': ts}
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " post_id TEXT PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " meta TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " post_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " PRIMARY KEY (post_id, name))"
+        )
+        self.conn.commit()
+
+    def put(self, post_id: str, files: Dict[str, str], meta: Dict):
+        """
+        写入一篇文章（缓冲，达到 commit_every 篇时提交）
+
+        Args:
+            post_id: 文章 id（目录存储下的目录名）
+            files: 文件名 -> 文本内容
+            meta: 元数据
+        """
+        with self._lock:
+            self._pending[post_id] = {'files': dict(files), 'meta': meta, 'created_at': time.time()}
+            if len(self._pending) >= self.commit_every:
+                self.flush()
+
+    def flush(self) -> int:
+        """把缓冲的文章在一个事务中写入，返回写入篇数"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            posts, files = [], []
+            for post_id, post in self._pending.items():
+                posts.append((post_id, post['created_at'], json.dumps(post['meta'], ensure_ascii=False)))
+                files.extend((post_id, name, content) for name, content in post['files'].items())
+            with self.conn:
+                self.conn.executemany("DELETE FROM files WHERE post_id = ?", [(p[0],) for p in posts])
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO posts (post_id, created_at, meta) VALUES (?, ?, ?)", posts
+                )
+                self.conn.executemany("INSERT INTO files (post_id, name, content) VALUES (?, ?, ?)", files)
+            count = len(self._pending)
+            self._pending.clear()
+            return count
+
+    def contains(self, post_id: str) -> bool:
+        with self._lock:
+            if post_id in self._pending:
+                return True
+            return self.conn.execute(
+                "SELECT 1 FROM posts WHERE post_id = ?", (post_id,)
+            ).fetchone() is not None
+
+    def read_file(self, post_id: str, name: str) -> Optional[str]:
+        """读取文章中的一个文件（meta.json 返回 JSON 文本），不存在时返回 None"""
+        if name == META_FILE:
+            meta = self.read_meta(post_id)
+            return None if meta is None else json.dumps(meta, indent=2, ensure_ascii=False)
+        with self._lock:
+            if post_id in self._pending:
+                return self._pending[post_id]['files'].get(name)
+            row = self.conn.execute(
+                "SELECT content FROM files WHERE post_id = ? AND name = ?", (post_id, name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def read_meta(self, post_id: str) -> Optional[Dict]:
+        with self._lock:
+            if post_id in self._pending:
+                return json.loads(json.dumps(self._pending[post_id]['meta']))
+            row = self.conn.execute("SELECT meta FROM posts WHERE post_id = ?", (post_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_meta(self, post_id: str, update: Callable[[Dict], None]) -> bool:
+        """在原处修改 meta（缓冲中的文章改缓冲，已提交的文章单独一个事务），文章不存在时返回 False"""
+        with self._lock:
+            if post_id in self._pending:
+                update(self._pending[post_id]['meta'])
+                return True
+            with self.conn:
+                row = self.conn.execute("SELECT meta FROM posts WHERE post_id = ?", (post_id,)).fetchone()
+                if not row:
+                    return False
+                meta = json.loads(row[0])
+                update(meta)
+                self.conn.execute(
+                    "UPDATE posts SET meta = ? WHERE post_id = ?",
+                    (json.dumps(meta, ensure_ascii=False), post_id)
+                )
+            return True
+
+    def post_ids(self) -> List[str]:
+        """所有文章 id（包括未提交的），按创建时间先后"""
+        with self._lock:
+            ids = [row[0] for row in self.conn.execute("SELECT post_id FROM posts ORDER BY created_at")]
+            return ids + [post_id for post_id in self._pending if post_id not in ids]
+
+    def export(self, dest_dir: Path, post_ids: List[str] = None, overwrite: bool = False) -> List[Path]:
+        """
+        导出为目录结构（每篇一个目录，文件与目录存储相同）
+
+        Args:
+            dest_dir: 导出目录
+            post_ids: 只导出这些文章，默认全部
+            overwrite: 目标目录已有 meta.json 时是否覆盖
+
+        Returns:
+            List[Path]: 导出的文章目录
+        """
+        self.flush()
+        dest_dir = Path(dest_dir)
+        exported = []
+        for post_id in post_ids or self.post_ids():
+            post_dir = dest_dir / post_id
+            if (post_dir / META_FILE).exists() and not overwrite:
+                continue
+            meta = self.read_meta(post_id)
+            if meta is None:
+                continue
+            names = [row[0] for row in self.conn.execute(
+                "SELECT name FROM files WHERE post_id = ?", (post_id,))]
+            for name in names:
+                atomic_write_text(post_dir / name, self.read_file(post_id, name))
+                if FILE_META_KEYS.get(name) in meta:
+                    meta[FILE_META_KEYS[name]] = str(post_dir / name)
+            # meta.json 最后写入，目录里有 meta.json 即代表文章完整
+            atomic_write_json(post_dir / META_FILE, meta)
+            exported.append(post_dir)
+        return exported
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def open_store(db_path: Path, commit_every: int = 20) -> PostStore:
+    """同一进程内同一个存储文件共用一个 PostStore（进程退出时自动 flush）"""
+    key = str(Path(db_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = PostStore(db_path, commit_every)
+        return store
+
+
+def flush_all():
+    """提交本进程所有存储中缓冲的文章"""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+atexit.register(flush_all)
+
+
+def _packed(post_dir: Path) -> Optional[PostStore]:
+    """文章目录不存在时，返回包含该文章的打包存储"""
+    db_path = store_path(Path(post_dir).parent)
+    if str(db_path.resolve()) not in _stores and not db_path.exists():
+        return None
+    store = open_store(db_path)
+    return store if store.contains(Path(post_dir).name) else None
+
+
+def read_meta(post_dir: Path) -> Optional[Dict]:
+    """读取文章的 meta（目录或打包存储），不存在时返回 None"""
+    meta_path = Path(post_dir) / META_FILE
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        return None
+    store = _packed(post_dir)
+    return store.read_meta(Path(post_dir).name) if store else None
+
+
+def update_meta(post_dir: Path, update: Callable[[Dict], None]) -> bool:
+    """
+    修改文章的 meta（目录存储原子替换 meta.json），文章不存在时返回 False
+
+    Args:
+        post_dir: 文章目录
+        update: 在原处修改 meta 字典的函数
+    """
+    meta_path = Path(post_dir) / META_FILE
+    if meta_path.exists():
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        update(meta)
+        atomic_write_json(meta_path, meta)
+        return True
+    store = _packed(post_dir)
+    return store.update_meta(Path(post_dir).name, update) if store else False
+
+
+def read_text(path: Path) -> str:
+    """读取文章中的文件（目录或打包存储）"""
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        store = _packed(path.parent)
+        text = store.read_file(path.parent.name, path.name) if store else None
+        if text is None:
+            raise
+        return text
+
+
+def exists(path: Path) -> bool:
+    """文件在磁盘上或在打包存储中"""
+    path = Path(path)
+    if path.exists():
+        return True
+    store = _packed(path.parent)
+    return bool(store) and store.read_file(path.parent.name, path.name) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='打包文章存储')
+    parser.add_argument('command', choices=['list', 'export'])
+    parser.add_argument('store', help='存储文件，如 posts/.state/posts.sqlite3')
+    parser.add_argument('dest', nargs='?', help='export 的目标目录')
+    parser.add_argument('--post', action='append', default=None, help='只导出指定文章 id（可重复）')
+    parser.add_argument('--overwrite', action='store_true', help='覆盖已导出的文章')
+    args = parser.parse_args()
+
+    if not Path(args.store).exists():
+        print(f"[Error] 存储文件不存在: {args.store}")
+        return
+    store = PostStore(args.store)
+    if args.command == 'list':
+        for post_id in store.post_ids():
+            meta = store.read_meta(post_id)
+            print(f"{post_id}  {meta.get('status', '')}")
+    else:
+        if not args.dest:
+            parser.error("export 需要指定目标目录")
+        exported = store.export(args.dest, args.post, args.overwrite)
+        print(f"[OK] 已导出 {len(exported)} 篇到 {args.dest}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
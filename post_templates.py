@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章模板
+
+类 Mustache 的小型模板引擎。模板按名称编译成 Python 函数后缓存；变量的
+查找顺序（由内层区块到根上下文）在编译时展开成内联表达式，渲染时不遍历
+上下文栈。渲染只往列表里追加片段，最后 join 一次，长表格也不会产生反复拷贝。
+
+语法:
+    {{name}}              变量（支持 a.b 形式的路径，{{.}} 为当前元素）
+    {{@index}}            循环中的序号（从 1 开始）
+    {{#name}}...{{/name}} 列表则逐项渲染；其他真值渲染一次；假值跳过
+    {{^name}}...{{/name}} name 为假值或空列表时渲染
+
+区块标签单独占一行时，整行（含换行符）不会输出。
+
+内置模板: default（单技术文章）、comparison（对比文章）。这两个内置模板另有
+手写的渲染函数（输出与模板完全一致，tools/bench_templates.py 会校验），
+render_article / render_comparison 在没有同名自定义模板时直接用它们，
+默认路径不经过上下文构造和模板解释。
+自定义模板放在 template_dir 下，文件名为 <名称>.md.tmpl，修改后自动重新编译。
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BUILTIN_TEMPLATES = {
+    "default": """# {{name}} - 技术解析
+
+> 📅 发布日期: {{date}}
+> 🏷️ 分类: AI技术 | 大模型
+
+## 🚀 简介
+
+{{summary}}
+
+## ✨ 核心特点
+
+{{#features}}
+{{@index}}. **{{title}}**: {{description}}
+{{/features}}
+{{#code}}
+
+## 💻 代码示例
+
+```python
+{{code}}
+```
+{{/code}}
+{{#has_benchmarks}}
+
+## 📊 性能对比
+
+| 指标 | 数值 |
+|------|------|
+{{#benchmarks}}
+| {{metric}} | {{value}} |
+{{/benchmarks}}
+{{/has_benchmarks}}
+
+## 🎯 总结
+
+{{name}} 是一个值得关注的技术...
+
+---
+
+💡 **想要了解更多 AI 技术？关注我，每天分享最新技术干货！**
+
+""",
+    "comparison": """# {{title}} - 技术对比
+
+> 📅 发布日期: {{date}}
+> 🏷️ 分类: AI技术对比 | 大模型选型
+
+## 🚀 概述
+
+今天为大家带来 {{count}} 款热门技术的深度对比...
+
+## 📊 对比维度
+
+| 特性 |{{#tech_names}} {{.}} |{{/tech_names}}
+|------|{{#tech_names}}------|{{/tech_names}}
+{{#rows}}
+| {{label}} |{{#cells}} {{.}} |{{/cells}}
+{{/rows}}
+
+## 🔍 详细解析
+
+{{#techs}}
+### {{name}}
+
+{{summary}}
+
+{{/techs}}
+
+## 🎯 选型建议
+
+- **如果你的需求是 XXX**: 推荐 XXX
+- **如果你的需求是 YYY**: 推荐 YYY
+
+---
+
+💡 **想要了解更多技术对比？关注我，每周深度对比！**
+
+""",
+}
+
+# 对比文章的对比维度
+COMPARISON_ITEMS = ["架构", "参数量", "上下文长度", "推理速度", "中文能力", "开源程度"]
+
+_TAG_RE = re.compile(r'\{\{\s*([#^/]?)\s*([\w.@]+)\s*\}\}')
+
+
+class TemplateError(ValueError):
+    """模板语法错误"""
+
+
+def _path(value: Any, rest: str) -> Any:
+    """沿 a.b 形式路径的剩余部分取值，取不到时为空字符串"""
+    for key in rest.split('.'):
+        value = value.get(key, '') if isinstance(value, dict) else getattr(value, key, '')
+    return value
+
+
+def _tokenize(source: str) -> List[Tuple[str, str, str]]:
+    """切分为 (类型, 名称, 文本)；单独占一行的区块标签连同该行一起去掉"""
+    tokens = []
+    pos = 0
+    for match in _TAG_RE.finditer(source):
+        kind, name = match.group(1), match.group(2)
+        start, end = match.start(), match.end()
+        if kind:
+            line_start = source.rfind('\n', 0, start) + 1
+            line_end = source.find('\n', end)
+            line_end = len(source) if line_end == -1 else line_end + 1
+            standalone = (not source[line_start:start].strip()
+                          and not source[end:line_end].strip()
+                          and line_start >= pos)
+            if standalone:
+                start, end = line_start, line_end
+        if start > pos:
+            tokens.append(('text', '', source[pos:start]))
+        tokens.append((kind or 'var', name, ''))
+        pos = end
+    if pos < len(source):
+        tokens.append(('text', '', source[pos:]))
+    return tokens
+
+
+def _parse(tokens: List[Tuple[str, str, str]], pos: int, closing: Optional[str]):
+    """把 token 组装成语法树，返回 (节点列表, 下一个位置)"""
+    nodes = []
+    while pos < len(tokens):
+        kind, name, text = tokens[pos]
+        pos += 1
+        if kind in ('#', '^'):
+            children, pos = _parse(tokens, pos, name)
+            nodes.append((kind, name, children))
+        elif kind == '/':
+            if name != closing:
+                raise TemplateError(f"未匹配的结束标签: {{{{/{name}}}}}")
+            return nodes, pos
+        else:
+            nodes.append((kind, name, text))
+    if closing is not None:
+        raise TemplateError(f"缺少结束标签: {{{{/{closing}}}}}")
+    return nodes, pos
+
+
+def _uses_index(nodes) -> bool:
+    """区块内（不含嵌套区块）是否引用了 {{@index}}"""
+    return any(kind == 'var' and name == '@index' for kind, name, _ in nodes)
+
+
+def _var_expr(name: str, scope: List[Tuple[str, Optional[str]]]) -> str:
+    """
+    变量的取值表达式
+
+    作用域在编译时就确定了：根上下文 ctx 加上外层各区块的循环变量，
+    所以直接生成「由内到外依次判断」的内联表达式，不在运行时遍历栈。
+
+    Args:
+        scope: 外层到内层的 (循环元素变量名, 序号变量名或 None)
+    """
+    if name == '.':
+        return scope[-1][0] if scope else 'ctx'
+    if name == '@index':
+        for _, index_var in reversed(scope):
+            if index_var:
+                return index_var
+        return "''"
+    head, _, rest = name.partition('.')
+    expr = f"ctx.get({head!r}, '')"
+    for item_var, _ in scope:
+        expr = f"({item_var}[{head!r}] if type({item_var}) is dict and {head!r} in {item_var} else {expr})"
+    return f"_path({expr}, {rest!r})" if rest else expr
+
+
+def _generate(nodes, lines: List[str], indent: int, counter: List[int],
+              scope: List[Tuple[str, Optional[str]]]):
+    """
+    把语法树生成为 Python 源码
+
+    相邻的文本和变量合并成一次 % 格式化、一次 append。
+    """
+    pad = '    ' * indent
+    fmt: List[str] = []
+    args: List[str] = []
+
+    def flush():
+        if not fmt:
+            return
+        if args:
+            lines.append(f"{pad}a({''.join(fmt)!r} % ({', '.join(args)},))")
+        else:
+            lines.append(f"{pad}a({''.join(fmt).replace('%%', '%')!r})")
+        fmt.clear()
+        args.clear()
+
+    for kind, name, payload in nodes:
+        if kind == 'text':
+            fmt.append(payload.replace('%', '%%'))
+        elif kind == 'var':
+            fmt.append('%s')
+            args.append(_var_expr(name, scope))
+        else:
+            flush()
+            counter[0] += 1
+            n = counter[0]
+            lines.append(f"{pad}v{n} = {_var_expr(name, scope)}")
+            if kind == '^':
+                lines.append(f"{pad}if not v{n}:")
+                _generate(payload, lines, indent + 1, counter, scope)
+                lines.append(f"{pad}    pass")
+                continue
+            lines.append(f"{pad}if v{n}:")
+            lines.append(f"{pad}    if not isinstance(v{n}, (list, tuple)):")
+            lines.append(f"{pad}        v{n} = (v{n},)")
+            if _uses_index(payload):
+                lines.append(f"{pad}    for i{n}, it{n} in enumerate(v{n}, 1):")
+                _generate(payload, lines, indent + 2, counter, scope + [(f"it{n}", f"i{n}")])
+            else:
+                lines.append(f"{pad}    for it{n} in v{n}:")
+                _generate(payload, lines, indent + 2, counter, scope + [(f"it{n}", None)])
+            lines.append(f"{pad}        pass")
+    flush()
+
+
+def _compile(name: str, source: str) -> Callable[[Dict[str, Any], List[str]], None]:
+    """把模板编译成一个 Python 函数 render(ctx, out)"""
+    nodes, _ = _parse(_tokenize(source), 0, None)
+    lines = ["def render(ctx, out):", "    a = out.append"]
+    _generate(nodes, lines, 1, [0], [])
+    namespace = {'_path': _path}
+    exec(compile('\n'.join(lines), f"<template {name}>", 'exec'), namespace)
+    return namespace['render']
+
+
+class CompiledTemplate:
+    """编译后的模板"""
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self._render = _compile(name, source)
+
+    def render_into(self, context: Dict[str, Any], out: List[str]):
+        """把渲染结果追加到 out（便于拼接多个模板）"""
+        self._render(context, out)
+
+    def render(self, context: Dict[str, Any]) -> str:
+        out: List[str] = []
+        self.render_into(context, out)
+        return ''.join(out)
+
+
+class TemplateRegistry:
+    """按名称查找并缓存编译好的模板"""
+
+    def __init__(self, template_dir: Optional[Path] = None):
+        self.template_dir = Path(template_dir) if template_dir else None
+        self._cache: Dict[str, Tuple[float, CompiledTemplate]] = {}
+
+    def _template_file(self, name: str) -> Optional[Path]:
+        if self.template_dir is None:
+            return None
+        path = self.template_dir / f"{name}.md.tmpl"
+        return path if path.exists() else None
+
+    def get(self, name: str) -> CompiledTemplate:
+        """取得编译好的模板；自定义模板优先于同名内置模板"""
+        path = self._template_file(name)
+        mtime = path.stat().st_mtime if path else 0.0
+        cached = self._cache.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        if path:
+            source = path.read_text(encoding='utf-8')
+        elif name in BUILTIN_TEMPLATES:
+            source = BUILTIN_TEMPLATES[name]
+        else:
+            raise KeyError(f"未知模板: {name}")
+        template = CompiledTemplate(name, source)
+        self._cache[name] = (mtime, template)
+        return template
+
+    def render(self, name: str, context: Dict[str, Any]) -> str:
+        return self.get(name).render(context)
+
+    def render_article(self, name: str, tech_data: Dict, include_code: bool = True,
+                       date_str: str = None) -> str:
+        """渲染单技术文章；内置 default 模板未被覆盖时走手写渲染函数"""
+        if name == 'default' and self._template_file(name) is None:
+            return _default_article(tech_data, include_code, date_str)
+        return self.render(name, article_context(tech_data, include_code, date_str))
+
+    def render_comparison(self, name: str, tech_data_dict: Dict[str, Dict], date_str: str = None) -> str:
+        """渲染对比文章；内置 comparison 模板未被覆盖时走手写渲染函数"""
+        if name == 'comparison' and self._template_file(name) is None:
+            return _comparison_article(tech_data_dict, date_str)
+        return self.render(name, comparison_context(tech_data_dict, date_str))
+
+
+_registries: Dict[Optional[str], TemplateRegistry] = {}
+
+
+def get_registry(template_dir: Optional[str] = None) -> TemplateRegistry:
+    """进程内共享的模板注册表（每个模板目录一个）"""
+    registry = _registries.get(template_dir)
+    if registry is None:
+        registry = _registries[template_dir] = TemplateRegistry(template_dir)
+    return registry
+
+
+def article_context(tech_data: Dict, include_code: bool = True, date_str: str = None) -> Dict[str, Any]:
+    """单技术文章的模板上下文"""
+    code_examples = tech_data.get('code_examples') or []
+    benchmarks = tech_data.get('benchmarks') or {}
+    return {
+        'name': tech_data['name'],
+        'date': date_str or datetime.now().strftime("%Y-%m-%d"),
+        'summary': tech_data.get('summary', '暂无总结'),
+        'features': tech_data.get('key_features', []),
+        'code': code_examples[0] if code_examples and include_code else '',
+        'has_benchmarks': bool(benchmarks),
+        'benchmarks': [{'metric': metric, 'value': value} for metric, value in benchmarks.items()],
+    }
+
+
+def comparison_context(tech_data_dict: Dict[str, Dict], date_str: str = None) -> Dict[str, Any]:
+    """对比文章的模板上下文"""
+    tech_names = list(tech_data_dict.keys())
+    return {
+        'title': ' vs '.join(tech_names),
+        'date': date_str or datetime.now().strftime("%Y-%m-%d"),
+        'count': len(tech_names),
+        'tech_names': tech_names,
+        'rows': [{'label': item, 'cells': ['待补充'] * len(tech_names)} for item in COMPARISON_ITEMS],
+        'techs': [{'name': name, 'summary': data.get('summary', '暂无总结')}
+                  for name, data in tech_data_dict.items()],
+    }
+
+
+def _default_article(tech_data: Dict, include_code: bool = True, date_str: str = None) -> str:
+    """内置 default 模板的手写版本"""
+    name = tech_data['name']
+    out = [f"""# {name} - 技术解析
+
+> 📅 发布日期: {date_str or datetime.now().strftime("%Y-%m-%d")}
+> 🏷️ 分类: AI技术 | 大模型
+
+## 🚀 简介
+
+{tech_data.get('summary', '暂无总结')}
+
+## ✨ 核心特点
+
+"""]
+    for i, feature in enumerate(tech_data.get('key_features', []), 1):
+        out.append(f"{i}. **{feature['title']}**: {feature['description']}\n")
+    code_examples = tech_data.get('code_examples')
+    if code_examples and include_code and code_examples[0]:
+        out.append(f"\n## 💻 代码示例\n\n```python\n{code_examples[0]}\n```\n")
+    benchmarks = tech_data.get('benchmarks')
+    if benchmarks:
+        out.append("\n## 📊 性能对比\n\n| 指标 | 数值 |\n|------|------|\n")
+        out.extend([f"| {metric} | {value} |\n" for metric, value in benchmarks.items()])
+    out.append(f"""
+## 🎯 总结
+
+{name} 是一个值得关注的技术...
+
+---
+
+💡 **想要了解更多 AI 技术？关注我，每天分享最新技术干货！**
+
+""")
+    return ''.join(out)
+
+
+def _comparison_article(tech_data_dict: Dict[str, Dict], date_str: str = None) -> str:
+    """内置 comparison 模板的手写版本"""
+    tech_names = list(tech_data_dict.keys())
+    cells = ' 待补充 |' * len(tech_names)
+    out = [f"""# {' vs '.join(tech_names)} - 技术对比
+
+> 📅 发布日期: {date_str or datetime.now().strftime("%Y-%m-%d")}
+> 🏷️ 分类: AI技术对比 | 大模型选型
+
+## 🚀 概述
+
+今天为大家带来 {len(tech_names)} 款热门技术的深度对比...
+
+## 📊 对比维度
+
+"""]
+    out.append('| 特性 |' + ''.join([f" {name} |" for name in tech_names]) + '\n')
+    out.append('|------|' + '------|' * len(tech_names) + '\n')
+    out.extend([f"| {item} |{cells}\n" for item in COMPARISON_ITEMS])
+    out.append("\n## 🔍 详细解析\n\n")
+    for name, data in tech_data_dict.items():
+        out.append(f"### {name}\n\n{data.get('summary', '暂无总结')}\n\n")
+    out.append("""
+## 🎯 选型建议
+
+- **如果你的需求是 XXX**: 推荐 XXX
+- **如果你的需求是 YYY**: 推荐 YYY
+
+---
+
+💡 **想要了解更多技术对比？关注我，每周深度对比！**
+
+""")
+    return ''.join(out)
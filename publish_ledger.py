@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布台账
+
+记录每篇内容的发布状态，重复运行（包括 cron 重试）时跳过已发布或正在发布
+的内容，中断的批量发布可以从断点继续。
+
+- 内容指纹：标题 + 正文的 sha256（去掉首尾空白），同一篇内容换了文件名也能识别
+- 台账：JSONL，只追加；启动时读一遍建立 指纹 -> 最新记录 的字典，之后查询 O(1)。
+  其他进程追加的记录在每次 claim 前增量读入；台账被其他进程压缩（文件被
+  替换）时重新读入整个文件
+- claim / finish / compact 持有台账旁 .lock 文件上的进程间锁，两个进程不会
+  同时 claim 到同一篇内容
+- 台账默认放在日报输出目录（config 的 paths.output）的 .state/ 下，
+  publish.ledger 可以指定其他位置
+- 状态: ready_to_publish -> publishing -> published / failed / filled
+  publishing 超过 in_flight_ttl 秒未结束视为中断，可以重新发布；
+  filled（已填写、等人工点发布）和 published 一样跳过，不会重复打开浏览器填写，
+  人工发布后用 mark_published（xhs_auto_publish.py --mark-published）记为 published
+- xhs_tech_blogger 的文章目录（内容文件旁有 meta.json）同步写入 status、
+  content_hash 和 status_history；输出目录有文章索引时同步 status
+
+Usage:
+    ledger = open_ledger(config)
+    digest = content_hash(title, body)
+    if ledger.claim(digest, content_file, title):
+        ...
+        ledger.finish(digest, content_file, 'published')
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import post_catalog
+import post_store
+from fsutil import atomic_write_text, file_lock
+
+LEDGER_NAME = 'publish_ledger.jsonl'
+DEFAULT_LEDGER_PATH = Path(__file__).parent / 'output' / '.state' / LEDGER_NAME
+
+# 这些状态的内容再次运行时跳过
+DONE_STATUSES = ('published', 'filled')
+IN_FLIGHT = 'publishing'
+
+
+def split_title_body(full_content: str) -> Tuple[str, str]:
+    """内容文件的第一行是标题（可带「标题：」前缀），其余为正文"""
+    lines = full_content.split('\n')
+    title = lines[0].replace('标题：', '').strip() if lines[0].startswith('标题：') else lines[0]
+    body = '\n'.join(lines[1:]).strip()
+    return title, body
+
+
+def content_hash(title: str, body: str) -> str:
+    """内容指纹"""
+    text = f"{title.strip()}\n{body.strip()}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def output_dir_from_config(config: Dict) -> Path:
+    """日报输出目录：paths.output 或 output.save_directory，相对路径相对于 skill_root（与 daily_ai_news 一致）"""
+    paths_config = config.get('paths', {})
+    skill_root = Path(paths_config.get('skill_root', '.'))
+    if not skill_root.is_absolute():
+        skill_root = Path(__file__).parent
+    output_path = paths_config.get('output') or config.get('output', {}).get('save_directory', 'output')
+    if Path(output_path).is_absolute():
+        return Path(output_path)
+    return skill_root / output_path
+
+
+def ledger_path(config: Dict) -> Path:
+    """台账文件：publish.ledger，默认为输出目录下的 .state/publish_ledger.jsonl"""
+    configured = config.get('publish', {}).get('ledger')
+    if configured:
+        return Path(configured)
+    return output_dir_from_config(config) / '.state' / LEDGER_NAME
+
+
+def open_ledger(config: Dict) -> 'PublishLedger':
+    """按配置打开发布台账（xhs_auto_publish 与 xhs_tech_blogger 共用）"""
+    return PublishLedger(ledger_path(config), config.get('publish', {}).get('in_flight_ttl', 1800))
+
+
+def update_meta_status(post_dir: Path, status: str, digest: str = None, **extra) -> bool:
+    """更新文章 meta 的状态并追加状态历史（目录或打包存储）；文章不存在时返回 False"""
+    def update(meta: Dict):
+        meta['status'] = status
+        if digest:
+            meta['content_hash'] = digest
+        for key, value in extra.items():
+            if value is None:
+                meta.pop(key, None)
+            else:
+                meta[key] = value
+        meta.setdefault('status_history', []).append({'status': status, 'at': datetime.now().isoformat()})
+
+    return post_store.update_meta(post_dir, update)
+
+
+class PublishLedger:
+    """
+    JSONL 发布台账
+
+    Args:
+        path: 台账文件
+        in_flight_ttl: publishing 状态多少秒后视为中断
+    """
+
+    def __init__(self, path: Path = None, in_flight_ttl: float = 1800):
+        self.path = Path(path or DEFAULT_LEDGER_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.in_flight_ttl = in_flight_ttl
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.entries: Dict[str, Dict] = {}
+        self._offset = 0
+        self._lines = 0
+        self._inode = None
+        self._lock = threading.Lock()
+        self._refresh()
+        if self._lines > 2 * len(self.entries) + 1000:
+            self.compact()
+
+    def _refresh(self):
+        """增量读入台账（包括其他进程追加的记录）"""
+        try:
+            with open(self.path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_ino != self._inode or stat.st_size < self._offset:
+                    # 文件被压缩替换过，之前的偏移量已失效
+                    self.entries, self._offset, self._lines = {}, 0, 0
+                    self._inode = stat.st_ino
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b'\n') + 1  # 忽略还没写完的最后一行
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self.entries[record['hash']] = record
+            self._lines += 1
+        self._offset += end
+
+    def _append(self, record: Dict):
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._refresh()
+
+    def status(self, digest: str) -> Optional[str]:
+        """内容当前状态（中断的 publishing 视为 failed），没有记录返回 None"""
+        record = self.entries.get(digest)
+        if record is None:
+            return None
+        if record['status'] == IN_FLIGHT and time.time() - record['ts'] > self.in_flight_ttl:
+            return 'failed'
+        return record['status']
+
+    def skip_reason(self, digest: str) -> Optional[str]:
+        """应当跳过时返回原因"""
+        status = self.status(digest)
+        if status == 'filled':
+            return f"已填写，等待人工发布 ({self.entries[digest]['at']})"
+        if status in DONE_STATUSES:
+            return f"已发布 ({self.entries[digest]['at']})"
+        if status == IN_FLIGHT:
+            return f"正在发布中 ({self.entries[digest]['at']})"
+        return None
+
+    def _record(self, digest: str, content_file: Path, status: str, **extra) -> Dict:
+        previous = self.entries.get(digest, {})
+        record = {
+            'hash': digest,
+            'status': status,
+            'file': str(content_file),
+            'title': extra.pop('title', None) or previous.get('title'),
+            'attempts': previous.get('attempts', 0) + (1 if status == IN_FLIGHT else 0),
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'ts': time.time(),
+        }
+        record.update({key: value for key, value in extra.items() if value is not None})
+        self._append(record)
+        if Path(content_file).name == 'xiaohongshu.txt':
+            update_meta_status(Path(content_file).parent, status, digest, publish_error=extra.get('error'))
+        post_catalog.update_status(content_file, status)
+        return record
+
+    def claim(self, digest: str, content_file: Path, title: str = None, force: bool = False) -> bool:
+        """
+        开始发布：未发布且不在发布中时记为 publishing 并返回 True
+
+        Args:
+            force: 忽略已有状态强制重新发布
+        """
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            if not force and self.skip_reason(digest):
+                return False
+            self._record(digest, content_file, IN_FLIGHT, title=title)
+            return True
+
+    def finish(self, digest: str, content_file: Path, status: str, error: str = None, **extra):
+        """结束发布：published / failed / filled"""
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            self._record(digest, content_file, status, error=error, **extra)
+
+    def mark_published(self, digest: str, content_file: Path, title: str = None):
+        """人工在创作页点了发布之后，把内容记为 published"""
+        self.finish(digest, content_file, 'published', title=title)
+
+    def compact(self) -> int:
+        """只保留每篇内容的最新记录（原子替换），返回删除的行数"""
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            removed = self._lines - len(self.entries)
+            if removed <= 0:
+                return 0
+            text = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.entries.values())
+            atomic_write_text(self.path, text)
+            self._inode = os.stat(self.path).st_ino
+            self._offset = len(text.encode('utf-8'))
+            self._lines = len(self.entries)
+            return removed
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻打分与 Top-K 选择
+
+得分 = Σ 权重 × 分项得分，分项包括:
+    priority - 来源优先级（news_sources.<source>.priority，数值越小越优先）
+    sources  - 报道该新闻的来源数（近似重复聚类后的簇内来源）
+    recency  - 新鲜度，按半衰期指数衰减；只看来源给出的发布时间 published_at，
+               date 是收集当天的日期，不代表发布时间，没有 published_at 的条目不计此项
+    keywords - 标题命中的关键词数
+
+选择时用大小为 k 的堆（heapq.nlargest），候选数增长到上千条时仍是 O(n log k)。
+得分相同时保持原始顺序。
+"""
+
+import heapq
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_WEIGHTS = {
+    'priority': 1.0,
+    'sources': 0.5,
+    'recency': 1.0,
+    'keywords': 0.3,
+}
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> Optional['re.Pattern']:
+    """把关键词编译成一个正则；英文关键词要求前后不是字母数字"""
+    parts = []
+    for kw in sorted({k.strip() for k in keywords if k and k.strip()}, key=len, reverse=True):
+        escaped = re.escape(kw)
+        if kw.isascii():
+            escaped = rf'(?<![0-9a-z]){escaped}(?![0-9a-z])'
+        parts.append(escaped)
+    return re.compile('|'.join(parts), re.IGNORECASE) if parts else None
+
+
+def _parse_time(news: Dict) -> Optional[datetime]:
+    """发布时间：ISO 字符串或 Unix 时间戳，带时区的转成本地时间"""
+    value = news.get('published_at')
+    if not value:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value)
+        published = datetime.fromisoformat(value)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    if published.tzinfo is not None:
+        published = published.astimezone().replace(tzinfo=None)
+    return published
+
+
+class NewsRanker:
+    """
+    新闻打分器
+
+    Args:
+        source_priority: 来源名 -> 优先级（1 最高）
+        keywords: 关注的关键词
+        weights: 各分项权重，未给出的使用 DEFAULT_WEIGHTS
+        half_life_hours: 新鲜度半衰期（小时）
+    """
+
+    def __init__(self, source_priority: Dict[str, int], keywords: Iterable[str] = (),
+                 weights: Dict[str, float] = None, half_life_hours: float = 24.0,
+                 now: datetime = None):
+        self.source_priority = source_priority
+        self.lowest_priority = max(source_priority.values(), default=0) + 1
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.half_life = half_life_hours * 3600.0
+        self.now = now or datetime.now()
+        self._keywords = _keyword_pattern(keywords)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'NewsRanker':
+        sources = config.get('news_sources', {})
+        ranking = config.get('ranking', {})
+        keywords = ranking.get('keywords') or sources.get('news_aggregator', {}).get('keywords', [])
+        return cls(
+            source_priority={name: cfg.get('priority', 99) for name, cfg in sources.items()},
+            keywords=keywords,
+            weights=ranking.get('weights'),
+            half_life_hours=ranking.get('recency_half_life_hours', 24)
+        )
+
+    def score(self, news: Dict) -> float:
+        """单条新闻的得分"""
+        members = [news] + list(news.get('aliases', []))
+        w = self.weights
+
+        priority = min(self.source_priority.get(m.get('source_type'), self.lowest_priority) for m in members)
+        score = w['priority'] / max(priority, 1)
+
+        source_count = len(news.get('sources') or {m.get('source') for m in members})
+        score += w['sources'] * (source_count - 1)
+
+        published = _parse_time(news)
+        if published is not None and self.half_life > 0:
+            age = max((self.now - published).total_seconds(), 0.0)
+            score += w['recency'] * 0.5 ** (age / self.half_life)
+
+        if self._keywords is not None:
+            hits = {m.group(0).lower() for m in self._keywords.finditer(news.get('title', ''))}
+            score += w['keywords'] * len(hits)
+
+        return score
+
+    def top_k(self, news_list: List[Dict], k: int) -> List[Dict]:
+        """返回得分最高的 k 条，并把得分写入 news['score']"""
+        scored = []
+        for index, news in enumerate(news_list):
+            news['score'] = round(self.score(news), 4)
+            scored.append((news['score'], -index, news))
+        return [news for _, _, news in heapq.nlargest(k, scored, key=lambda t: (t[0], t[1]))]
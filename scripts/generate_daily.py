@@ -9,41 +9,38 @@ Usage as OpenClaw skill:
     npx openclaw skills run xhs-tech-blogger --publish
 """
 
-import subprocess
 import sys
 from pathlib import Path
 
 def main():
     """主入口函数"""
     skill_dir = Path(__file__).parent.parent
+    sys.path.insert(0, str(skill_dir))
+    from daily_ai_news import run_daily
     
     print("=" * 70)
     print("小红书AI日报生成器")
     print("=" * 70)
     print()
     
-    # 1. 生成日报
+    # 1. 生成日报（在当前进程中运行）
     print("[1/2] 正在生成AI日报...")
-    result = subprocess.run(
-        [sys.executable, str(skill_dir / "daily_ai_news.py")],
-        capture_output=True,
-        text=True,
-        cwd=str(skill_dir)
-    )
-    print(result.stdout[-500:] if len(result.stdout) > 500 else result.stdout)
+    result = run_daily(skill_dir / "config.json")
     
-    if result.returncode != 0:
-        print("[Error] 生成失败")
+    if result.skipped:
+        print(f"[Skip] {result.error}，今天不生成新的日报")
+        return 0
+    if not result.ok:
+        print(f"[Error] 生成失败: {result.error}")
         return 1
+    print(f"[OK] {result.filepath}（{len(result.items)} 条新闻，耗时 {result.timings['total']:.1f}s）")
     
     # 2. 检查是否需要自动发布
     if "--publish" in sys.argv or "-p" in sys.argv:
         print()
         print("[2/2] 正在打开发布页面...")
-        subprocess.run(
-            [sys.executable, str(skill_dir / "xhs_auto_publish.py"), "--latest"],
-            cwd=str(skill_dir)
-        )
+        from xhs_auto_publish import publish_file
+        publish_file(result.filepath)
     else:
         print()
         print("[2/2] 日报已生成!")
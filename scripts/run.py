@@ -7,26 +7,55 @@ Standard entry point for OpenClaw skill execution
 Called by: npx openclaw skills run xhs-tech-blogger
 """
 
-import subprocess
+import json
 import sys
 import os
 from pathlib import Path
 
+# get_skill_dir 的解析结果缓存：配置文件 mtime 不变时不再打开和解析配置
+SKILL_DIR_CACHE = Path(__file__).resolve().parent / '.skill_dir_cache.json'
+
+def _cached_skill_dir(possible_configs):
+    """缓存仍然有效时返回缓存的 skill 目录"""
+    try:
+        cache = json.loads(SKILL_DIR_CACHE.read_text(encoding='utf-8'))
+        for config_path in possible_configs:
+            if str(config_path) == cache['config']:
+                if config_path.stat().st_mtime_ns == cache['mtime_ns'] and Path(cache['skill_dir']).exists():
+                    return Path(cache['skill_dir'])
+                return None
+            if config_path.exists():
+                # 出现了优先级更高的配置文件
+                return None
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _save_skill_dir(config_path, skill_dir):
+    try:
+        SKILL_DIR_CACHE.write_text(json.dumps({
+            'config': str(config_path),
+            'mtime_ns': config_path.stat().st_mtime_ns,
+            'skill_dir': str(skill_dir),
+        }), encoding='utf-8')
+    except OSError:
+        pass  # skill 目录只读时不缓存
+
 def get_skill_dir():
     """获取 skill 目录 - 优先从配置读取，支持自定义路径"""
     
     # 方式1: 尝试读取配置文件中的路径
+    possible_configs = [
+        Path.home() / '.openclaw' / 'workspace' / 'skills' / 'xhs-tech-blogger' / 'config.json',
+        Path(__file__).parent.parent / 'config.json',
+        Path(r'D:\apps\xhs_openclaw') / 'config.json',
+    ]
+    cached = _cached_skill_dir(possible_configs)
+    if cached:
+        return cached
     try:
-        # 查找配置文件
-        possible_configs = [
-            Path.home() / '.openclaw' / 'workspace' / 'skills' / 'xhs-tech-blogger' / 'config.json',
-            Path(__file__).parent.parent / 'config.json',
-            Path(r'D:\apps\xhs_openclaw') / 'config.json',
-        ]
-        
         for config_path in possible_configs:
             if config_path.exists():
-                import json
                 with open(config_path, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                 
@@ -36,10 +65,12 @@ def get_skill_dir():
                 # 如果是绝对路径，直接使用
                 if skill_root and Path(skill_root).is_absolute():
                     if Path(skill_root).exists():
+                        _save_skill_dir(config_path, Path(skill_root))
                         return Path(skill_root)
                 
                 # 否则使用配置文件所在目录
                 if config_path.parent.exists():
+                    _save_skill_dir(config_path, config_path.parent)
                     return config_path.parent
     except Exception:
         pass
@@ -84,50 +115,32 @@ def main():
         print(f"[Error] 找不到脚本: {daily_script}")
         return 1
     
-    result = subprocess.run(
-        [sys.executable, str(daily_script)],
-        capture_output=True,
-        text=True,
-        cwd=str(skill_dir)
-    )
-    
-    if result.stdout:
-        # 只显示最后一部分
-        lines = result.stdout.strip().split('\n')
-        if len(lines) > 10:
-            print('\n'.join(lines[-10:]))
-        else:
-            print(result.stdout)
+    # 在当前进程中运行，直接拿到结构化结果
+    sys.path.insert(0, str(skill_dir))
+    from daily_ai_news import run_daily
+    result = run_daily(skill_dir / "config.json")
     
-    if result.returncode != 0:
-        print("[Error] 生成失败")
-        if result.stderr:
-            print(result.stderr)
+    if result.skipped:
+        print(f"[Skip] {result.error}，今天不生成新的日报")
+        return 0
+    if not result.ok:
+        print(f"[Error] 生成失败: {result.error}")
         return 1
+    print(f"[OK] {len(result.items)} 条新闻，耗时 " + ", ".join(
+        f"{name} {seconds:.1f}s" for name, seconds in result.timings.items()))
     
     # 2. 检查是否需要发布
     if "--publish" in args:
         print()
         print("[2/2] 正在打开发布页面...")
-        publish_script = skill_dir / "xhs_auto_publish.py"
-        if publish_script.exists():
-            subprocess.run(
-                [sys.executable, str(publish_script), "--latest"],
-                cwd=str(skill_dir)
-            )
-        else:
-            print("[Warning] 找不到发布脚本")
+        from xhs_auto_publish import publish_file
+        publish_file(result.filepath)
     else:
         print()
         print("[2/2] 日报已生成!")
         print()
         print("📄 文件位置:")
-        output_dir = skill_dir / "output"
-        if output_dir.exists():
-            files = list(output_dir.glob("xhs_ai_news_*.txt"))
-            if files:
-                latest = max(files, key=lambda p: p.stat().st_mtime)
-                print(f"   {latest}")
+        print(f"   {result.filepath}")
         print()
         print("📤 发布到小红书:")
         print("   npx openclaw skills run xhs-tech-blogger --publish")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+跨天已发布新闻索引
+
+记录每天日报里发布过的新闻，第二天去重时直接排除，避免连续几天的热点
+重复出现在日报里。
+
+- 持久化：SQLite（stories 表，主键为新闻指纹）
+- 查询：内存中的 Bloom 过滤器挡掉绝大多数未见过的条目，命中时再回表确认，
+  每条新闻的检查是 O(1)
+- 压缩：只保留最近 window_days 天的记录，打开索引时自动删除过期条目，
+  空闲页过多时 VACUUM
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import unicodedata
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from source_cursor import GENERIC_URLS
+
+_NON_WORD_RE = re.compile(r'[^0-9a-z\u3400-\u9fff\uf900-\ufaff]+')
+
+
+class BloomFilter:
+    """定长 Bloom 过滤器（双重哈希生成 k 个位置）"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def story_keys(news: Dict) -> List[str]:
+    """新闻指纹：规范化标题，以及（如果有）具体的 URL"""
+    keys = []
+    title = _NON_WORD_RE.sub('', unicodedata.normalize('NFKC', news.get('title', '')).lower())
+    if title:
+        keys.append('t:' + hashlib.sha1(title.encode('utf-8')).hexdigest()[:20])
+    url = (news.get('url') or '').strip().rstrip('/')
+    if url and url + '/' not in GENERIC_URLS and url not in GENERIC_URLS:
+        keys.append('u:' + hashlib.sha1(url.encode('utf-8')).hexdigest()[:20])
+    return keys
+
+
+class SeenStoryIndex:
+    """
+    滑动窗口内已发布新闻的索引
+
+    Args:
+        db_path: SQLite 文件路径
+        window_days: 保留最近多少天的记录
+        error_rate: Bloom 过滤器的误判率
+    """
+
+    def __init__(self, db_path: Path, window_days: int = 7, error_rate: float = 0.01):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.window_days = window_days
+        self.error_rate = error_rate
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS stories ("
+            " key TEXT PRIMARY KEY,"
+            " title TEXT,"
+            " url TEXT,"
+            " published_on TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_day ON stories(published_on)")
+        self.conn.commit()
+        self.compact()
+        self._load_bloom()
+
+    def _load_bloom(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM stories").fetchone()
+        # 预留一倍空间给本次新增的条目，避免误判率上升
+        self.bloom = BloomFilter(max(count, 1000) * 2, self.error_rate)
+        for (key,) in self.conn.execute("SELECT key FROM stories"):
+            self.bloom.add(key)
+
+    def compact(self, today: Optional[date] = None) -> int:
+        """删除窗口之外的记录，返回删除条数"""
+        cutoff = ((today or date.today()) - timedelta(days=self.window_days)).isoformat()
+        deleted = self.conn.execute("DELETE FROM stories WHERE published_on < ?", (cutoff,)).rowcount
+        self.conn.commit()
+        (pages,) = self.conn.execute("PRAGMA page_count").fetchone()
+        (free,) = self.conn.execute("PRAGMA freelist_count").fetchone()
+        if free and free * 4 > pages:
+            self.conn.execute("VACUUM")
+        return deleted
+
+    def contains(self, news: Dict, before: Optional[date] = None) -> bool:
+        """
+        新闻是否在窗口内发布过
+
+        Args:
+            before: 只看这一天之前的记录；同一天重新生成日报时传入当天，
+                    当天已记录的新闻不算「已发布」
+        """
+        for key in story_keys(news):
+            if key not in self.bloom:
+                continue
+            if before is None:
+                row = self.conn.execute("SELECT 1 FROM stories WHERE key = ?", (key,)).fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT 1 FROM stories WHERE key = ? AND published_on < ?", (key, before.isoformat())
+                ).fetchone()
+            if row:
+                return True
+        return False
+
+    def add_many(self, news_list: Iterable[Dict], day: Optional[date] = None):
+        """记录已发布的新闻（重复发布时刷新日期，窗口从最近一次发布算起）"""
+        day_str = (day or date.today()).isoformat()
+        rows = []
+        for news in news_list:
+            for key in story_keys(news):
+                rows.append((key, news.get('title', ''), news.get('url', ''), day_str))
+                self.bloom.add(key)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO stories (key, title, url, published_on) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET published_on = excluded.published_on",
+                rows
+            )
+
+    def close(self):
+        self.conn.close()
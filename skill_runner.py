@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenClaw Skill 运行器
+
+每次 `npx openclaw skills run <skill>` 都要付出 npx 解析（查找 / 安装包）
+和 shell 启动的开销。这里在进程内解析一次 openclaw CLI 的入口（全局安装时
+直接用 node 执行其 JS 入口），之后每次调用直接启动该命令，不经过 npx。
+openclaw 没有可在进程内调用的 skill API，每个 skill 仍是一个独立子进程。
+
+run_skill() 返回完整输出；stream_skill() 以生成器逐行产出，内存占用与
+输出总量无关，超时时会清理整个进程组。
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+
+def resolve_openclaw_command() -> List[str]:
+    """
+    解析 openclaw CLI 的启动命令（每个进程只解析一次）
+
+    Returns:
+        List[str]: 命令前缀，例如 ['node', '/usr/lib/node_modules/openclaw/bin/openclaw.js']；
+            PATH 中没有 openclaw 时为 ['npx', '--yes', 'openclaw']
+    """
+    return list(_resolve_openclaw())
+
+
+@lru_cache(maxsize=1)
+def _resolve_openclaw() -> Tuple[str, ...]:
+    found = shutil.which('openclaw')
+    if found:
+        real = Path(found).resolve()
+        # npm 全局安装在 POSIX 上是指向 JS 入口的符号链接，直接交给 node 执行
+        if real.suffix in ('.js', '.mjs', '.cjs'):
+            return ('node', str(real))
+        return (found,)
+    return ('npx', '--yes', 'openclaw')
+
+
+def _popen_group_kwargs() -> Dict:
+    """让子进程独占一个进程组，便于超时时整组清理"""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_tree(proc: subprocess.Popen):
+    """杀掉进程及其所有子进程"""
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(
+                ['taskkill', '/T', '/F', '/PID', str(proc.pid)],
+                capture_output=True
+            )
+        else:
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        proc.kill()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def run_skill(skill_name: str, args: Iterable[str] = (), timeout: int = 120) -> str:
+    """运行 skill 并返回全部输出（stdout + stderr）；超时或出错时返回 [Timeout] / [Error] 提示"""
+    try:
+        result = subprocess.run(
+            resolve_openclaw_command() + ['skills', 'run', skill_name, *args],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            shell=(os.name == 'nt'),
+            timeout=timeout
+        )
+        return result.stdout + result.stderr
+    except subprocess.TimeoutExpired:
+        return f"[Timeout] Skill {skill_name} 运行超时"
+    except Exception as e:
+        return f"[Error] {e}"
+
+
+def stream_skill(skill_name: str, args: Iterable[str] = (), timeout: int = 120):
+    """
+    运行 skill 并逐行产出输出（stderr 合并到 stdout）
+
+    超时后整个进程组被杀掉，已产出的行不受影响，随后抛出 TimeoutError。
+    调用方提前停止读取时同样会清理进程组。
+    """
+    proc = subprocess.Popen(
+        resolve_openclaw_command() + ['skills', 'run', skill_name, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        bufsize=1,
+        shell=(os.name == 'nt'),
+        **_popen_group_kwargs()
+    )
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        kill_process_tree(proc)
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.daemon = True
+    timer.start()
+    try:
+        for line in proc.stdout:
+            yield line.rstrip('\r\n')
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            kill_process_tree(proc)
+        proc.stdout.close()
+    if timed_out.is_set():
+        raise TimeoutError(f"Skill {skill_name} 运行超时")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻来源的增量游标
+
+每个来源持久化一个游标：最近见过的条目哈希（URL + 标题）以及上次推进时间。
+解析阶段用 filter_new() 只放行之前没见过的新条目。现有来源都不提供条目的
+发布时间，所以游标只按哈希去重，不做按时间截断的 high-water mark。
+
+游标按日报日期（run_date）区分：当天的运行推进的哈希单独记录在 run_seen 里，
+同一天重新运行（例如重新生成当天日报）时这些条目仍会放行，只跳过之前
+几天已经处理过的条目。
+
+游标推进分两步：filter_new() 只在内存中记录待推进的条目，直到调用方在
+日报成功保存后调用 commit() 才原子写盘。中途崩溃时游标保持原状，
+下次运行会重新处理这些条目，而不会跳过它们。
+"""
+
+import hashlib
+import json
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Set
+
+from fsutil import atomic_write_json
+
+# 这些 URL 只是来源首页，不能区分具体新闻
+GENERIC_URLS = {'https://www.techmeme.com', 'https://www.techmeme.com/'}
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def item_hash(item: Dict) -> str:
+    """条目指纹：具体 URL + 规范化标题"""
+    url = (item.get('url') or '').strip()
+    if url in GENERIC_URLS:
+        url = ''
+    title = _SPACE_RE.sub(' ', (item.get('title') or '').strip().lower())
+    return hashlib.sha1(f"{url}\n{title}".encode('utf-8')).hexdigest()[:16]
+
+
+class CursorStore:
+    """
+    按来源保存增量游标
+
+    Args:
+        path: 游标文件
+        max_seen: 每个来源保留的哈希数
+        run_date: 日报日期，默认今天；同一日期的运行互不过滤
+    """
+
+    def __init__(self, path: Path, max_seen: int = 500, run_date: date = None):
+        self.path = Path(path)
+        self.max_seen = max_seen
+        self.run_date = (run_date or date.today()).isoformat()
+        self._lock = threading.Lock()
+        self._state = self._load()
+        self._seen = {source: set(cursor.get('seen', [])) for source, cursor in self._state.items()}
+        self._pending: Dict[str, List[Dict]] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def cursor(self, source: str) -> Dict:
+        return self._state.get(source, {})
+
+    def _same_day(self, source: str) -> Set[str]:
+        """本日报日期已推进过的哈希（同一天重跑时放行）"""
+        cursor = self.cursor(source)
+        if cursor.get('run_date') != self.run_date:
+            return set()
+        return set(cursor.get('run_seen', []))
+
+    def filter_new(self, source: str, items: List[Dict]) -> List[Dict]:
+        """
+        过滤掉游标之前的条目，并把放行的条目记为待推进
+
+        Args:
+            source: 来源名
+            items: 解析出的条目（保持原顺序）
+
+        Returns:
+            List[Dict]: 之前的日报日期没有处理过的条目
+        """
+        with self._lock:
+            seen = self._seen.get(source, set()) - self._same_day(source)
+            fresh, batch = [], set()
+            for item in items:
+                key = item_hash(item)
+                if key in seen or key in batch:
+                    continue
+                batch.add(key)
+                fresh.append(item)
+            self._pending.setdefault(source, []).extend(fresh)
+            return fresh
+
+    def commit(self):
+        """把待推进的条目写入游标（原子写盘）"""
+        with self._lock:
+            if not self._pending:
+                return
+            now = datetime.now().isoformat(timespec='seconds')
+            for source, items in self._pending.items():
+                cursor = dict(self._state.get(source, {}))
+                keys = [item_hash(item) for item in items]
+                # 新条目在前，保留最近 max_seen 个哈希
+                merged = list(dict.fromkeys(keys + cursor.get('seen', [])))[:self.max_seen]
+                run_seen = list(dict.fromkeys(keys + sorted(self._same_day(source))))
+                cursor.pop('high_water', None)  # 旧版本的时间游标，来源不提供发布时间，已不再使用
+                if keys:
+                    cursor['last_hash'] = keys[0]
+                cursor['seen'] = merged
+                cursor['run_date'] = self.run_date
+                cursor['run_seen'] = run_seen
+                cursor['updated_at'] = now
+                self._state[source] = cursor
+                self._seen[source] = set(merged)
+            atomic_write_json(self.path, self._state)
+            self._pending = {}
+
+    def discard(self):
+        """丢弃待推进的条目（例如 dry-run）"""
+        with self._lock:
+            self._pending = {}
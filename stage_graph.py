@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+小型依赖图执行器
+
+每个阶段声明依赖的阶段名，依赖全部完成后立即提交到线程池；彼此独立的阶段
+并发执行。阶段函数以关键字参数接收依赖阶段的结果（参数名即阶段名）。
+
+Usage:
+    graph = StageGraph()
+    graph.add('search', lambda: search())
+    graph.add('markdown', lambda search: render(search), deps=['search'])
+    graph.add('image', lambda search: draw(search), deps=['search'])
+    graph.add('save', lambda markdown, image: save(markdown, image), deps=['markdown', 'image'])
+    results = graph.run()
+    graph.timings    # {'search': {'start': 0.0, 'seconds': 1.2}, ...}
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List
+
+
+class StageFailed(RuntimeError):
+    """某个阶段抛出异常，原始异常见 __cause__"""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"阶段 {stage} 失败: {error}")
+        self.stage = stage
+
+
+class StageGraph:
+    """按依赖关系并发执行的阶段图"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._stages: Dict[str, Callable[..., Any]] = {}
+        self._deps: Dict[str, List[str]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Iterable[str] = ()) -> 'StageGraph':
+        """注册阶段；依赖必须已经注册，因此图天然无环"""
+        if name in self._stages:
+            raise ValueError(f"重复的阶段: {name}")
+        deps = list(deps)
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"阶段 {name} 依赖未注册的阶段: {', '.join(missing)}")
+        self._stages[name] = fn
+        self._deps[name] = deps
+        return self
+
+    def _timed(self, name: str, origin: float, kwargs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._stages[name](**kwargs)
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = {'start': round(start - origin, 4), 'seconds': round(end - start, 4)}
+
+    def run(self) -> Dict[str, Any]:
+        """执行所有阶段，返回 阶段名 -> 结果；任一阶段失败时抛出 StageFailed"""
+        results: Dict[str, Any] = {}
+        pending = dict(self._deps)
+        running = {}
+        self.timings = {}
+        origin = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in [n for n, deps in pending.items() if all(d in results for d in deps)]:
+                    kwargs = {dep: results[dep] for dep in pending.pop(name)}
+                    running[pool.submit(self._timed, name, origin, kwargs)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for other in running:
+                            other.cancel()
+                        raise StageFailed(name, error) from error
+                    results[name] = future.result()
+
+        self.timings['total'] = {'start': 0.0, 'seconds': round(time.perf_counter() - origin, 4)}
+        return results
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标签推荐用的 Aho-Corasick 关键词自动机
+
+词表（默认 tags.json）中每一项是 keyword -> tags + weight，可以有成千上万条。
+词表只在首次使用（或文件修改后）编译一次；匹配时对文本扫描一遍即可找出
+所有命中的关键词，耗时只与文本长度和命中数有关，与词表大小无关。
+
+英文关键词要求左侧不是字母数字（"rag" 不会命中 "storage"，但 "agent" 会命中
+"agents"）；中文关键词不做边界限制。
+
+Usage:
+    vocab = load_vocabulary('tags.json')
+    vocab.rank({'name': 'Claude Agent SDK', 'summary': '...', 'features': [...]})
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_VOCAB_PATH = Path(__file__).parent / 'tags.json'
+
+DEFAULT_FIELD_WEIGHTS = {'name': 3.0, 'summary': 1.0, 'features': 1.0}
+
+
+class AhoCorasick:
+    """多模式串匹配自动机"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.patterns: List[str] = []
+        for index, pattern in enumerate(patterns):
+            self.patterns.append(pattern)
+            self._insert(pattern, index)
+        self._build()
+
+    def _insert(self, pattern: str, index: int):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(index)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # 沿失败链可达的输出提前合并，匹配时不必再回溯
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str):
+        """产出 (结束位置, 模式下标)；结束位置为匹配最后一个字符之后"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for pos, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in out[node]:
+                yield pos, index
+
+
+class TagVocabulary:
+    """编译好的标签词表"""
+
+    def __init__(self, entries: List[Dict], field_weights: Dict[str, float] = None):
+        self.entries = [e for e in entries if e.get('keyword') and e.get('tags')]
+        self.field_weights = {**DEFAULT_FIELD_WEIGHTS, **(field_weights or {})}
+        self.automaton = AhoCorasick(e['keyword'].lower() for e in self.entries)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'TagVocabulary':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('entries', []), data.get('field_weights'))
+
+    def _fields(self, tech_data: Dict) -> List[Tuple[str, str]]:
+        features = []
+        for feature in tech_data.get('key_features') or []:
+            if isinstance(feature, dict):
+                features.append(f"{feature.get('title', '')} {feature.get('description', '')}")
+            else:
+                features.append(str(feature))
+        return [
+            ('name', tech_data.get('name') or ''),
+            ('summary', tech_data.get('summary') or ''),
+            ('features', '\n'.join(features)),
+        ]
+
+    def rank(self, tech_data: Dict) -> List[str]:
+        """
+        按权重排序命中的标签
+
+        各字段用分隔符拼成一段文本扫描一遍；标签得分 = Σ 关键词权重 × 字段权重。
+        得分相同按首次命中位置，再按标签名排序，结果稳定。
+        """
+        fields = self._fields(tech_data)
+        text_parts, bounds, offset = [], [], 0
+        for field, value in fields:
+            value = value.lower()
+            text_parts.append(value)
+            offset += len(value)
+            bounds.append((offset, self.field_weights.get(field, 1.0)))
+            offset += 1  # 分隔符
+        text = '\x00'.join(text_parts)
+
+        scores: Dict[str, float] = {}
+        first_seen: Dict[str, int] = {}
+        for end, index in self.automaton.finditer(text):
+            keyword = self.automaton.patterns[index]
+            start = end - len(keyword)
+            if keyword[0].isascii() and keyword[0].isalnum() and start > 0 and text[start - 1].isascii() \
+                    and text[start - 1].isalnum():
+                continue
+            field_weight = next(weight for bound, weight in bounds if end <= bound)
+            entry = self.entries[index]
+            for tag in entry['tags']:
+                scores[tag] = scores.get(tag, 0.0) + entry.get('weight', 1.0) * field_weight
+                first_seen.setdefault(tag, start)
+
+        return sorted(scores, key=lambda tag: (-scores[tag], first_seen[tag], tag))
+
+
+_cache: Dict[str, Tuple[float, TagVocabulary]] = {}
+
+
+def load_vocabulary(path: Optional[Path] = None) -> TagVocabulary:
+    """加载并编译词表；同一文件未修改时直接复用已编译的自动机"""
+    path = Path(path or DEFAULT_VOCAB_PATH)
+    key = str(path.resolve())
+    mtime = path.stat().st_mtime
+    cached = _cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    vocab = TagVocabulary.from_file(path)
+    _cache[key] = (mtime, vocab)
+    return vocab
@@ -20,7 +20,7 @@ def main():
     print()
     
     # 检查Skills
-    print("[1/4] 检查OpenClaw Skills...")
+    print("[1/5] 检查OpenClaw Skills...")
     skills = {
         'ai-news-collectors': 'AI新闻收集器',
         'news-aggregator-skill-2': '多源新闻聚合器',
@@ -39,7 +39,7 @@ def main():
     print()
     
     # 检查OpenClaw Browser
-    print("[2/4] 检查OpenClaw Browser...")
+    print("[2/5] 检查OpenClaw Browser...")
     try:
         result = subprocess.run(
             ['openclaw', 'browser', 'status'],
@@ -58,7 +58,7 @@ def main():
     print()
     
     # 检查配置文件
-    print("[3/4] 检查配置文件...")
+    print("[3/5] 检查配置文件...")
     config_path = Path(__file__).parent / 'config.json'
     if config_path.exists():
         print(f"  [OK] 配置文件存在: {config_path}")
@@ -69,11 +69,29 @@ def main():
     print()
     
     # 检查输出目录
-    print("[4/4] 检查输出目录...")
+    print("[4/5] 检查输出目录...")
     output_dir = Path(__file__).parent / 'output'
     output_dir.mkdir(exist_ok=True)
     print(f"  [OK] 输出目录: {output_dir}")
     
+    print()
+    
+    # 检查启动耗时（cron / skill 每次调用都是新进程）
+    print("[5/5] 检查启动耗时...")
+    sys.path.insert(0, str(Path(__file__).parent / 'tools'))
+    from bench_startup import check_budget
+    try:
+        problems = check_budget()
+    except RuntimeError as e:
+        problems = [str(e)]
+    if problems:
+        for problem in problems:
+            print(f"  [Warning] {problem}")
+        print("      详情: python tools/bench_startup.py")
+        all_ok = False
+    else:
+        print("  [OK] 入口模块导入耗时均在预算内")
+    
     print()
     print("=" * 70)
     if all_ok:
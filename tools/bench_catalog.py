@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+查找最新日报基准：glob + 排序 / glob + stat vs 文章索引
+
+在临时目录里生成几年的日报文件和技术文章目录，比较原来的两种查找方式
+（xhs_auto_publish 的按文件名排序、scripts/run.py 的按 mtime 取最大）
+与 PostCatalog.latest() 的耗时。
+
+Usage:
+    python tools/bench_catalog.py
+    python tools/bench_catalog.py --days 365 1500 --posts-per-day 3
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from post_catalog import PostCatalog
+
+
+def populate(output_dir: Path, days: int, posts_per_day: int):
+    start = date.today() - timedelta(days=days)
+    for i in range(days):
+        day = start + timedelta(days=i)
+        (output_dir / f"xhs_ai_news_{day:%Y%m%d}.txt").write_text(f"标题 {day}\n正文", encoding='utf-8')
+        for j in range(posts_per_day):
+            post_dir = output_dir / f"{day:%Y%m%d}_12000{j}_Tech{j}"
+            post_dir.mkdir()
+            (post_dir / 'xiaohongshu.txt').write_text(f"Tech{j}\n正文", encoding='utf-8')
+            (post_dir / 'meta.json').write_text(json.dumps({
+                'tech_name': f"Tech{j}", 'created_at': f"{day.isoformat()}T12:00:0{j}",
+                'status': 'published'}), encoding='utf-8')
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='查找最新日报基准')
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 365, 1500])
+    parser.add_argument('--posts-per-day', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'glob_sort_ms':>13} {'glob_stat_ms':>13} {'catalog_ms':>11} {'rebuild_s':>10}")
+    for days in args.days:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            populate(output_dir, days, args.posts_per_day)
+            entries = sum(1 for _ in output_dir.iterdir())
+
+            glob_sort = timed(lambda: sorted(output_dir.glob('xhs_ai_news_*.txt'), reverse=True)[0], args.repeat)
+            glob_stat = timed(lambda: max(output_dir.glob('xhs_ai_news_*.txt'),
+                                          key=lambda p: p.stat().st_mtime), args.repeat)
+            catalog = PostCatalog(output_dir)
+            start = time.perf_counter()
+            catalog.rebuild(statuses={})
+            rebuild_s = time.perf_counter() - start
+            catalog.close()
+
+            def lookup():
+                with PostCatalog(output_dir) as c:
+                    return c.latest('daily')
+
+            catalog_ms = timed(lookup, args.repeat)
+            print(f"{entries:>8} {glob_sort:>13.2f} {glob_stat:>13.2f} {catalog_ms:>11.2f} {rebuild_s:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档爬虫基准：逐个技术串行抓取 vs 并发抓取
+
+对着 tools/doc_fixture_server.py 的假文档站抓取多个技术（每个请求固定延迟），
+检查提取结果，并打印耗时与服务端请求数。
+
+Usage:
+    python tools/bench_doc_crawler.py
+    python tools/bench_doc_crawler.py --techs 5 --latency-ms 80 --per-host 4
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import doc_fixture_server
+from doc_crawler import DocCrawler
+from http_cache import HttpCache
+
+TECHS = ['kimi-k2', 'qwen3', 'deepseek-v3', 'claude-sdk', 'llama-4', 'mistral-large', 'gemini-cli', 'glm-4']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文档爬虫基准')
+    parser.add_argument('--techs', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--per-host', type=int, default=4)
+    args = parser.parse_args()
+
+    server = doc_fixture_server.start(latency_ms=args.latency_ms)
+    base = f"http://127.0.0.1:{server.server_port}"
+    roots = {slug: f"{base}/{slug}/docs" for slug in TECHS[:args.techs]}
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            crawler = DocCrawler(HttpCache(Path(tmp) / 'seq'), max_concurrency=1, per_host=1, max_age=0)
+            start = time.perf_counter()
+            for name, url in roots.items():
+                crawler.crawl_many({name: url})
+            sequential = time.perf_counter() - start
+
+            crawler = DocCrawler(HttpCache(Path(tmp) / 'par'), max_concurrency=args.concurrency,
+                                 per_host=args.per_host, max_age=0)
+            start = time.perf_counter()
+            docs = crawler.crawl_many(roots)
+            concurrent = time.perf_counter() - start
+
+            start = time.perf_counter()
+            crawler.crawl_many(roots)
+            revalidated = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    for name, data in docs.items():
+        assert len(data['key_features']) >= 4, name
+        assert len(data['code_examples']) == 2, name
+        assert data['benchmarks'].get('MMLU') == '86.1', name
+    skipped = [path for path in server.RequestHandlerClass.hits if 'changelog' in path or 'blog' in path]
+    assert not skipped, skipped
+
+    pages = crawler.fetched // 2
+    print(f"techs          : {len(roots)} ({pages} pages, {args.latency_ms:.0f} ms latency)")
+    print(f"sequential     : {sequential:6.2f} s")
+    print(f"concurrent     : {concurrent:6.2f} s  (x{sequential / concurrent:.1f})")
+    print(f"304 recrawl    : {revalidated:6.2f} s")
+    sample = docs[TECHS[0]]
+    print(f"sample         : {sample['summary']!r}, {len(sample['key_features'])} features, "
+          f"benchmarks={sample['benchmarks']}")
+
+
+if __name__ == '__main__':
+    main()
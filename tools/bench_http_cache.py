@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 缓存基准：首次下载 vs 304 重验证 vs 新鲜命中
+
+在本地起一个支持 ETag / Last-Modified 的 http.server 作为文档站替身，
+页面大小可调，服务端可以人为增加每 KB 的传输延迟来模拟慢网络。
+
+Usage:
+    python tools/bench_http_cache.py
+    python tools/bench_http_cache.py --size-kb 512 --delay-ms-per-kb 0.2 --rounds 20
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_cache import HttpCache
+
+
+def make_handler(page: bytes, delay_per_kb: float):
+    etag = '"%s"' % hashlib.sha1(page).hexdigest()[:16]
+    last_modified = formatdate(time.time() - 3600, usegmt=True)
+    stats = {'200': 0, '304': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.headers.get('If-None-Match') == etag:
+                stats['304'] += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            stats['200'] += 1
+            time.sleep(delay_per_kb * len(page) / 1024)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler, stats
+
+
+def timed(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP 缓存基准')
+    parser.add_argument('--size-kb', type=int, default=256)
+    parser.add_argument('--delay-ms-per-kb', type=float, default=0.1, help='模拟的传输耗时')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    page = (b'<html><body>' + b'<p>docs</p>' * (args.size_kb * 1024 // 11) + b'</body></html>')
+    handler, stats = make_handler(page, args.delay_ms_per_kb / 1000)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/docs"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HttpCache(Path(tmp), max_bytes=4 * len(page))
+            cold_ms, response = timed(lambda: cache.get(url), 1)
+            assert response.status == 200 and not response.from_cache
+            revalidate_ms, response = timed(lambda: cache.get(url), args.rounds)
+            assert response.revalidated and response.body == page
+            fresh_ms, response = timed(lambda: cache.get(url, max_age=3600), args.rounds)
+            assert response.from_cache and not response.revalidated
+            nocache_ms, _ = timed(lambda: cache.session.get(url).content, args.rounds)
+    finally:
+        server.shutdown()
+
+    print(f"page size        : {len(page) / 1024:.0f} KB")
+    print(f"first download   : {cold_ms:8.2f} ms")
+    print(f"uncached GET     : {nocache_ms:8.2f} ms/req")
+    print(f"304 revalidation : {revalidate_ms:8.2f} ms/req")
+    print(f"fresh cache hit  : {fresh_ms:8.2f} ms/req")
+    print(f"server responses : 200={stats['200']} 304={stats['304']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章存储基准：每篇一个目录（三个原子写入的小文件）vs 打包存储批量提交
+
+Usage:
+    python tools/bench_post_store.py
+    python tools/bench_post_store.py --posts 2000 --commit-every 1 20 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fsutil import atomic_write_json, atomic_write_text
+from post_store import PostStore
+
+MARKDOWN = "# 标题\n\n" + "正文段落，介绍这个技术的特性和用法。\n" * 80
+XHS = "标题\n" + "小红书正文 ✨\n" * 40
+
+
+def meta_for(i: int) -> dict:
+    return {'tech_name': f"Tech{i}", 'created_at': '2026-01-01T00:00:00', 'status': 'ready_to_publish'}
+
+
+def bench_dirs(root: Path, posts: int) -> float:
+    start = time.perf_counter()
+    for i in range(posts):
+        post_dir = root / f"post_{i:05d}"
+        atomic_write_text(post_dir / 'article.md', MARKDOWN)
+        atomic_write_text(post_dir / 'xiaohongshu.txt', XHS)
+        atomic_write_json(post_dir / 'meta.json', meta_for(i))
+    return time.perf_counter() - start
+
+
+def bench_packed(root: Path, posts: int, commit_every: int) -> float:
+    store = PostStore(root / 'posts.sqlite3', commit_every)
+    start = time.perf_counter()
+    for i in range(posts):
+        store.put(f"post_{i:05d}", {'article.md': MARKDOWN, 'xiaohongshu.txt': XHS}, meta_for(i))
+    store.close()
+    return time.perf_counter() - start
+
+
+def count_files(root: Path) -> int:
+    return sum(len(files) + len(dirs) for _, dirs, files in os.walk(root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章存储基准')
+    parser.add_argument('--posts', type=int, default=500)
+    parser.add_argument('--commit-every', type=int, nargs='+', default=[1, 20, 100])
+    args = parser.parse_args()
+
+    print(f"{'backend':>14} {'seconds':>8} {'ms/post':>8} {'inodes':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds = bench_dirs(Path(tmp), args.posts)
+        print(f"{'dirs':>14} {seconds:>8.2f} {seconds / args.posts * 1000:>8.2f} {count_files(Path(tmp)):>7}")
+    for commit_every in args.commit_every:
+        with tempfile.TemporaryDirectory() as tmp:
+            seconds = bench_packed(Path(tmp), args.posts, commit_every)
+            label = f"packed/{commit_every}"
+            print(f"{label:>14} {seconds:>8.2f} {seconds / args.posts * 1000:>8.2f} {count_files(Path(tmp)):>7}")
+
+
+if __name__ == '__main__':
+    main()
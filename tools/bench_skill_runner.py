@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenClaw skill 调用基准：每次 npx openclaw vs 直接启动解析好的 openclaw 入口
+
+    npx     - ['npx', '--yes', 'openclaw', 'skills', 'run', ...]，改造前的调用方式
+    direct  - skill_runner.run_skill，使用 resolve_openclaw_command 解析出的命令
+
+Usage:
+    python tools/bench_skill_runner.py                       # 默认运行 ai-news-collectors
+    python tools/bench_skill_runner.py --skill nano-banana-pro --args "--help"
+    python tools/bench_skill_runner.py --rounds 5
+"""
+
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import skill_runner
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<22} first={samples[0]:.3f}s  median={statistics.median(samples):.3f}s  "
+          f"min={min(samples):.3f}s  n={len(samples)}")
+
+
+def run_npx(skill, skill_args, timeout):
+    """改造前的调用：每次都经过 npx 解析"""
+    subprocess.run(['npx', '--yes', 'openclaw', 'skills', 'run', skill, *skill_args],
+                   capture_output=True, shell=(os.name == 'nt'), timeout=timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='npx 调用 vs 直接调用 openclaw 基准')
+    parser.add_argument('--skill', default='ai-news-collectors', help='要运行的 skill')
+    parser.add_argument('--args', default='', help='传给 skill 的参数')
+    parser.add_argument('--rounds', type=int, default=3, help='每种模式的调用次数')
+    parser.add_argument('--timeout', type=int, default=180, help='单次调用超时（秒）')
+    args = parser.parse_args()
+
+    skill_args = shlex.split(args.args)
+    command = skill_runner.resolve_openclaw_command()
+
+    print(f"Skill: {args.skill} {args.args}".rstrip())
+    print(f"openclaw 命令: {' '.join(command)}")
+    print()
+
+    npx = timed(lambda: run_npx(args.skill, skill_args, args.timeout), args.rounds)
+    report("npx openclaw", npx)
+
+    if command[0] == 'npx':
+        print("PATH 中没有 openclaw，direct 模式同样经过 npx，跳过对比")
+        return
+    direct = timed(lambda: skill_runner.run_skill(args.skill, skill_args, args.timeout), args.rounds)
+    report("direct (resolved)", direct)
+
+    print()
+    print(f"median speedup: {statistics.median(npx) / max(statistics.median(direct), 1e-9):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行启动耗时基准（python -X importtime）
+
+cron 和 skill 调用每次都是一个新进程，耗时主要在导入阶段。这里在子进程中
+用 -X importtime 导入各入口模块若干次，取累计导入耗时的中位数，并与预算
+比较；列出最慢的几个依赖，方便定位是谁拖慢了启动。
+
+test_setup.py 的环境检查会调用 check_budget()，超出预算时给出警告。
+
+Usage:
+    python tools/bench_startup.py
+    python tools/bench_startup.py --runs 10 --top 8
+    python tools/bench_startup.py --check        # 超出预算时退出码为 1
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 入口模块 -> 导入耗时预算（毫秒，不含解释器自身启动）
+BUDGETS_MS = {
+    'daily_ai_news': 120,
+    'xhs_auto_publish': 80,
+    'xhs_tech_blogger': 100,
+    'run': 30,  # scripts/run.py（流水线模块在 main() 中导入，由上面两项覆盖）
+}
+
+# 这些重依赖不应出现在入口模块的导入链里（用到时再导入）
+LAZY_MODULES = ('requests', 'asyncio', 'PIL', 'multiprocessing')
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """在子进程中导入模块，返回该模块导入链上的 [(模块名, 自身耗时 us, 累计耗时 us)]"""
+    code = (f"import sys; sys.path[:0] = [{str(ROOT)!r}, {str(ROOT / 'scripts')!r}]; "
+            f"import {module}")
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=str(ROOT)
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} 失败: {result.stderr.strip().splitlines()[-1:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():  # 表头
+            continue
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    # 解释器启动阶段（到 site 为止）的导入与入口模块无关
+    sites = [i for i, row in enumerate(rows) if row[0] == 'site']
+    return rows[sites[-1] + 1:] if sites else rows
+
+
+def measure(module: str, runs: int = 5) -> Dict:
+    """
+    多次导入取中位数
+
+    Returns:
+        Dict: module / ms / budget_ms / slowest（最慢的依赖）/ eager（不应提前导入的重依赖）
+    """
+    totals, profile = [], []
+    for _ in range(runs):
+        profile = import_profile(module)
+        totals.append(next(cum for name, _, cum in profile if name == module))
+    imported = {name for name, _, _ in profile}
+    slowest = sorted(((name, cum) for name, _, cum in profile if name != module),
+                     key=lambda item: item[1], reverse=True)
+    return {
+        'module': module,
+        'ms': statistics.median(totals) / 1000,
+        'budget_ms': BUDGETS_MS.get(module),
+        'slowest': slowest,
+        'eager': [name for name in LAZY_MODULES if name in imported],
+    }
+
+
+def check_budget(runs: int = 3) -> List[str]:
+    """检查所有入口模块，返回问题列表（空列表表示全部在预算内）"""
+    problems = []
+    for module, budget in BUDGETS_MS.items():
+        result = measure(module, runs)
+        if result['ms'] > budget:
+            problems.append(f"{module} 导入耗时 {result['ms']:.0f}ms，超出预算 {budget}ms")
+        if result['eager']:
+            problems.append(f"{module} 启动时导入了 {', '.join(result['eager'])}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='命令行启动耗时基准')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help='列出最慢的几个依赖')
+    parser.add_argument('--check', action='store_true', help='超出预算时退出码为 1')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':>18} {'import_ms':>10} {'budget_ms':>10}  slowest dependencies")
+    for module, budget in BUDGETS_MS.items():
+        result = measure(module, args.runs)
+        over = result['ms'] > budget or result['eager']
+        failed = failed or over
+        top = ', '.join(f"{name} {cum / 1000:.1f}" for name, cum in result['slowest'][:args.top])
+        mark = '  !!' if over else ''
+        print(f"{module:>18} {result['ms']:>10.1f} {budget:>10}{mark}  {top}")
+        if result['eager']:
+            print(f"{'':>18} 启动时导入了: {', '.join(result['eager'])}")
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
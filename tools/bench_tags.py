@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标签推荐基准：逐个关键词子串扫描 vs Aho-Corasick 自动机
+
+词表从几十条扩充到几万条（随机生成的英文/中文关键词），比较每篇文章的
+匹配耗时。逐词扫描的耗时随词表线性增长，自动机只与文本长度有关。
+
+Usage:
+    python tools/bench_tags.py
+    python tools/bench_tags.py --sizes 100 10000 50000 --docs 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tag_automaton import DEFAULT_VOCAB_PATH, load_vocabulary
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+CJK = '大模型推理能力全面提升多模态智能体开源训练芯片融资估值安全评测编程数学视觉记忆上下文窗口'
+
+
+def build_entries(size, rng):
+    with open(DEFAULT_VOCAB_PATH, 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+    seen = {e['keyword'] for e in entries}
+    while len(entries) < size:
+        if rng.random() < 0.7:
+            keyword = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(4, 10)))
+        else:
+            keyword = ''.join(rng.choice(CJK) for _ in range(rng.randint(2, 4)))
+        if keyword not in seen:
+            seen.add(keyword)
+            entries.append({'keyword': keyword, 'tags': [keyword.title()], 'weight': rng.random()})
+    return entries
+
+
+def build_doc(rng, entries):
+    words = [rng.choice(entries)['keyword'] for _ in range(6)]
+    filler = ' '.join(''.join(rng.choice(LETTERS) for _ in range(6)) for _ in range(60))
+    return {
+        'name': f"{words[0]} {words[1]}",
+        'summary': f"{filler} {words[2]} {''.join(rng.choice(CJK) for _ in range(80))}",
+        'key_features': [{'title': w, 'description': filler[:120]} for w in words[3:]],
+    }
+
+
+def legacy_match(entries, doc):
+    """原实现的做法：对每个关键词做一次子串查找"""
+    text = ' '.join([doc['name'], doc['summary']] +
+                    [f"{f['title']} {f['description']}" for f in doc['key_features']]).lower()
+    tags = []
+    for entry in entries:
+        if entry['keyword'] in text:
+            tags.extend(entry['tags'])
+    return tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description='标签推荐基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[36, 1000, 10000, 50000])
+    parser.add_argument('--docs', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'compile_s':>10} {'legacy_us':>10} {'ac_us':>8} {'cached_load_us':>15}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        entries = build_entries(size, rng)
+        docs = [build_doc(rng, entries) for _ in range(args.docs)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'tags.json'
+            path.write_text(json.dumps({'entries': entries}, ensure_ascii=False), encoding='utf-8')
+            start = time.perf_counter()
+            vocab = load_vocabulary(path)
+            compile_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(100):
+                load_vocabulary(path)
+            cached_us = (time.perf_counter() - start) / 100 * 1e6
+
+        start = time.perf_counter()
+        for doc in docs:
+            legacy_match(entries, doc)
+        legacy_us = (time.perf_counter() - start) / len(docs) * 1e6
+
+        start = time.perf_counter()
+        for doc in docs:
+            vocab.rank(doc)
+        ac_us = (time.perf_counter() - start) / len(docs) * 1e6
+
+        print(f"{len(entries):>8} {compile_s:>10.3f} {legacy_us:>10.1f} {ac_us:>8.1f} {cached_us:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
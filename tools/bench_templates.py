@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章模板渲染基准：旧的字符串 += 拼接 vs 内置模板的手写渲染（默认路径）
+vs 预编译模板（自定义模板走的路径）
+
+    1. 渲染 10k 篇单技术文章
+    2. 渲染带 1000 行性能对比表的文章
+    3. 渲染 5 个技术的对比文章 10k 次
+
+同时校验三种实现的输出完全一致。
+
+Usage:
+    python tools/bench_templates.py
+    python tools/bench_templates.py --posts 10000 --rows 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from post_templates import article_context, comparison_context, get_registry
+
+DATE = "2026-01-01"
+
+
+def legacy_article(tech_data, include_code=True, date_str=DATE):
+    """改造前 XhsTechBlogger.generate_markdown 的实现"""
+    markdown = f"""# {tech_data['name']} - 技术解析
+
+> 📅 发布日期: {date_str}
+> 🏷️ 分类: AI技术 | 大模型
+
+## 🚀 简介
+
+{tech_data.get('summary', '暂无总结')}
+
+## ✨ 核心特点
+
+"""
+    for i, feature in enumerate(tech_data.get('key_features', []), 1):
+        markdown += f"{i}. **{feature['title']}**: {feature['description']}\n"
+    if tech_data.get('code_examples') and include_code:
+        markdown += "\n## 💻 代码示例\n\n```python\n"
+        markdown += tech_data['code_examples'][0]
+        markdown += "\n```\n"
+    if tech_data.get('benchmarks'):
+        markdown += "\n## 📊 性能对比\n\n"
+        markdown += "| 指标 | 数值 |\n"
+        markdown += "|------|------|\n"
+        for metric, value in tech_data['benchmarks'].items():
+            markdown += f"| {metric} | {value} |\n"
+    markdown += f"""
+## 🎯 总结
+
+{tech_data['name']} 是一个值得关注的技术...
+
+---
+
+💡 **想要了解更多 AI 技术？关注我，每天分享最新技术干货！**
+
+"""
+    return markdown
+
+
+def legacy_comparison(tech_data_dict, date_str=DATE):
+    """改造前 XhsTechBlogger._generate_comparison_markdown 的实现"""
+    tech_names = list(tech_data_dict.keys())
+    markdown = f"""# {' vs '.join(tech_names)} - 技术对比
+
+> 📅 发布日期: {date_str}
+> 🏷️ 分类: AI技术对比 | 大模型选型
+
+## 🚀 概述
+
+今天为大家带来 {len(tech_names)} 款热门技术的深度对比...
+
+## 📊 对比维度
+
+"""
+    markdown += "| 特性 | " + " | ".join(tech_names) + " |\n"
+    markdown += "|------|" + "|".join(["------"] * len(tech_names)) + "|\n"
+    for item in ["架构", "参数量", "上下文长度", "推理速度", "中文能力", "开源程度"]:
+        row = f"| {item} |"
+        for tech in tech_names:
+            row += " 待补充 |"
+        markdown += row + "\n"
+    markdown += "\n## 🔍 详细解析\n\n"
+    for tech_name, data in tech_data_dict.items():
+        markdown += f"### {tech_name}\n\n"
+        markdown += f"{data.get('summary', '暂无总结')}\n\n"
+    markdown += """
+## 🎯 选型建议
+
+- **如果你的需求是 XXX**: 推荐 XXX
+- **如果你的需求是 YYY**: 推荐 YYY
+
+---
+
+💡 **想要了解更多技术对比？关注我，每周深度对比！**
+
+"""
+    return markdown
+
+
+def make_tech(i, rows=5):
+    return {
+        'name': f"Model-{i}",
+        'summary': f"Model-{i} 是一个新的多模态大模型。",
+        'key_features': [{'title': f"特点{j}", 'description': f"描述 {j}"} for j in range(1, 6)],
+        'code_examples': [f"from model_{i} import Client\nclient = Client()\nprint(client.chat('hi'))"],
+        'benchmarks': {f"metric_{j}": f"{j * 1.5:.1f}" for j in range(rows)},
+    }
+
+
+def bench(label, fn, repeat, per_call=1):
+    """运行 fn repeat 次；每次调用渲染 per_call 篇文章"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed:8.3f}s  ({elapsed / (repeat * per_call) * 1e6:9.1f} us/篇)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章模板渲染基准')
+    parser.add_argument('--posts', type=int, default=10000, help='渲染的文章篇数')
+    parser.add_argument('--rows', type=int, default=1000, help='大表格的行数')
+    args = parser.parse_args()
+
+    registry = get_registry()
+    article = registry.get('default')
+    comparison = registry.get('comparison')
+
+    techs = [make_tech(i) for i in range(args.posts)]
+    big = make_tech(0, rows=args.rows)
+    compare = {f"Model-{i}": make_tech(i) for i in range(5)}
+
+    for tech in techs[:100] + [big]:
+        assert article.render(article_context(tech, date_str=DATE)) == legacy_article(tech), tech['name']
+        assert registry.render_article('default', tech, date_str=DATE) == legacy_article(tech), tech['name']
+    assert comparison.render(comparison_context(compare, date_str=DATE)) == legacy_comparison(compare)
+    assert registry.render_comparison('comparison', compare, date_str=DATE) == legacy_comparison(compare)
+    print("输出一致性校验通过\n")
+
+    print(f"[1] {args.posts} 篇单技术文章")
+    bench('legacy', lambda: [legacy_article(t) for t in techs], 1, len(techs))
+    bench('builtin', lambda: [registry.render_article('default', t, date_str=DATE) for t in techs], 1, len(techs))
+    bench('template', lambda: [article.render(article_context(t, date_str=DATE)) for t in techs], 1, len(techs))
+
+    print(f"\n[2] {args.rows} 行性能对比表 × 20")
+    bench('legacy', lambda: legacy_article(big), 20)
+    bench('builtin', lambda: registry.render_article('default', big, date_str=DATE), 20)
+    bench('template', lambda: article.render(article_context(big, date_str=DATE)), 20)
+
+    print(f"\n[3] 5 技术对比文章 × {args.posts}")
+    bench('legacy', lambda: legacy_comparison(compare), args.posts)
+    bench('builtin', lambda: registry.render_comparison('comparison', compare, date_str=DATE), args.posts)
+    bench('template', lambda: comparison.render(comparison_context(compare, date_str=DATE)), args.posts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown → 小红书文本转换基准：单遍扫描 vs 旧的多轮 str.replace
+
+Usage:
+    python tools/bench_xhs_format.py
+    python tools/bench_xhs_format.py --copies 5000 --show
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from xhs_format import to_xhs_text
+
+SECTION = """# Model-X - 技术解析
+
+> 📅 发布日期: 2026-01-01
+> 🏷️ 分类: AI技术 | 大模型
+
+## 🚀 简介
+
+Model-X 在 *长上下文* 和 **推理速度** 上都有提升，成本约为 GPT-4 的 1/3 * 2。
+
+## ✨ 核心特点
+
+1. **MoE 架构**: 激活参数 `top_k * expert_dim`
+2. **长上下文**: 支持 128k tokens
+
+## 💻 代码示例
+
+```python
+scores = [a * b for a, b in pairs]  # | 也不应被删掉
+print(f"{x:>10} | {y}")
+```
+
+## 📊 性能对比
+
+| 指标 | 数值 |
+|------|------|
+| MMLU | 88.5 |
+| 吞吐 | 120 tok/s |
+
+---
+
+"""
+
+
+def legacy_format(markdown):
+    """改造前 XhsTechBlogger.format_for_xiaohongshu 的正文部分"""
+    text = markdown.replace('# ', '').replace('## ', '').replace('### ', '')
+    text = text.replace('**', '').replace('*', '')
+    text = text.replace('```python', '').replace('```', '')
+    text = text.replace('|', '').replace('---', '')
+    formatted_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and not line.startswith('>'):
+            formatted_lines.append(line)
+            formatted_lines.append('')
+    return '\n'.join(formatted_lines)
+
+
+def bench(label, fn, doc, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(doc)
+        best = min(best, time.perf_counter() - start)
+    mb = len(doc.encode('utf-8')) / 1e6
+    print(f"  {label:<12} {best:8.3f}s  {mb / best:8.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Markdown 转换基准')
+    parser.add_argument('--copies', type=int, default=2000, help='文档由多少个小节拼成')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--show', action='store_true', help='打印单个小节两种实现的输出对比')
+    args = parser.parse_args()
+
+    if args.show:
+        print("---- legacy ----")
+        print(legacy_format(SECTION))
+        print("---- single pass ----")
+        print(to_xhs_text(SECTION))
+
+    doc = SECTION * args.copies
+    print(f"文档大小: {len(doc.encode('utf-8')) / 1e6:.1f} MB, {doc.count(chr(10))} 行")
+    bench('legacy', legacy_format, doc, args.repeat)
+    bench('single-pass', to_xhs_text, doc, args.repeat)
+
+    # 吞吐不如 C 实现的 str.replace，但一篇文章只有几 KB，单篇耗时才是实际开销
+    start = time.perf_counter()
+    for _ in range(1000):
+        to_xhs_text(SECTION)
+    per_post = (time.perf_counter() - start) / 1000
+    print(f"  单篇 {len(SECTION.encode('utf-8')) / 1024:.1f} KB: {per_post * 1e3:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
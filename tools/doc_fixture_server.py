@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地假文档站
+
+为任意技术名生成一套文档页面，结构模仿常见的官方文档:
+
+    /<slug>/docs                 首页（简介 + 子页面链接 + 无关链接）
+    /<slug>/docs/features        h2/h3 特性列表
+    /<slug>/docs/quickstart      代码示例
+    /<slug>/docs/benchmarks      性能表格
+    /<slug>/docs/changelog       不应被跟进的页面
+    /<slug>/blog                 文档路径之外，不应被跟进
+
+每个响应都带 ETag，可加固定延迟模拟网络往返。配合
+docs.url_template = "http://127.0.0.1:<port>/{slug}/docs" 使用。
+
+Usage:
+    python tools/doc_fixture_server.py --port 8765 --latency-ms 50
+"""
+
+import argparse
+import hashlib
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _page(title: str, body: str) -> str:
+    return (f"<!doctype html><html><head><title>{html.escape(title)}</title>"
+            f"<meta name=\"description\" content=\"{html.escape(title)} official documentation\">"
+            f"<script>var tracking = '<h2>not a heading</h2>';</script></head>"
+            f"<body><nav><a href=\"/\">Home</a></nav>{body}</body></html>")
+
+
+def render(slug: str, page: str):
+    name = slug.replace('-', ' ').title()
+    if page == '':
+        return _page(f"{name} Docs", (
+            f"<h1>{name}</h1><p>{name} is a fast, open model for building AI applications.</p>"
+            f"<ul><li><a href=\"/{slug}/docs/features\">Features</a></li>"
+            f"<li><a href=\"docs/quickstart\">Get started</a></li>"
+            f"<li><a href=\"/{slug}/docs/benchmarks#latest\">Performance</a></li>"
+            f"<li><a href=\"/{slug}/docs/changelog\">Changelog</a></li>"
+            f"<li><a href=\"/{slug}/blog/features-announcement\">Blog</a></li>"
+            f"<li><a href=\"https://example.com/{slug}/docs/features\">Mirror</a></li></ul>"
+        ))
+    if page == 'features':
+        items = ''.join(f"<h2>Feature {i}: {name} {word}</h2><p>{name} supports {word} out of the box.</p>"
+                        for i, word in enumerate(['long context', 'tool calling', 'streaming', 'MoE routing'], 1))
+        return _page(f"{name} Features", items)
+    if page == 'quickstart':
+        return _page(f"{name} Quickstart", (
+            "<h2>Install</h2><p>Install the SDK with pip.</p>"
+            f"<pre><code>pip install {slug}</code></pre>"
+            "<h2>First request</h2><p>Send a chat request.</p>"
+            f"<pre><code class=\"language-python\">from {slug.replace('-', '_')} import Client\n\n"
+            "client = Client()\nprint(client.chat(&quot;hello&quot;))</code></pre>"
+        ))
+    if page == 'benchmarks':
+        return _page(f"{name} Benchmarks", (
+            "<table><tr><th>Benchmark</th><th>Score</th></tr>"
+            "<tr><td>MMLU</td><td>86.1</td></tr><tr><td>HumanEval</td><td>78.4</td></tr>"
+            "<tr><td>Context</td><td>128K</td></tr></table>"
+        ))
+    if page == 'changelog':
+        return _page(f"{name} Changelog", "<h2>v1.0</h2><p>Initial release.</p>")
+    return None
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        parts = self.path.split('?')[0].strip('/').split('/')
+        body = None
+        if len(parts) >= 2 and parts[1] == 'docs':
+            body = render(parts[0], '/'.join(parts[2:]))
+        elif len(parts) >= 2 and parts[1] == 'blog':
+            body = _page('Blog', '<h2>Announcement</h2><p>Not documentation.</p>')
+        with self.lock:
+            self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        time.sleep(self.latency)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = body.encode('utf-8')
+        etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start(port: int = 0, latency_ms: float = 0) -> ThreadingHTTPServer:
+    """在后台线程启动假文档站，返回 server（server.server_port 为实际端口）"""
+    handler = type('Handler', (FixtureHandler,), {'latency': latency_ms / 1000, 'hits': {}})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地假文档站')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+    server = start(args.port, args.latency_ms)
+    print(f"docs.url_template = http://127.0.0.1:{server.server_port}/{{slug}}/docs")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
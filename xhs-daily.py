@@ -4,10 +4,11 @@ XHS Tech Blogger - 命令行入口
 可以直接运行: python xhs-daily.py
 """
 
-import subprocess
 import sys
 from pathlib import Path
 
+from daily_ai_news import run_daily
+
 def main():
     skill_dir = Path(__file__).parent
     
@@ -16,27 +17,20 @@ def main():
     print("=" * 70)
     print()
     
-    # 生成日报
+    # 生成日报（在当前进程中运行，不再启动新的解释器）
     print("[1/2] 正在生成AI日报...")
-    result = subprocess.run(
-        [sys.executable, str(skill_dir / "daily_ai_news.py")],
-        capture_output=True,
-        text=True,
-        cwd=str(skill_dir)
-    )
-    print(result.stdout[-500:] if len(result.stdout) > 500 else result.stdout)
+    result = run_daily(skill_dir / "config.json")
     
-    if result.returncode != 0:
-        print("[Error] 生成失败")
+    if not result.ok:
+        print(f"[Error] 生成失败: {result.error}")
         return 1
+    print(f"[OK] {result.filepath}（{len(result.items)} 条新闻，耗时 {result.timings['total']:.1f}s）")
     
     # 检查是否需要发布
     if "--publish" in sys.argv:
         print("\n[2/2] 正在打开发布页面...")
-        subprocess.run(
-            [sys.executable, str(skill_dir / "xhs_auto_publish.py"), "--latest"],
-            cwd=str(skill_dir)
-        )
+        from xhs_auto_publish import publish_file
+        publish_file(result.filepath)
     else:
         print("\n[2/2] 日报已生成!")
         print("\n生成封面图:")
@@ -6,39 +6,130 @@ XHS一键发布脚本 - OpenClaw Browser版
 Usage:
     python xhs_auto_publish.py <content_file>  # 发布指定文件
     python xhs_auto_publish.py --latest        # 发布最新的日报
+    python xhs_auto_publish.py --batch output/  # 同一浏览器会话中批量填写，逐篇人工点发布
+    python xhs_auto_publish.py --batch output/ --submit  # 批量填写并自动点击发布
+    python xhs_auto_publish.py --mark-published <content_file>  # 人工点了发布后记入台账
+
+已填写（filled）和已发布的内容重复运行时跳过，中断的批量发布从断点继续；--force 重新填写。
 """
 
 import argparse
-import subprocess
+import fnmatch
+import glob
+import json
+import sys
 import time
+from datetime import datetime
 from pathlib import Path
 
-def find_latest_content():
-    """找到最新的内容文件"""
-    output_dir = Path(__file__).parent / 'output'
+import post_store
+import skill_runner
+from browser_session import BrowserError, BrowserSession, PAYLOAD_JS
+from cover_cache import CoverCache
+from cover_postprocess import postprocess_cover
+from fsutil import atomic_write_json
+from post_catalog import PostCatalog
+from publish_ledger import content_hash, open_ledger, output_dir_from_config, split_title_body
+
+def load_config():
+    """加载配置文件"""
+    config_path = Path(__file__).parent / 'config.json'
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def find_latest_content(config=None):
+    """找到最新的内容文件（配置的日报输出目录）"""
+    output_dir = output_dir_from_config(config if config is not None else load_config())
     if not output_dir.exists():
         return None
     
-    files = sorted(output_dir.glob('xhs_ai_news_*.txt'), reverse=True)
-    return files[0] if files else None
+    with PostCatalog(output_dir) as catalog:
+        return catalog.latest('daily')
 
 def read_content(filepath):
-    """读取内容文件"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+    """读取内容文件（包括打包存储中的文章）"""
+    return post_store.read_text(filepath)
 
 def extract_title_and_content(full_content):
     """提取标题和正文"""
-    lines = full_content.split('\n')
-    title = lines[0].replace('标题：', '').strip() if lines[0].startswith('标题：') else lines[0]
-    body = '\n'.join(lines[1:]).strip()
-    return title, body
+    return split_title_body(full_content)
+
+# 编辑器就绪：标题输入框和正文输入框都已渲染
+EDITOR_READY_JS = (
+    "[...document.querySelectorAll('input, textarea')].some(el => (el.placeholder || '').includes('标题'))"
+    " && ([...document.querySelectorAll('textarea')].some(el => /正文|内容/.test(el.placeholder || ''))"
+    " || !!document.querySelector('[contenteditable=\"true\"]'))"
+)
+
+# 从 window.__xhs 读取标题和正文并填入；用原生 setter 赋值，React 受控组件才能感知到
+FILL_JS = """
+(() => {
+    %s
+    const setValue = (el, value) => {
+        const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+    };
+    const title = [...document.querySelectorAll('input, textarea')]
+        .find(el => (el.placeholder || '').includes('标题'));
+    const body = [...document.querySelectorAll('textarea')]
+        .find(el => /正文|内容/.test(el.placeholder || ''));
+    const editor = document.querySelector('[contenteditable="true"]');
+    let filled = 0;
+    if (title) { setValue(title, payload('title')); filled += 1; }
+    if (body) {
+        setValue(body, payload('body')); filled += 2;
+    } else if (editor) {
+        editor.focus();
+        editor.innerText = payload('body');
+        editor.dispatchEvent(new Event('input', { bubbles: true }));
+        filled += 2;
+    }
+    return 'XHS_FILLED_' + filled;
+})()
+""" % PAYLOAD_JS
+
+
+def fill_post(browser, title, body, config=None):
+    """
+    在当前会话中打开创作页，等编辑器就绪后填入标题和正文
+    
+    Returns:
+        bool: 标题和正文是否都已填入
+    """
+    publish_config = (config or {}).get('publish', {})
+    creator_url = (config or {}).get('xiaohongshu', {}).get(
+        'creator_url', 'https://creator.xiaohongshu.com/publish/publish')
+    
+    start = time.perf_counter()
+    browser.navigate(creator_url)
+    if not browser.wait_for(EDITOR_READY_JS, timeout=publish_config.get('ready_timeout', 30),
+                            poll_interval=publish_config.get('poll_interval', 0.25)):
+        print(f"[Error] 编辑器 {publish_config.get('ready_timeout', 30)}s 内未就绪（未登录或页面结构变化？）")
+        browser.screenshot()
+        return False
+    print(f"      编辑器就绪 ({time.perf_counter() - start:.1f}s)")
+    print("[2/2] 填写内容...")
+    
+    calls = browser.calls
+    output = browser.evaluate(FILL_JS, payload={'title': title, 'body': body})
+    if 'XHS_FILLED_3' not in output:
+        print(f"[Error] 填写不完整: {output.strip()[-200:]}")
+        browser.screenshot()
+        return False
+    print(f"      已填写标题和正文（{browser.calls - calls} 条命令）")
+    return True
+
 
-def publish_with_openclaw_browser(content_file):
-    """使用OpenClaw Browser发布"""
+def publish_with_openclaw_browser(content_file, browser=None, config=None):
+    """使用OpenClaw Browser发布（同一会话内完成打开、等待就绪和填写）"""
     # 读取内容
     full_content = read_content(content_file)
     title, body = extract_title_and_content(full_content)
+    config = config if config is not None else load_config()
     
     print("=" * 70)
     print("XHS一键发布 - OpenClaw Browser版")
@@ -47,57 +138,16 @@ def publish_with_openclaw_browser(content_file):
     print(f"正文长度: {len(body)} 字符")
     print()
     
-    # 1. 打开小红书创作平台
-    print("[1/3] 正在打开小红书创作平台...")
-    subprocess.run([
-        'openclaw', 'browser', 'navigate',
-        'https://creator.xiaohongshu.com/publish/publish'
-    ])
-    time.sleep(5)
-    
-    # 2. 截图确认页面
-    print("[2/3] 确认页面状态...")
-    subprocess.run(['openclaw', 'browser', 'screenshot'])
-    print("      请查看截图确认页面已加载")
-    
-    # 3. 填写内容（使用evaluate执行JavaScript）
-    print("[3/3] 填写内容...")
-    
-    # 准备内容（转义特殊字符）
-    title_js = title.replace("'", "\\'").replace('"', '\\"')
-    body_js = body.replace("'", "\\'").replace('"', '\\"').replace('\n', '\\n')
-    
-    # 构建JavaScript代码
-    js_code = f"""
-    (function() {{
-        // 填写标题
-        const titleInputs = document.querySelectorAll('input, textarea');
-        for (let input of titleInputs) {{
-            if (input.placeholder && input.placeholder.includes('标题')) {{
-                input.value = '{title_js}';
-                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                break;
-            }}
-        }}
-        
-        // 填写正文
-        const bodyInputs = document.querySelectorAll('textarea');
-        for (let input of bodyInputs) {{
-            if (input.placeholder && (input.placeholder.includes('正文') || input.placeholder.includes('内容'))) {{
-                input.value = '{body_js}';
-                input.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                break;
-            }}
-        }}
-        
-        return 'Content filled successfully';
-    }})()
-    """
-    
-    subprocess.run([
-        'openclaw', 'browser', 'evaluate',
-        '--fn', js_code
-    ])
+    print("[1/2] 打开小红书创作平台，等待编辑器就绪...")
+    own_session = browser is None
+    browser = browser or BrowserSession(timeout=config.get('publish', {}).get('command_timeout', 30))
+    try:
+        ok = fill_post(browser, title, body, config)
+    finally:
+        if own_session:
+            browser.close()
+    if not ok:
+        raise BrowserError("内容未能填入编辑器")
     
     print()
     print("=" * 70)
@@ -108,40 +158,331 @@ def publish_with_openclaw_browser(content_file):
     print("  2. 使用 nano-banana-pro 生成并上传封面图")
     print("  3. 检查内容无误后点击发布")
     print("=" * 70)
+    return True
+
+# 点击「发布」按钮；发布成功后页面会跳转或出现成功提示
+SUBMIT_JS = """
+(() => {
+    const button = [...document.querySelectorAll('button')]
+        .find(el => el.innerText.trim() === '发布' && !el.disabled);
+    if (!button) return 'XHS_NO_BUTTON';
+    button.click();
+    return 'XHS_SUBMITTED';
+})()
+"""
+PUBLISHED_JS = "location.href.includes('published=true') || document.body.innerText.includes('发布成功')"
 
-def generate_cover_with_nano_banana(title):
-    """使用nano-banana-pro skill生成封面"""
+
+def resolve_batch(patterns):
+    """
+    解析批量发布的内容文件
+    
+    每个参数可以是目录、glob 或文件：目录下查找 xhs_ai_news_*.txt 和
+    xhs_tech_blogger 的文章目录（*/xiaohongshu.txt）；文章目录本身也可以直接给出。
+    打包存储（.state/posts.sqlite3）中的文章同样按文章 id 匹配。
+    
+    Returns:
+        List[Path]: 去重后按路径排序的内容文件
+    """
+    files = []
+    for pattern in patterns:
+        files.extend(_packed_posts(Path(pattern).parent, Path(pattern).name))
+        matches = [Path(p) for p in glob.glob(pattern)] or [Path(pattern)]
+        for path in matches:
+            if path.is_dir():
+                if post_store.exists(path / 'xiaohongshu.txt'):
+                    files.append(path / 'xiaohongshu.txt')
+                else:
+                    files.extend(path.glob('xhs_ai_news_*.txt'))
+                    files.extend(path.glob('*/xiaohongshu.txt'))
+                    files.extend(_packed_posts(path))
+            elif post_store.exists(path):
+                files.append(path)
+    return sorted(set(files))
+
+
+def _packed_posts(output_dir, name_pattern='*'):
+    """输出目录的打包存储中文章 id 匹配 name_pattern 的内容文件"""
+    db_path = post_store.store_path(output_dir)
+    if not db_path.exists():
+        return []
+    store = post_store.open_store(db_path)
+    return [Path(output_dir) / post_id / 'xiaohongshu.txt' for post_id in store.post_ids()
+            if fnmatch.fnmatch(post_id, name_pattern)
+            and store.read_file(post_id, 'xiaohongshu.txt') is not None]
+
+
+def publish_batch(files, config=None, interval=None, submit=False, cover=False, force=False):
+    """
+    在同一个浏览器会话中依次发布多篇内容
+    
+    Args:
+        files: 内容文件列表
+        config: 配置（默认读取 config.json）
+        interval: 相邻两篇开始发布的最小间隔（秒），默认 publish.interval_seconds
+        submit: 是否自动点击发布并等待成功；默认只填写，由人工逐篇确认发布
+        cover: 是否先生成封面
+        force: 忽略发布台账，已发布 / 已填写的内容也重新发布（默认跳过，重跑时从断点继续）
+        
+    Returns:
+        Dict: 发布报告（每篇的结果和耗时），同时写入输出目录下的 publish_report_<时间>.json
+    """
+    config = config if config is not None else load_config()
+    publish_config = config.get('publish', {})
+    interval = publish_config.get('interval_seconds', 60) if interval is None else interval
+    started_at = datetime.now()
+    items = []
+    ledger = open_ledger(config)
+    
+    print("=" * 70)
+    print(f"XHS批量发布 - {len(files)} 篇，间隔 {interval}s")
+    print("=" * 70)
+    
+    last_start = None
+    with BrowserSession(timeout=publish_config.get('command_timeout', 30)) as browser:
+        for i, content_file in enumerate(files, 1):
+            item = {'file': str(content_file), 'title': None, 'status': 'failed', 'error': None, 'seconds': 0.0}
+            items.append(item)
+            print(f"\n[{i}/{len(files)}] {content_file}")
+            try:
+                title, body = extract_title_and_content(read_content(content_file))
+            except Exception as e:  # 单篇读不出来（编码错误、打包存储损坏等）不影响其余文章
+                item['error'] = str(e)
+                print(f"[Error] {e}")
+                continue
+            digest = content_hash(title, body)
+            item.update(title=title, hash=digest[:16])
+            if not ledger.claim(digest, content_file, title, force=force):
+                item['status'] = 'skipped'
+                item['error'] = ledger.skip_reason(digest)
+                print(f"      跳过: {item['error']}")
+                continue
+            
+            if last_start is not None:
+                wait = interval - (time.monotonic() - last_start)
+                if wait > 0:
+                    print(f"      等待 {wait:.0f}s（发布间隔）...")
+                    time.sleep(wait)
+            last_start = time.monotonic()
+            start = time.perf_counter()
+            try:
+                if cover:
+                    cover_path = generate_cover_with_nano_banana(
+                        title, content_file.with_name(f"{content_file.stem}_cover.png"), config)
+                    item['cover'] = str(cover_path) if cover_path else None
+                if not fill_post(browser, title, body, config):
+                    raise BrowserError("内容未能填入编辑器")
+                if submit:
+                    if 'XHS_SUBMITTED' not in browser.evaluate(SUBMIT_JS):
+                        raise BrowserError("未找到可用的发布按钮")
+                    if not browser.wait_for(PUBLISHED_JS, timeout=publish_config.get('submit_timeout', 30)):
+                        raise BrowserError("发布后未检测到成功提示")
+                    item['status'] = 'published'
+                else:
+                    item['status'] = 'filled'
+            except Exception as e:
+                item['error'] = str(e)
+                print(f"[Error] {e}")
+            item['seconds'] = round(time.perf_counter() - start, 2)
+            ledger.finish(digest, content_file, item['status'], error=item['error'])
+            print(f"      {item['status']} ({item['seconds']}s)")
+    
+    report = {
+        'started_at': started_at.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'interval_seconds': interval,
+        'total': len(items),
+        'succeeded': sum(1 for item in items if item['status'] in ('published', 'filled')),
+        'skipped': sum(1 for item in items if item['status'] == 'skipped'),
+        'failed': sum(1 for item in items if item['status'] == 'failed'),
+        'items': items,
+    }
+    report_path = output_dir_from_config(config) / f"publish_report_{started_at.strftime('%Y%m%d_%H%M%S')}.json"
+    atomic_write_json(report_path, report)
+    
+    print()
+    print("=" * 70)
+    print(f"[OK] 成功 {report['succeeded']} / {report['total']}，跳过 {report['skipped']}，失败 {report['failed']}")
+    for item in items:
+        mark = {'failed': 'ERR', 'skipped': 'SKIP'}.get(item['status'], 'OK')
+        print(f"  [{mark:<4}] {item['seconds']:>6.1f}s  {(item['title'] or item['file'])[:40]}"
+              + (f"  - {item['error']}" if item['error'] else ''))
+    print(f"报告: {report_path}")
+    print("=" * 70)
+    return report
+
+def cover_cache(config):
+    """封面图缓存（输出目录下的 .cache/covers），相同提示词不重复生成"""
+    max_mb = config.get('image_generation', {}).get('cache_max_mb', 512)
+    return CoverCache(output_dir_from_config(config) / '.cache' / 'covers',
+                      max_bytes=int(max_mb * 1024 * 1024))
+
+def generate_cover_with_nano_banana(title, output_path=None, config=None):
+    """
+    使用nano-banana-pro skill生成封面
+    
+    生成图片是付费调用，只有 image_generation.enabled 为 true 时才自动运行
+    （通过 skill_runner，不经过 npx）；否则与以前一样打印命令由用户手动运行。
+    缓存中已有相同提示词的封面时直接复用。
+    """
     print()
     print("=" * 70)
     print("生成封面图 - 使用 nano-banana-pro")
     print("=" * 70)
     
+    config = config if config is not None else load_config()
+    skill_name = config.get('image_generation', {}).get('skill_name', 'nano-banana-pro')
     prompt = f"A modern tech news cover for AI daily newsletter. Title: '{title}'. Dark blue gradient background, neon cyan glow effects, futuristic AI circuit patterns. Clean minimalist style, vertical 3:4 layout."
     
     print(f"生成提示词: {prompt[:80]}...")
+    
+    cache = cover_cache(config) if output_path else None
+    if cache and cache.lookup(prompt, skill_name, {}, output_path):
+        print(f"[OK] 复用缓存封面图: {output_path}")
+        return postprocess_cover(output_path, config.get('cover', {}))
+    
+    manual_command = f'npx openclaw skills run {skill_name} --prompt "{prompt}"'
+    if not config.get('image_generation', {}).get('enabled', False):
+        print()
+        print("请运行以下命令生成封面图（config.json 中 image_generation.enabled 设为 true 可自动生成）:")
+        print(f"  {manual_command}")
+        print()
+        return None
+    
+    args = ['--prompt', prompt]
+    if output_path:
+        args += ['--filename', str(output_path)]
+    
+    start = time.perf_counter()
+    output = skill_runner.run_skill(skill_name, args, timeout=300)
+    elapsed = time.perf_counter() - start
+    
+    if output_path and Path(output_path).exists():
+        cache.store(prompt, skill_name, {}, Path(output_path))
+        print(f"[OK] 封面图已生成: {output_path} ({elapsed:.1f}s)")
+        return postprocess_cover(output_path, config.get('cover', {}))
+    
+    print(f"[Warning] 封面图生成失败 ({elapsed:.1f}s)")
+    if output.strip():
+        print(output.strip()[-500:])
     print()
-    print("请运行以下命令生成封面图:")
-    print(f'  npx openclaw skills run nano-banana-pro --prompt "{prompt}"')
+    print("请手动运行以下命令生成封面图:")
+    print(f"  {manual_command}")
     print()
+    return None
+
+def publish_file(content_file, config=None, cover=False, force=False):
+    """
+    单篇发布：打开创作页并填写标题和正文，最后一步由人工点击发布
+    
+    Args:
+        content_file: 内容文件
+        config: 配置，默认读取 config.json
+        cover: 是否同时生成封面图
+        force: 忽略发布台账，已发布 / 已填写的内容也重新填写
+        
+    Returns:
+        dict: file / title / status（filled / skipped / failed）/ error
+    """
+    content_file = Path(content_file)
+    config = config or load_config()
+    
+    # 读取内容获取标题
+    full_content = read_content(content_file)
+    title, body = extract_title_and_content(full_content)
+    result = {'file': str(content_file), 'title': title, 'status': None, 'error': None}
+    
+    # 已发布或正在发布的内容不再重复填写
+    ledger = open_ledger(config)
+    digest = content_hash(title, body)
+    if not ledger.claim(digest, content_file, title, force=force):
+        result.update(status='skipped', error=ledger.skip_reason(digest))
+        print(f"[Skip] {result['error']}，如需重新发布请加 --force")
+        return result
+    
+    # 生成封面（如果需要）
+    if cover:
+        cover_path = content_file.with_name(f"{content_file.stem}_cover.png")
+        generate_cover_with_nano_banana(title, cover_path, config)
+    
+    try:
+        publish_with_openclaw_browser(content_file, config=config)
+        result['status'] = 'filled'
+    except Exception as e:
+        result.update(status='failed', error=str(e))
+        print(f"[Error] 发布失败: {e}")
+        print("\n备选方案:")
+        print("1. 手动访问: https://creator.xiaohongshu.com/publish/publish")
+        print(f"2. 复制文件内容: {content_file}")
+    ledger.finish(digest, content_file, result['status'], error=result['error'])
+    return result
+
+def mark_published(files, config=None):
+    """
+    人工在创作页点了发布之后，把这些内容在台账里记为 published
+    
+    Args:
+        files: 内容文件列表
+        config: 配置，默认读取 config.json
+        
+    Returns:
+        int: 记录成功的篇数
+    """
+    config = config if config is not None else load_config()
+    ledger = open_ledger(config)
+    marked = 0
+    for content_file in files:
+        try:
+            title, body = extract_title_and_content(read_content(content_file))
+        except Exception as e:
+            print(f"[Error] {content_file}: {e}")
+            continue
+        ledger.mark_published(content_hash(title, body), content_file, title)
+        marked += 1
+        print(f"[OK] 已记为发布: {title[:40]}")
+    return marked
 
 def main():
     parser = argparse.ArgumentParser(description='XHS一键发布 - OpenClaw Browser版')
     parser.add_argument('file', nargs='?', help='内容文件路径')
     parser.add_argument('--latest', action='store_true', help='发布最新生成的日报')
     parser.add_argument('--cover', action='store_true', help='同时生成封面图')
+    parser.add_argument('--batch', nargs='+', metavar='PATH', help='批量发布：目录、glob 或文件')
+    parser.add_argument('--interval', type=float, default=None, help='批量发布间隔（秒）')
+    parser.add_argument('--submit', action='store_true', help='批量模式填写后自动点击发布（默认只填写）')
+    parser.add_argument('--force', action='store_true', help='忽略发布台账，已发布的内容也重新发布')
+    parser.add_argument('--mark-published', nargs='+', metavar='PATH',
+                        help='人工发布后把内容记为已发布：目录、glob 或文件')
     
     args = parser.parse_args()
+    config = load_config()
+    
+    if args.mark_published:
+        files = resolve_batch(args.mark_published)
+        if not files:
+            print("[Error] 没有找到内容文件")
+            return
+        sys.exit(0 if mark_published(files, config) == len(files) else 1)
+    
+    if args.batch:
+        files = resolve_batch(args.batch)
+        if not files:
+            print("[Error] 没有找到要发布的内容文件")
+            return
+        report = publish_batch(files, config, interval=args.interval, submit=args.submit,
+                               cover=args.cover, force=args.force)
+        sys.exit(1 if report['failed'] else 0)
     
     # 确定文件路径
     if args.latest:
-        content_file = find_latest_content()
+        content_file = find_latest_content(config)
         if not content_file:
             print("[Error] 未找到内容文件，请先运行 daily_ai_news.py 生成")
             return
         print(f"使用最新文件: {content_file}")
     elif args.file:
         content_file = Path(args.file)
-        if not content_file.exists():
+        if not post_store.exists(content_file):
             print(f"[Error] 文件不存在: {content_file}")
             return
     else:
@@ -149,22 +490,7 @@ def main():
         print(f"  示例: python xhs_auto_publish.py --latest")
         return
     
-    # 读取内容获取标题
-    full_content = read_content(content_file)
-    title, _ = extract_title_and_content(full_content)
-    
-    # 生成封面（如果需要）
-    if args.cover:
-        generate_cover_with_nano_banana(title)
-    
-    # 发布
-    try:
-        publish_with_openclaw_browser(content_file)
-    except Exception as e:
-        print(f"[Error] 发布失败: {e}")
-        print("\n备选方案:")
-        print("1. 手动访问: https://creator.xiaohongshu.com/publish/publish")
-        print(f"2. 复制文件内容: {content_file}")
+    publish_file(content_file, config, cover=args.cover, force=args.force)
 
 if __name__ == '__main__':
     main()
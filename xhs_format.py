@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown → 小红书纯文本
+
+逐行扫描一遍 Markdown，边识别边输出，不做整串的多轮 replace（多轮 replace
+会删掉代码和表格里的 * | 等字符）。普通段落行走快速路径，只做行内标记处理:
+
+- 标题去掉 #，引用（>）和分隔线（---）丢弃
+- 段落每行后空一行，便于在小红书里阅读
+- 代码块保留原样（含缩进和 * | 等字符），块内不插空行，围栏行丢弃；结束围栏须与
+  开始围栏字符相同且不短于它，```` 围起来的块里可以出现 ``` 行
+- 表格去掉分隔行；两列表格输出为「名称：数值」，多列用「｜」分隔
+- 行内只去掉成对的 **粗体** / *斜体* 标记，`行内代码` 去掉反引号但内容原样保留
+
+Usage:
+    for line in iter_xhs_lines(markdown):
+        ...
+    text = to_xhs_text(markdown)
+"""
+
+import re
+from typing import Iterable, Iterator, List, Union
+
+# 围栏为 3 个以上相同的 ` 或 ~；反引号围栏的信息串里不能再有反引号
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}(?=[^`]*$)|~{3,})')
+# 段落行以外的行首字符（空行的 first 为 ''，同样走块级判断）
+_BLOCK_CHARS = frozenset('|`~>#-*_') | {''}
+_HR_RE = re.compile(r'^\s{0,3}([-*_])(\s*\1){2,}\s*$')
+_TABLE_SEP_RE = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$')
+# 一次扫描处理所有行内标记：行内代码优先，其次粗体，最后斜体
+_INLINE_RE = re.compile(
+    r'`([^`]+)`'
+    r'|\*\*(?=\S)(.+?)(?<=\S)\*\*'
+    r'|__(?=\S)(.+?)(?<=\S)__'
+    r'|(?<![\w*])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![\w*])'
+)
+
+
+def _inline_sub(match: 're.Match') -> str:
+    code, bold, bold_alt, italic = match.groups()
+    if code is not None:
+        return code
+    inner = bold if bold is not None else bold_alt if bold_alt is not None else italic
+    # 粗体里可能还嵌着斜体或行内代码
+    return _INLINE_RE.sub(_inline_sub, inner)
+
+
+def render_inline(text: str) -> str:
+    """去掉成对的行内强调标记，其他字符原样保留"""
+    if '*' not in text and '_' not in text and '`' not in text:
+        return text
+    return _INLINE_RE.sub(_inline_sub, text)
+
+
+def _heading_text(line: str) -> str:
+    """ATX 标题去掉前后的 #（结尾的 # 前面要有空白，C# 之类保持原样）；不是标题时原样返回"""
+    body = line.lstrip('#')
+    level = len(line) - len(body)
+    if level > 6 or (body and body[0] not in ' \t'):
+        return line
+    body = body.strip()
+    closing = body.rstrip('#')
+    if not closing or closing[-1] in ' \t':
+        body = closing.rstrip()
+    return body
+
+
+def _closes_fence(raw: str, fence: str) -> bool:
+    """raw 是否为 fence 的结束围栏：相同字符、长度不短于开始围栏、之后只有空白"""
+    closing = _FENCE_RE.match(raw)
+    return (closing is not None and closing.group(1)[0] == fence[0]
+            and len(closing.group(1)) >= len(fence) and not raw[closing.end():].strip())
+
+
+def _table_cells(line: str) -> List[str]:
+    cells = line.strip()
+    if cells.startswith('|'):
+        cells = cells[1:]
+    if cells.endswith('|') and not cells.endswith('\\|'):
+        cells = cells[:-1]
+    if '\\|' not in cells:
+        return [render_inline(part.strip()) for part in cells.split('|')]
+    parts = re.split(r'(?<!\\)\|', cells)
+    return [render_inline(part.strip().replace('\\|', '|')) for part in parts]
+
+
+def iter_xhs_lines(markdown: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    把 Markdown 转成小红书风格的文本行（生成器，输出与输入同步）
+
+    Args:
+        markdown: Markdown 字符串，或逐行产出的可迭代对象
+
+    Yields:
+        str: 输出行（不含换行符）
+    """
+    lines = markdown.splitlines() if isinstance(markdown, str) else markdown
+    in_code = False
+    fence = ''
+    in_table = False
+
+    for raw in lines:
+        stripped = raw.strip()
+        first = stripped[:1]
+
+        if in_code:
+            if first == fence[0] and _closes_fence(raw, fence):
+                in_code = False
+                yield ''
+            else:
+                yield raw.rstrip()
+            continue
+
+        if first not in _BLOCK_CHARS:
+            # 普通段落行（最常见），跳过所有块级判断
+            if in_table:
+                in_table = False
+                yield ''
+            if '*' in stripped or '_' in stripped or '`' in stripped:
+                stripped = _INLINE_RE.sub(_inline_sub, stripped)
+            yield stripped
+            yield ''
+            continue
+
+        # 表格：以 | 开头且至少两个 |
+        if first == '|' and stripped.count('|') >= 2:
+            in_table = True
+            # 分隔行只由 | : - 和空白组成，先用 strip 排除普通数据行
+            if stripped.strip('|:- \t') or not _TABLE_SEP_RE.match(stripped):
+                cells = _table_cells(stripped)
+                yield f"{cells[0]}：{cells[1]}" if len(cells) == 2 else ' ｜ '.join(cells)
+            continue
+        if in_table:
+            in_table = False
+            yield ''
+
+        if not stripped or first == '>':
+            continue
+        if first in '`~':
+            opening = _FENCE_RE.match(raw)
+            if opening:
+                in_code = True
+                fence = opening.group(1)
+                continue
+        if first in '-*_' and _HR_RE.match(stripped):
+            continue
+
+        if first == '#':
+            stripped = _heading_text(stripped)
+        text = render_inline(stripped)
+        if text:
+            yield text
+            yield ''
+
+    if in_table:
+        yield ''
+
+
+def to_xhs_text(markdown: Union[str, Iterable[str]]) -> str:
+    """把 Markdown 转成小红书文本（不含标签）"""
+    return '\n'.join(iter_xhs_lines(markdown))
@@ -12,23 +12,51 @@ Features:
 - 自动发布到小红书
 """
 
+import copy
 import json
 import os
 import re
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-import requests
+from typing import TYPE_CHECKING, List, Dict, Optional
+
+import post_store
+from fsutil import atomic_write_json, atomic_write_text
+import skill_runner
+from cover_cache import CoverCache
+from cover_postprocess import postprocess_cover
+from image_queue import ImageJobQueue, ImageWorkerPool
+from stage_graph import StageGraph
+from post_catalog import PostCatalog
+from publish_ledger import PublishLedger, content_hash, open_ledger, split_title_body
+from post_templates import get_registry
+from tag_automaton import load_vocabulary
+from xhs_format import to_xhs_text
+
+# 文档抓取（asyncio / requests）只在 docs.fetch 开启时用到，首次使用时才导入
+if TYPE_CHECKING:
+    from http_cache import HttpCache
+
+IMAGE_PROVIDER = "nano-banana-pro"
 
 class XhsTechBlogger:
     """小红书 AI 技术文档博主"""
     
     def __init__(self, config_path: str = None):
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.workspace = Path(r"D:\apps\xhs_openclaw")
         self.output_dir = self.workspace / "posts"
         self.output_dir.mkdir(exist_ok=True)
+        self._http = None
+        self._prefetched_docs: Dict[str, Dict] = {}  # process_batch 预先整批抓取的文档
+        self._images = None  # (ImageJobQueue, ImageWorkerPool)，首次入队时创建
+        self._images_lock = threading.Lock()
+        self.image_workers_enabled = True  # 进程池子进程只入队，由主进程消费
         
     def _load_config(self, config_path: str) -> Dict:
         """加载配置文件"""
@@ -36,17 +64,55 @@ class XhsTechBlogger:
             "xhs": {
                 "api_key": os.getenv("XHS_API_KEY", ""),
                 "api_secret": os.getenv("XHS_API_SECRET", ""),
-                "default_tags": ["AI", "人工智能", "大模型", "技术文档"]
+                "default_tags": ["AI", "人工智能", "大模型", "技术文档"],
+                "tag_vocab": None  # 标签词表路径，默认使用 tags.json
             },
             "nano_banana": {
                 "enabled": True,
-                "api_key": os.getenv("GEMINI_API_KEY", "")
+                "api_key": os.getenv("GEMINI_API_KEY", ""),
+                "cache_max_mb": 512  # 封面图缓存大小上限
             },
             "content": {
                 "max_length": 1000,  # 小红书字数限制
                 "style": "professional",  # professional / casual / humorous
                 "include_code": True,
-                "include_diagrams": True
+                "include_diagrams": True,
+                "templates": {
+                    "article": "default",  # 单技术文章模板
+                    "comparison": "comparison"  # 对比文章模板
+                },
+                "template_dir": None  # 自定义模板目录（<名称>.md.tmpl）
+            },
+            "batch": {
+                "workers": 4,  # 并发处理的技术数
+                "executor": "thread"  # thread / process
+            },
+            "cover": {
+                "postprocess": True,  # 裁剪为 3:4 并压缩（需要 Pillow）
+                "width": 1080,
+                "height": 1440,
+                "format": "jpeg",  # jpeg / webp
+                "max_kb": 500,
+                "keep_original": False
+            },
+            "image_queue": {
+                "enabled": True,  # 配图放到后台队列，不阻塞文章生成
+                "workers": 1,
+                "qps": 0.5,  # 每秒最多调用几次生成服务
+                "batch_size": 1,  # 每次调用最多生成几张（服务不支持批量时为 1）
+                "max_attempts": 3,
+                "drain_timeout": 600  # 命令行退出前最多等待多少秒
+            },
+            "docs": {
+                "fetch": False,  # 是否实际抓取官方文档页面
+                "max_age": 3600,  # 缓存新鲜期（秒），过期后用 ETag/Last-Modified 重验证
+                "cache_max_mb": 64,  # HTTP 缓存大小上限
+                "timeout": 15,
+                "url_template": "https://{slug}.dev/docs",  # 文档首页地址，{slug} 为小写去空格的技术名
+                "concurrency": 8,  # 全局并发请求数
+                "per_host": 2,  # 同一站点并发请求数
+                "max_depth": 1,  # 从首页跟进几层子页面
+                "max_pages": 8  # 每个技术最多抓取的页面数
             }
         }
         
@@ -66,80 +132,85 @@ class XhsTechBlogger:
             Dict: 每个技术的文档总结
         """
         results = {}
+        docs_config = self.config.get('docs', {})
+        url_template = docs_config.get('url_template', 'https://{slug}.dev/docs')
         
         for tech in tech_names:
+            if tech in self._prefetched_docs:
+                results[tech] = copy.deepcopy(self._prefetched_docs[tech])
+                continue
             print(f"🔍 搜索 {tech} 的文档...")
             
             # 模拟搜索和总结过程
             # 实际实现应该调用搜索 API 和 LLM
             results[tech] = {
                 "name": tech,
-                "official_doc": f"https://{tech.lower().replace(' ', '')}.dev/docs",
+                "official_doc": url_template.format(slug=tech.lower().replace(' ', '')),
                 "key_features": [],
                 "summary": "",
                 "code_examples": [],
                 "benchmarks": {}
             }
             
+        missing = {tech: data for tech, data in results.items() if tech not in self._prefetched_docs}
+        if docs_config.get('fetch') and missing:
+            self._crawl_docs(missing)
+            
         return results
     
+    def _http_cache(self) -> 'HttpCache':
+        """文档抓取用的 HTTP 缓存（首次使用时创建）"""
+        if self._http is None:
+            from http_cache import HttpCache
+            docs_config = self.config.get('docs', {})
+            self._http = HttpCache(
+                self.output_dir / '.cache' / 'http',
+                max_bytes=int(docs_config.get('cache_max_mb', 64) * 1024 * 1024),
+                timeout=docs_config.get('timeout', 15)
+            )
+        return self._http
+    
+    def _crawl_docs(self, results: Dict[str, Dict]):
+        """并发抓取所有技术的文档首页和子页面，填充 results 中的空字段"""
+        from doc_crawler import DocCrawler
+        
+        docs_config = self.config.get('docs', {})
+        crawler = DocCrawler(
+            self._http_cache(),
+            max_concurrency=docs_config.get('concurrency', 8),
+            per_host=docs_config.get('per_host', 2),
+            max_depth=docs_config.get('max_depth', 1),
+            max_pages=docs_config.get('max_pages', 8),
+            max_age=docs_config.get('max_age', 3600)
+        )
+        start = time.perf_counter()
+        docs = crawler.crawl_many({tech: data['official_doc'] for tech, data in results.items()})
+        print(f"📚 文档抓取完成: {len(docs)} 个技术, {crawler.fetched} 个页面, "
+              f"{time.perf_counter() - start:.2f}s")
+        for tech, extracted in docs.items():
+            for key, value in extracted.items():
+                if value and not results[tech].get(key):
+                    results[tech][key] = value
+    
     def generate_markdown(self, tech_data: Dict, template: str = "default") -> str:
         """
         生成 Markdown 格式的技术文章
         
         Args:
             tech_data: 技术文档数据
-            template: 文章模板
+            template: 模板名称；"default" 表示使用 content.templates.article 配置的模板
             
         Returns:
             str: Markdown 内容
         """
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        markdown = f"""# {tech_data['name']} - 技术解析
-
-> 📅 发布日期: {date_str}
-> 🏷️ 分类: AI技术 | 大模型
-
-## 🚀 简介
-
-{tech_data.get('summary', '暂无总结')}
-
-## ✨ 核心特点
-
-"""
-        
-        # 添加特点列表
-        for i, feature in enumerate(tech_data.get('key_features', []), 1):
-            markdown += f"{i}. **{feature['title']}**: {feature['description']}\n"
-        
-        # 添加代码示例
-        if tech_data.get('code_examples') and self.config['content']['include_code']:
-            markdown += "\n## 💻 代码示例\n\n```python\n"
-            markdown += tech_data['code_examples'][0]
-            markdown += "\n```\n"
-        
-        # 添加性能对比
-        if tech_data.get('benchmarks'):
-            markdown += "\n## 📊 性能对比\n\n"
-            markdown += "| 指标 | 数值 |\n"
-            markdown += "|------|------|\n"
-            for metric, value in tech_data['benchmarks'].items():
-                markdown += f"| {metric} | {value} |\n"
-        
-        # 添加结论
-        markdown += f"""
-## 🎯 总结
-
-{tech_data['name']} 是一个值得关注的技术...
-
----
-
-💡 **想要了解更多 AI 技术？关注我，每天分享最新技术干货！**
-
-"""
-        
-        return markdown
+        content_config = self.config['content']
+        if template == "default":
+            template = content_config.get('templates', {}).get('article', 'default')
+        return self._templates().render_article(template, tech_data, include_code=content_config['include_code'])
+    
+    def _templates(self):
+        """当前配置对应的模板注册表（模板编译一次后缓存）"""
+        return get_registry(self.config['content'].get('template_dir'))
     
     def generate_image_prompt(self, tech_data: Dict) -> str:
         """
@@ -193,14 +264,110 @@ class XhsTechBlogger:
             return None
         
         prompt = self.generate_image_prompt(tech_data)
-        print(f"🎨 生成配图: {tech_data['name']}...")
-        
-        # 这里应该调用 nano-banana-pro 的 API
-        # 简化示例，实际需要集成 gemini API
         output_path = self.output_dir / f"{tech_data['name'].replace(' ', '_')}_cover.png"
+        params = {'style': self.config['content']['style']}
+        
+        cache = self._cover_cache()
+        if cache.lookup(prompt, IMAGE_PROVIDER, params, output_path):
+            print(f"♻️ 复用缓存配图: {output_path}")
+            return str(self._postprocess_cover(output_path))
         
-        print(f"✅ 图片生成完成: {output_path}")
-        return str(output_path)
+        if self.config.get('image_queue', {}).get('enabled'):
+            job_id = self._image_queue().enqueue(prompt, IMAGE_PROVIDER, params, output_path)
+            print(f"🎨 配图已加入队列 #{job_id}: {tech_data['name']}")
+            return str(output_path)
+        
+        print(f"🎨 生成配图: {tech_data['name']}...")
+        generated = self._generate_images(IMAGE_PROVIDER, params, [(prompt, output_path)])[0]
+        if generated is None:
+            print("⚠️ 配图生成失败")
+            return None
+        cache.store(prompt, IMAGE_PROVIDER, params, generated)
+        final_path = self._postprocess_cover(generated)
+        print(f"✅ 图片生成完成: {final_path}")
+        return str(final_path)
+    
+    def _postprocess_cover(self, path: Path) -> Path:
+        """裁剪 / 压缩封面（配置 cover 段），返回最终路径"""
+        return postprocess_cover(path, self.config.get('cover', {'postprocess': False}))
+    
+    def _generate_images(self, provider: str, params: Dict, items: List[tuple]) -> List[Optional[Path]]:
+        """调用 nano-banana-pro skill 逐张生成（该 skill 不支持一次生成多张）"""
+        results = []
+        for prompt, output_path in items:
+            output = skill_runner.run_skill(provider, ['--prompt', prompt, '--filename', str(output_path)],
+                                            timeout=300)
+            if Path(output_path).exists():
+                results.append(Path(output_path))
+            else:
+                print(output.strip()[-300:])
+                results.append(None)
+        return results
+    
+    def _image_queue(self) -> ImageJobQueue:
+        """配图任务队列；本进程允许时同时启动后台 worker"""
+        with self._images_lock:
+            if self._images is None:
+                queue_config = self.config.get('image_queue', {})
+                queue = ImageJobQueue(self.output_dir / '.state' / 'image_jobs.sqlite3',
+                                      max_attempts=queue_config.get('max_attempts', 3),
+                                      lease_seconds=queue_config.get('lease_seconds', 120))
+                pool = ImageWorkerPool(
+                    queue, self._generate_images,
+                    workers=queue_config.get('workers', 1),
+                    qps=queue_config.get('qps', 0.5),
+                    batch_size=queue_config.get('batch_size', 1),
+                    cover_cache=self._cover_cache(),
+                    postprocess=self._postprocess_cover
+                )
+                self._images = (queue, pool)
+                if self.image_workers_enabled:
+                    pool.start()
+            return self._images[0]
+    
+    def _attach_image(self, post_dir: Path, image_path: Optional[str]):
+        """
+        把配图写进文章 meta：配图来自队列时关联任务（已完成的立即写回，未完成的
+        完成后写回）；已生成但 meta 中还没有 image_file 时（例如保存文章后才生成完）直接补上
+        """
+        if not image_path:
+            return
+        if self._images is not None:
+            queue = self._images[0]
+            job_id = queue.job_for_output(image_path)
+            if job_id is not None:
+                queue.attach_post(job_id, post_dir)
+                return
+        if Path(image_path).exists() and not (post_store.read_meta(post_dir) or {}).get('image_file'):
+            post_store.update_meta(post_dir, lambda meta: meta.update(image_file=image_path))
+    
+    def wait_for_images(self, timeout: float = None) -> bool:
+        """
+        等待配图队列清空（命令行退出前调用；队列中遗留的任务也会一并处理）
+        
+        Returns:
+            bool: 是否在超时前全部完成
+        """
+        if not self.config.get('image_queue', {}).get('enabled'):
+            return True
+        self._image_queue()
+        queue, pool = self._images
+        counts = queue.counts()
+        if not counts.get('pending') and not counts.get('running'):
+            return True
+        if timeout is None:
+            timeout = self.config['image_queue'].get('drain_timeout', 600)
+        print(f"⏳ 等待 {counts.get('pending', 0) + counts.get('running', 0)} 个配图任务完成...")
+        done = pool.drain(timeout)
+        counts = queue.counts()
+        print(f"🖼️ 配图队列: 完成 {counts.get('done', 0)}, 失败 {counts.get('failed', 0)}, "
+              f"未完成 {counts.get('pending', 0) + counts.get('running', 0)}")
+        return done
+    
+    def _cover_cache(self) -> CoverCache:
+        """封面图缓存（相同提示词 + 风格直接复用已生成的图片）"""
+        max_mb = self.config['nano_banana'].get('cache_max_mb', 512)
+        return CoverCache(self.output_dir / '.cache' / 'covers', max_bytes=int(max_mb * 1024 * 1024))
     
     def recommend_tags(self, tech_data: Dict) -> List[str]:
         """
@@ -212,33 +379,12 @@ class XhsTechBlogger:
         Returns:
             List[str]: 推荐标签列表
         """
-        base_tags = self.config['xhs']['default_tags'].copy()
-        
-        # 根据技术名称添加标签
-        tech_name = tech_data['name'].lower()
-        
-        tag_mapping = {
-            'llm': ['LLM', '大语言模型'],
-            'gpt': ['GPT', 'OpenAI'],
-            'claude': ['Claude', 'Anthropic'],
-            'kimi': ['Kimi', 'Moonshot'],
-            'qwen': ['通义千问', '阿里'],
-            'transformer': ['Transformer', '注意力机制'],
-            'moe': ['MoE', '混合专家模型'],
-            'agent': ['AI Agent', '智能体'],
-            'rag': ['RAG', '检索增强生成'],
-            'fine-tuning': ['微调', 'Fine-tuning'],
-            'quantization': ['量化', '模型压缩'],
-            'deployment': ['模型部署', 'MLOps']
-        }
-        
-        for keyword, tags in tag_mapping.items():
-            if keyword in tech_name:
-                base_tags.extend(tags)
+        xhs_config = self.config['xhs']
+        vocab = load_vocabulary(xhs_config.get('tag_vocab'))
+        tags = list(xhs_config['default_tags']) + vocab.rank(tech_data)
         
-        # 去重并限制数量
-        unique_tags = list(set(base_tags))
-        return unique_tags[:10]  # 小红书最多 10 个标签
+        # 去重（保持顺序）并限制数量：默认标签在前，其余按命中权重
+        return list(dict.fromkeys(tags))[:10]  # 小红书最多 10 个标签
     
     def format_for_xiaohongshu(self, markdown: str, tags: List[str]) -> str:
         """
@@ -251,25 +397,10 @@ class XhsTechBlogger:
         Returns:
             str: 小红书格式内容
         """
-        # 移除 Markdown 语法
-        text = markdown.replace('# ', '').replace('## ', '').replace('### ', '')
-        text = text.replace('**', '').replace('*', '')
-        text = text.replace('```python', '').replace('```', '')
-        text = text.replace('|', '').replace('---', '')
-        
-        # 添加表情和格式化
-        lines = text.split('\n')
-        formatted_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('>'):
-                # 添加适当的换行
-                formatted_lines.append(line)
-                formatted_lines.append('')  # 空行增加可读性
+        # 单遍扫描去掉 Markdown 语法，代码块和表格保持可读
+        formatted_text = to_xhs_text(markdown)
         
         # 添加标签
-        formatted_text = '\n'.join(formatted_lines)
         formatted_text += '\n\n🏷️ '
         formatted_text += ' '.join([f"#{tag}" for tag in tags])
         
@@ -289,31 +420,33 @@ class XhsTechBlogger:
         safe_name = tech_name.replace(' ', '_').replace('/', '_')
         
         post_dir = self.output_dir / f"{timestamp}_{safe_name}"
-        post_dir.mkdir(exist_ok=True)
-        
-        # 保存 Markdown
         md_path = post_dir / "article.md"
-        with open(md_path, 'w', encoding='utf-8') as f:
-            f.write(markdown)
-        
-        # 保存小红书版本
         xhs_path = post_dir / "xiaohongshu.txt"
-        with open(xhs_path, 'w', encoding='utf-8') as f:
-            f.write(xhs_content)
         
-        # 保存元数据
+        # 元数据
         meta = {
             "tech_name": tech_name,
             "created_at": datetime.now().isoformat(),
             "markdown_file": str(md_path),
             "xiaohongshu_file": str(xhs_path),
-            "image_file": image_path,
-            "status": "ready_to_publish"
+            "image_file": image_path if image_path and Path(image_path).exists() else None,
+            "status": "ready_to_publish",
+            "content_hash": content_hash(*split_title_body(xhs_content)),
+            "status_history": [{"status": "ready_to_publish", "at": datetime.now().isoformat()}]
         }
         
-        meta_path = post_dir / "meta.json"
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+        store = self._post_store()
+        if store:
+            # 打包存储：整篇文章一起写入，按 storage.commit_every 批量提交
+            store.put(post_dir.name, {md_path.name: markdown, xhs_path.name: xhs_content}, meta)
+        else:
+            # 目录存储：每个文件原子写入，meta.json 最后写，有 meta.json 即代表文章完整
+            atomic_write_text(md_path, markdown)
+            atomic_write_text(xhs_path, xhs_content)
+            atomic_write_json(post_dir / "meta.json", meta)
+        
+        with PostCatalog(self.output_dir) as catalog:
+            catalog.add(xhs_path, 'tech', tech_name)
         
         print(f"✅ 文章已保存到: {post_dir}")
         return post_dir
@@ -328,19 +461,22 @@ class XhsTechBlogger:
         Returns:
             bool: 是否成功
         """
-        # 读取文件
+        # 读取文件（目录或打包存储）
         xhs_file = post_dir / "xiaohongshu.txt"
-        meta_file = post_dir / "meta.json"
         
-        if not xhs_file.exists():
+        if not post_store.exists(xhs_file):
             print("❌ 小红书内容文件不存在")
             return False
         
-        with open(xhs_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = post_store.read_text(xhs_file)
+        meta = post_store.read_meta(post_dir)
         
-        with open(meta_file, 'r', encoding='utf-8') as f:
-            meta = json.load(f)
+        # 台账里已发布 / 正在发布的内容直接跳过，避免重复发布
+        ledger = self._publish_ledger()
+        digest = content_hash(*split_title_body(content))
+        if not ledger.claim(digest, xhs_file, meta['tech_name']):
+            print(f"⏭️ 跳过 {meta['tech_name']}: {ledger.skip_reason(digest)}")
+            return True
         
         print(f"📤 正在发布到小红书: {meta['tech_name']}...")
         
@@ -351,8 +487,24 @@ class XhsTechBlogger:
         print(f"内容长度: {len(content)} 字符")
         print(f"配图: {meta.get('image_file', '无')}")
         
+        # 实际没有发出去，不能记为 published，否则之后真正发布时会被台账跳过；
+        # 记为 ready_to_publish，用 xhs_auto_publish 发布时照常处理
+        ledger.finish(digest, xhs_file, 'ready_to_publish')
         return True
     
+    def _post_store(self) -> Optional[post_store.PostStore]:
+        """storage.backend 为 packed 时返回打包存储，否则返回 None（目录存储）"""
+        storage = self.config.get('storage', {})
+        if storage.get('backend', 'dirs') != 'packed':
+            return None
+        # 进程池子进程的文章要尽快对主进程可见（配图 worker 会写回 meta），逐篇提交
+        commit_every = storage.get('commit_every', 20) if self.image_workers_enabled else 1
+        return post_store.open_store(post_store.store_path(self.output_dir), commit_every)
+    
+    def _publish_ledger(self) -> PublishLedger:
+        """与 xhs_auto_publish 共用的发布台账"""
+        return open_ledger(self.config)
+    
     def process_tech(self, tech_name: str, auto_publish: bool = False) -> Path:
         """
         处理单个技术并生成文章
@@ -368,34 +520,49 @@ class XhsTechBlogger:
         print(f"📝 处理技术: {tech_name}")
         print(f"{'='*60}\n")
         
-        # 1. 搜索文档
-        tech_data = self.search_documentation([tech_name])[tech_name]
-        
-        # 2. 生成 Markdown
-        print("📝 生成 Markdown 文章...")
-        markdown = self.generate_markdown(tech_data)
-        
-        # 3. 生成配图
-        image_path = self.generate_image(tech_data)
-        
-        # 4. 推荐标签
-        print("🏷️ 推荐标签...")
-        tags = self.recommend_tags(tech_data)
-        print(f"   标签: {', '.join(tags)}")
-        
-        # 5. 格式化为小红书
-        xhs_content = self.format_for_xiaohongshu(markdown, tags)
-        
-        # 6. 保存
-        post_dir = self.save_post(tech_name, markdown, xhs_content, image_path)
-        
-        # 7. 可选：自动发布
+        # 搜索文档后，Markdown / 配图 / 标签并发执行；
+        # 启用 image_queue 时配图阶段只入队，图片生成后由后台 worker 写回 meta.json
+        graph = StageGraph()
+        graph.add('search', lambda: self.search_documentation([tech_name])[tech_name])
+        graph.add('markdown', self._markdown_stage, deps=['search'])
+        graph.add('image', lambda search: self.generate_image(search), deps=['search'])
+        graph.add('tags', self._tags_stage, deps=['search'])
+        graph.add('xhs', lambda markdown, tags: self.format_for_xiaohongshu(markdown, tags),
+                  deps=['markdown', 'tags'])
+        graph.add('save', lambda markdown, xhs, image: self.save_post(tech_name, markdown, xhs, image),
+                  deps=['markdown', 'xhs', 'image'])
+        results = graph.run()
+        post_dir = results['save']
+        
+        self.last_stage_timings = graph.timings
+        self._record_stage_timings(post_dir, graph.timings)
+        self._attach_image(post_dir, results['image'])
+        print("⏱️ 阶段耗时: " + ", ".join(
+            f"{name} {t['seconds']:.2f}s" for name, t in graph.timings.items()
+        ))
+        
+        # 可选：自动发布（发布需要配图，先等队列完成）
         if auto_publish:
+            self.wait_for_images()
             self.publish_to_xiaohongshu(post_dir)
         
         print(f"\n✅ 完成！文章保存在: {post_dir}")
         return post_dir
     
+    def _markdown_stage(self, search: Dict) -> str:
+        print("📝 生成 Markdown 文章...")
+        return self.generate_markdown(search)
+    
+    def _tags_stage(self, search: Dict) -> List[str]:
+        print("🏷️ 推荐标签...")
+        tags = self.recommend_tags(search)
+        print(f"   标签: {', '.join(tags)}")
+        return tags
+    
+    def _record_stage_timings(self, post_dir: Path, timings: Dict):
+        """把各阶段耗时写入 meta"""
+        post_store.update_meta(Path(post_dir), lambda meta: meta.update(stage_timings=timings))
+    
     def process_multiple_techs(self, tech_names: List[str], comparison_mode: bool = False):
         """
         处理多个技术，可选对比模式
@@ -424,87 +591,167 @@ class XhsTechBlogger:
             print(f"✅ 对比文章已保存: {post_dir}")
             
         else:
-            # 分别处理每个技术
-            for tech in tech_names:
-                self.process_tech(tech)
+            # 分别处理每个技术（并发批处理）
+            return self.process_batch(tech_names)
     
-    def _generate_comparison_markdown(self, tech_data_dict: Dict) -> str:
-        """生成对比文章的 Markdown"""
-        tech_names = list(tech_data_dict.keys())
-        date_str = datetime.now().strftime("%Y-%m-%d")
+    def process_batch(self, tech_names: List[str], workers: int = None,
+                      executor: str = None) -> Dict:
+        """
+        并发批量处理多个技术
         
-        markdown = f"""# {' vs '.join(tech_names)} - 技术对比
-
-> 📅 发布日期: {date_str}
-> 🏷️ 分类: AI技术对比 | 大模型选型
-
-## 🚀 概述
-
-今天为大家带来 {len(tech_names)} 款热门技术的深度对比...
-
-## 📊 对比维度
-
-"""
+        每个技术单独捕获异常，一个失败不影响其他技术；结束后在输出目录
+        写入 batch_<时间戳>.json 清单，列出每个技术的结果和 post_dir。
         
-        # 添加对比表格
-        markdown += "| 特性 | " + " | ".join(tech_names) + " |\n"
-        markdown += "|------|" + "|".join(["------"] * len(tech_names)) + "|\n"
-        
-        # 对比项
-        comparison_items = ["架构", "参数量", "上下文长度", "推理速度", "中文能力", "开源程度"]
-        for item in comparison_items:
-            row = f"| {item} |"
-            for tech in tech_names:
-                row += " 待补充 |"
-            markdown += row + "\n"
-        
-        # 每个技术的简介
-        markdown += "\n## 🔍 详细解析\n\n"
-        for tech_name, data in tech_data_dict.items():
-            markdown += f"### {tech_name}\n\n"
-            markdown += f"{data.get('summary', '暂无总结')}\n\n"
-        
-        # 结论
-        markdown += """
-## 🎯 选型建议
-
-- **如果你的需求是 XXX**: 推荐 XXX
-- **如果你的需求是 YYY**: 推荐 YYY
-
----
+        Args:
+            tech_names: 技术名称列表
+            workers: 并发数，默认取 config['batch']['workers']
+            executor: "thread"（I/O 为主）或 "process"（CPU 为主）
+            
+        Returns:
+            Dict: 批处理清单
+        """
+        batch_config = self.config.get('batch', {})
+        workers = workers or batch_config.get('workers', 4)
+        executor = executor or batch_config.get('executor', 'thread')
+        tech_names = list(dict.fromkeys(tech_names))  # 去重，避免同名文章目录冲突
+        
+        print(f"\n📦 批量处理 {len(tech_names)} 个技术（{executor} × {workers}）")
+        started_at = datetime.now()
+        start = time.perf_counter()
+        results = {}
+        
+        if self.config.get('docs', {}).get('fetch'):
+            # 整批文档在一个事件循环里抓取，并发上限对整批生效；
+            # 进程池的子进程随后从 HTTP 缓存读取（max_age 内不再发请求）
+            self._prefetched_docs.update(self.search_documentation(tech_names))
+        
+        if executor == 'process':
+            from concurrent.futures import ProcessPoolExecutor as pool_cls
+        else:
+            pool_cls = ThreadPoolExecutor
+        with pool_cls(max_workers=workers) as pool:
+            if executor == 'process':
+                futures = {pool.submit(_process_tech_isolated, self.config_path, tech): tech
+                           for tech in tech_names}
+            else:
+                futures = {pool.submit(self._process_tech_isolated, tech): tech
+                           for tech in tech_names}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                mark = "✅" if result['status'] == 'ok' else "❌"
+                print(f"{mark} [{len(results)}/{len(tech_names)}] {result['tech']} ({result['seconds']:.1f}s)")
+        
+        post_store.flush_all()
+        items = [results[tech] for tech in tech_names]
+        manifest = {
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "seconds": round(time.perf_counter() - start, 3),
+            "workers": workers,
+            "executor": executor,
+            "total": len(items),
+            "succeeded": sum(1 for item in items if item['status'] == 'ok'),
+            "failed": sum(1 for item in items if item['status'] != 'ok'),
+            "items": items
+        }
+        manifest_path = self.output_dir / f"batch_{started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        atomic_write_json(manifest_path, manifest)
+        
+        print(f"\n📦 批处理完成: 成功 {manifest['succeeded']} / 失败 {manifest['failed']}，"
+              f"耗时 {manifest['seconds']:.1f}s")
+        print(f"   清单: {manifest_path}")
+        return manifest
+    
+    def _process_tech_isolated(self, tech_name: str) -> Dict:
+        """处理单个技术并把结果/异常整理成清单条目"""
+        start = time.perf_counter()
+        try:
+            post_dir = self.process_tech(tech_name)
+            return {"tech": tech_name, "status": "ok", "post_dir": str(post_dir),
+                    "error": None, "seconds": round(time.perf_counter() - start, 3)}
+        except Exception as e:
+            print(f"❌ {tech_name} 处理失败: {e}")
+            return {"tech": tech_name, "status": "failed", "post_dir": None,
+                    "error": f"{type(e).__name__}: {e}", "seconds": round(time.perf_counter() - start, 3)}
+    
+    def _generate_comparison_markdown(self, tech_data_dict: Dict) -> str:
+        """生成对比文章的 Markdown"""
+        template = self.config['content'].get('templates', {}).get('comparison', 'comparison')
+        return self._templates().render_comparison(template, tech_data_dict)
 
-💡 **想要了解更多技术对比？关注我，每周深度对比！**
 
-"""
-        
-        return markdown
+def _process_tech_isolated(config_path: Optional[str], tech_name: str) -> Dict:
+    """进程池入口：在子进程中重建 XhsTechBlogger 后处理单个技术"""
+    blogger = XhsTechBlogger(config_path)
+    blogger.image_workers_enabled = False
+    return blogger._process_tech_isolated(tech_name)
 
 
 def main():
     """命令行入口"""
     import sys
     
-    blogger = XhsTechBlogger()
+    argv = sys.argv[1:]
+    config_path = None
+    if '--config' in argv:
+        i = argv.index('--config')
+        if i + 1 >= len(argv):
+            print("❌ --config 需要配置文件路径")
+            return
+        config_path = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+    
+    blogger = XhsTechBlogger(config_path)
     
-    if len(sys.argv) < 2:
+    if not argv:
         print("用法:")
         print("  python xhs_tech_blogger.py <技术名称>")
         print("  python xhs_tech_blogger.py --compare <技术1> <技术2> [<技术3>]")
+        print("  python xhs_tech_blogger.py --batch [--workers N] <技术1> <技术2> ...")
+        print("  python xhs_tech_blogger.py --batch-file <技术列表.txt> [--workers N]")
+        print("  以上命令都可以加 --config <配置文件>")
         print("")
         print("示例:")
         print('  python xhs_tech_blogger.py "Claude 3.5"')
         print('  python xhs_tech_blogger.py --compare "GPT-4o" "Claude 3.5" "Kimi K2.5"')
         return
     
-    if sys.argv[1] == '--compare':
-        tech_names = sys.argv[2:]
+    if argv[0] in ('--batch', '--batch-file'):
+        args = argv[1:]
+        workers = None
+        if '--workers' in args:
+            i = args.index('--workers')
+            value = args[i + 1] if i + 1 < len(args) else ''
+            if not value.isdigit() or int(value) < 1:
+                print("❌ --workers 需要一个正整数")
+                return
+            workers = int(value)
+            args = args[:i] + args[i + 2:]
+        if argv[0] == '--batch-file':
+            if not args:
+                print("❌ --batch-file 需要技术列表文件路径")
+                return
+            with open(args[0], 'r', encoding='utf-8') as f:
+                tech_names = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        else:
+            tech_names = args
+        if not tech_names:
+            print("❌ 批量模式需要至少 1 个技术")
+            return
+        manifest = blogger.process_batch(tech_names, workers=workers)
+        blogger.wait_for_images()
+        sys.exit(1 if manifest['failed'] else 0)
+    elif argv[0] == '--compare':
+        tech_names = argv[1:]
         if len(tech_names) < 2:
             print("❌ 对比模式需要至少 2 个技术")
             return
         blogger.process_multiple_techs(tech_names, comparison_mode=True)
     else:
-        tech_name = ' '.join(sys.argv[1:])
+        tech_name = ' '.join(argv)
         blogger.process_tech(tech_name)
+        blogger.wait_for_images()
 
 
 if __name__ == "__main__":